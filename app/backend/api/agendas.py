@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.backend.db.db import get_db
 from app.backend.schemas.agenda_excepcional import (
@@ -9,6 +10,9 @@ from app.backend.schemas.agenda_regular import AgendaRegularCreate, AgendaRegula
 from app.backend.schemas.agenda_disponible import AgendaDisponibleOut
 from app.backend.services.agenda_service import AgendaService
 from app.backend.services.agenda_repository import AgendaRepository
+from app.backend.services.slot_repository import SlotRepository
+from app.backend.services.disponibilidad_cache import disponibilidad_cache
+from app.backend.core.dependencies import role_required
 from app.backend.services.medico_repository import (
     MedicoRepository,
 )  # Necesario para inyección
@@ -16,8 +20,9 @@ from app.backend.services.exceptions import (
     RecursoNoEncontradoError,
     ValueError as AppValueError,
 )
-from typing import List
+from typing import Iterator, List, Optional
 from datetime import date
+import json
 
 router = APIRouter(prefix="/agendas", tags=["Agendas"])
 
@@ -26,7 +31,8 @@ router = APIRouter(prefix="/agendas", tags=["Agendas"])
 def get_agenda_service(db: Session = Depends(get_db)) -> AgendaService:
     agenda_repo = AgendaRepository(db)
     medico_repo = MedicoRepository(db)  # Necesario para que el service valide la FK
-    return AgendaService(agenda_repo, medico_repo)
+    slot_repo = SlotRepository(db)  # Calendario materializado de slots
+    return AgendaService(agenda_repo, medico_repo, slot_repo)
 
 
 # ----------------------------------------------------
@@ -156,6 +162,83 @@ def obtener_agenda_disponible(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         )
 
+# ----------------------------------------------------
+# Disponibilidad en streaming (NDJSON: un slot por línea)
+# ----------------------------------------------------
+def _ndjson(dias: Iterator[List[dict]]) -> Iterator[str]:
+    # Un chunk por día: el primer byte sale apenas se calcula el primer día
+    for slots in dias:
+        if slots:
+            yield "".join(json.dumps(slot) + "\n" for slot in slots)
+
+
+@router.get("/medicos/{matricula}/agenda/disponible/stream")
+def exportar_agenda_disponible(
+    matricula: str,
+    fecha_inicio: date,
+    fecha_fin: date,
+    service: AgendaService = Depends(get_agenda_service),
+):
+    try:
+        dias = service.iterar_turnos_disponibles(matricula, fecha_inicio, fecha_fin)
+
+    except RecursoNoEncontradoError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    except AppValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return StreamingResponse(_ndjson(dias), media_type="application/x-ndjson")
+
+
+@router.get("/sucursales/{sucursal_id}/disponible/stream")
+def exportar_disponibilidad_sucursal(
+    sucursal_id: int,
+    fecha_inicio: date,
+    fecha_fin: date,
+    service: AgendaService = Depends(get_agenda_service),
+):
+    try:
+        dias = service.iterar_disponibles_sucursal(sucursal_id, fecha_inicio, fecha_fin)
+
+    except AppValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return StreamingResponse(_ndjson(dias), media_type="application/x-ndjson")
+
+
+# ----------------------------------------------------
+# Endpoint para buscar el primer turno libre por especialidad (GET)
+# ----------------------------------------------------
+@router.get("/disponible/primeros", response_model=List[AgendaDisponibleOut])
+def buscar_primeros_disponibles(
+    especialidad: str,
+    fecha_inicio: date,
+    fecha_fin: date,
+    sucursal_id: Optional[int] = None,
+    cantidad: int = Query(10, ge=1, le=100),
+    service: AgendaService = Depends(get_agenda_service),
+):
+    try:
+        return service.buscar_primeros_disponibles(
+            especialidad, fecha_inicio, fecha_fin, sucursal_id, cantidad
+        )
+
+    except AppValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# ----------------------------------------------------
+# Estadísticas de la caché de disponibilidad (GET)
+# ----------------------------------------------------
+@router.get(
+    "/disponible/cache",
+    dependencies=[Depends(role_required(["Administrador"]))],
+)
+def estadisticas_cache_disponibilidad():
+    return disponibilidad_cache.estadisticas()
+
+
 #obtener agenda excepcional por matricula
 @router.get(
     "/medicos/{matricula}/agenda/excepcional", response_model=List[AgendaExcepcionalOut]
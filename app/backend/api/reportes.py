@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.backend.db.db import get_db
 from app.backend.services.report_service import ReportService
+from app.backend.services.reportes_cache import reportes_cache
 from app.backend.services.turno_repository import TurnoRepository
 from app.backend.core.dependencies import role_required, get_current_user  # RBAC
 from app.backend.services.exceptions import RecursoNoEncontradoError
@@ -66,3 +67,14 @@ def generar_reporte(
     except ValueError as e:
         # Errores de validación interna
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# ----------------------------------------------------
+# Estadísticas de la caché de reportes (GET)
+# ----------------------------------------------------
+@router.get(
+    "/cache",
+    dependencies=[Depends(role_required(["Administrador"]))],
+)
+def estadisticas_cache_reportes():
+    return reportes_cache.estadisticas()
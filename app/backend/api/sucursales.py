@@ -1,10 +1,12 @@
+from datetime import date
 from typing import Optional
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 
 from app.backend.db.db import get_db
 from app.backend.schemas.sucursal import SucursalCreate, SucursalOut
-from app.backend.services import sucursal_service
+from app.backend.schemas.tablero import TableroOut
+from app.backend.services import sucursal_service, tablero_service
 
 router = APIRouter(prefix="/sucursales", tags=["Sucursales"])
 
@@ -29,6 +31,20 @@ def obtener_sucursal(id: int, db: Session = Depends(get_db)):
     return sucursal_service.obtener_sucursal(db, id)
 
 
+@router.get("/{id}/tablero", response_model=TableroOut)
+def tablero_sucursal(
+    id: int,
+    fecha: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Turnos del día (hoy por defecto) de la sucursal para la recepción.
+    Se sirve desde caché en memoria, invalidada por los cambios de turnos.
+    """
+    contenido = tablero_service.obtener_tablero_json(db, id, fecha or date.today())
+    return Response(content=contenido, media_type="application/json")
+
+
 @router.put("/{id}", response_model=SucursalOut)
 def actualizar_sucursal(
     id: int, payload: SucursalCreate, db: Session = Depends(get_db)
@@ -1,19 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.backend.db.db import get_db
-from app.backend.schemas.turno import TurnoCreate, TurnoOut, TurnoUpdate
+from app.backend.schemas.turno import (
+    TurnoCreate,
+    TurnoOut,
+    TurnoUpdate,
+    TurnoLoteCreate,
+    TurnoLoteOut,
+    TurnoSerieCreate,
+    TurnoSerieOut,
+    AccionTurno,
+    TurnoEstadoLoteUpdate,
+    TurnoEstadoLoteOut,
+    TurnoPaginaOut,
+    LIMITE_PAGINA_TURNOS,
+    MAX_LIMITE_PAGINA_TURNOS,
+)
 from app.backend.services.turno_service import TurnoService
 from app.backend.services.turno_repository import TurnoRepository
 from app.backend.services.agenda_repository import AgendaRepository
 from app.backend.services.medico_repository import MedicoRepository
 from app.backend.services.paciente_repository import PacienteRepository
+from app.backend.services.agenda_service import AgendaService
+from app.backend.services.slot_repository import SlotRepository
+from app.backend.services.serie_turnos_service import SerieTurnosService
+from app.backend.services.feed_turnos import transmitir_eventos
+from app.backend.schemas.reserva_temporal import ReservaTemporalCreate, ReservaTemporalOut
 from app.backend.services.exceptions import (
     RecursoNoEncontradoError,
     HorarioNoDisponibleError,
     TransicionInvalidaError,
+    ValueError as AppValueError,
 )
 from app.backend.core.dependencies import get_current_user, role_required
-from typing import List, Literal
+from datetime import date
+from typing import List, Optional
 
 router = APIRouter(prefix="/turnos", tags=["Turnos"])
 
@@ -26,10 +48,20 @@ def get_turno_service(db: Session = Depends(get_db)) -> TurnoService:
         agenda_repo=AgendaRepository(db),
         medico_repo=MedicoRepository(db),
         paciente_repo=PacienteRepository(db),
-        db_session=db,  # Pasa la sesión para el Patrón State
+        db_session=db,
     )
 
 
+def get_serie_service(
+    db: Session = Depends(get_db),
+    turno_service: TurnoService = Depends(get_turno_service),
+) -> SerieTurnosService:
+    agenda_service = AgendaService(
+        AgendaRepository(db), MedicoRepository(db), SlotRepository(db)
+    )
+    return SerieTurnosService(agenda_service, turno_service)
+
+
 # ----------------------------------------------------
 # Endpoint 1: Registrar Turno (CREATE)
 # ----------------------------------------------------
@@ -54,6 +86,89 @@ def registrar_turno(
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
 
+# ----------------------------------------------------
+# Endpoint 1b: Registrar varios Turnos (alta en lote)
+# ----------------------------------------------------
+@router.post("/batch", response_model=TurnoLoteOut)
+def registrar_turnos_lote(
+    payload: TurnoLoteCreate, service: TurnoService = Depends(get_turno_service)
+):
+    """
+    Valida todos los turnos en una pasada y crea los válidos en una sola
+    transacción. El resultado de cada ítem (creado o motivo del rechazo) se
+    informa en el mismo orden en que se enviaron.
+    """
+    try:
+        resultados = service.registrar_turnos_lote(payload.turnos, atomico=payload.atomico)
+    except HorarioNoDisponibleError as e:
+        # Otro proceso ocupó uno de los horarios entre la validación y el commit
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    creados = sum(1 for r in resultados if r["creado"])
+    return {
+        "creados": creados,
+        "rechazados": len(resultados) - creados,
+        "resultados": resultados,
+    }
+
+
+# ----------------------------------------------------
+# Endpoint 1c: Registrar una serie de Turnos recurrentes
+# ----------------------------------------------------
+@router.post("/serie", response_model=TurnoSerieOut)
+def registrar_serie(
+    payload: TurnoSerieCreate, service: SerieTurnosService = Depends(get_serie_service)
+):
+    """
+    Crea todos los turnos de la serie o ninguno. Si alguna fecha no está libre,
+    la respuesta trae creada=false y, para esas fechas, las alternativas más cercanas.
+    """
+    try:
+        return service.registrar_serie(payload)
+
+    except RecursoNoEncontradoError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    except AppValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    except HorarioNoDisponibleError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+# ----------------------------------------------------
+# Endpoint 1d: Retenciones temporales de horarios (checkout)
+# ----------------------------------------------------
+@router.post(
+    "/retenciones",
+    response_model=ReservaTemporalOut,
+    status_code=status.HTTP_201_CREATED,
+)
+def retener_horario(
+    payload: ReservaTemporalCreate, service: TurnoService = Depends(get_turno_service)
+):
+    """
+    Retiene el horario unos minutos mientras el paciente confirma. El token
+    devuelto se envía como Reserva_Token en POST /turnos/.
+    """
+    try:
+        return service.retener_horario(payload)
+
+    except RecursoNoEncontradoError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    except HorarioNoDisponibleError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.delete("/retenciones/{token}", status_code=status.HTTP_204_NO_CONTENT)
+def liberar_retencion(token: str, service: TurnoService = Depends(get_turno_service)):
+    try:
+        service.liberar_retencion(token)
+    except RecursoNoEncontradoError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
 # ----------------------------------------------------
 # Endpoint 2: Obtener Todos los Turnos
 # ----------------------------------------------------
@@ -62,6 +177,66 @@ def obtener_todos_los_turnos(service: TurnoService = Depends(get_turno_service))
     return service.obtener_turnos()
 
 
+@router.get("/buscar", response_model=TurnoPaginaOut)
+def buscar_turnos(
+    fecha_desde: Optional[date] = Query(None, description="Fecha inicial (YYYY-MM-DD)"),
+    fecha_hasta: Optional[date] = Query(None, description="Fecha final (YYYY-MM-DD)"),
+    estado: Optional[List[str]] = Query(None, description="Descripción del estado (repetible)"),
+    medico_matricula: Optional[str] = None,
+    especialidad_id: Optional[int] = None,
+    sucursal_id: Optional[int] = None,
+    paciente_nro: Optional[int] = None,
+    limite: int = Query(LIMITE_PAGINA_TURNOS, ge=1, le=MAX_LIMITE_PAGINA_TURNOS),
+    cursor: Optional[str] = Query(None, description="Valor de 'siguiente' de la página anterior"),
+    service: TurnoService = Depends(get_turno_service),
+):
+    """
+    Búsqueda filtrada de turnos, paginada por cursor (keyset) sobre
+    (Fecha, Hora, Paciente_nroPaciente): el tiempo de respuesta no crece con la tabla.
+    """
+    try:
+        return service.buscar_turnos(
+            limite,
+            cursor=cursor,
+            fecha_desde=fecha_desde,
+            fecha_hasta=fecha_hasta,
+            estados=estado,
+            medico_matricula=medico_matricula,
+            especialidad_id=especialidad_id,
+            sucursal_id=sucursal_id,
+            paciente_nro=paciente_nro,
+        )
+    except AppValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/eventos")
+async def feed_eventos_turnos(
+    request: Request,
+    medico_matricula: Optional[str] = None,
+    sucursal_id: Optional[int] = None,
+    desde: Optional[int] = Query(None, ge=0, description="Id del último evento ya recibido"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Stream SSE (text/event-stream) de los cambios de turnos: altas, modificaciones,
+    cambios de estado y bajas, opcionalmente de un médico o una sucursal.
+    Al reconectarse, el header Last-Event-ID (que envía EventSource) tiene
+    prioridad sobre `desde`; sin ninguno se reciben solo los cambios nuevos.
+    """
+    desde_id = desde
+    if last_event_id is not None:
+        if not last_event_id.isdigit():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Last-Event-ID inválido.")
+        desde_id = int(last_event_id)
+
+    return StreamingResponse(
+        transmitir_eventos(desde_id, request.is_disconnected, medico_matricula, sucursal_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/medico/{matricula}", response_model=List[TurnoOut])
 def obtener_turnos_por_medico(
     matricula: str, service: TurnoService = Depends(get_turno_service)
@@ -77,7 +252,35 @@ def obtener_turnos_por_paciente(
 
 
 # ----------------------------------------------------
-# Endpoint 3: Cambios de Estado (Patrón State)
+# Endpoint 3: Cambios de Estado en lote
+# ----------------------------------------------------
+@router.patch("/estado/batch", response_model=TurnoEstadoLoteOut)
+def gestionar_estado_turnos_lote(
+    payload: TurnoEstadoLoteUpdate, service: TurnoService = Depends(get_turno_service)
+):
+    """
+    Aplica una acción (o una por turno) a muchos turnos: valida cada transición
+    contra la máquina de estados y las aplica con un UPDATE por estado destino,
+    en una sola transacción. El resultado de cada ítem se informa en el orden enviado.
+    """
+    try:
+        resultados = service.cambiar_estados_lote(
+            payload.turnos, accion=payload.accion, atomico=payload.atomico
+        )
+    except TransicionInvalidaError as e:
+        # Lote atómico: otro proceso cambió alguno de los turnos durante la operación
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    aplicados = sum(1 for r in resultados if r["aplicado"])
+    return {
+        "aplicados": aplicados,
+        "rechazados": len(resultados) - aplicados,
+        "resultados": resultados,
+    }
+
+
+# ----------------------------------------------------
+# Endpoint 3b: Cambio de Estado de un turno (máquina de estados)
 # ----------------------------------------------------
 @router.patch(
     "/{fecha}/{hora}/{nro_paciente}/{accion}",
@@ -89,15 +292,7 @@ def gestionar_estado_turno(
     hora: str,
     nro_paciente: int,
     # FastAPI valida que solo se envíen estas acciones
-    accion: Literal[
-        "confirmar",
-        "cancelar",
-        "reprogramar",
-        "atender",
-        "finalizar",
-        "anunciar",
-        "marcarAusente",
-    ],
+    accion: AccionTurno,
     service: TurnoService = Depends(get_turno_service),
 ):
     pk_data = {"fecha": fecha, "hora": hora, "paciente_nro": nro_paciente}
@@ -109,7 +304,7 @@ def gestionar_estado_turno(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
     except TransicionInvalidaError as e:
-        # El Service lanzó la excepción porque el Patrón State no permite la acción
+        # El Service lanzó la excepción porque la máquina de estados no permite la acción
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     except HorarioNoDisponibleError as e:
@@ -163,5 +358,8 @@ def actualizar_turno_endpoint(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Turno no encontrado"
         )
+    except HorarioNoDisponibleError as e:
+        # El nuevo horario se superpone, está fuera de agenda o retenido
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
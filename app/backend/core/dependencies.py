@@ -11,6 +11,7 @@ from app.backend.core import security
 from app.backend.db.db import get_db
 from app.backend.models.models import User
 from app.backend.services.user_repository import UserRepository
+from app.backend.services.catalogos import rol_nombre
 
 
 # ============================================
@@ -62,13 +63,13 @@ def role_required(allowed_roles: List[str]):
 
     def checker(current_user: User = Depends(get_current_user)):
 
-        if not current_user.role:
+        # Nombre del rol desde el catálogo en memoria (sin cargar la relación)
+        role_name = rol_nombre(current_user.Role_Id)
+        if not role_name:
             raise HTTPException(
                 status_code=500, detail="El usuario no tiene un rol asignado"
             )
 
-        role_name = current_user.role.Nombre
-
         if role_name not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,59 @@
+"""
+Contador de sentencias SQL, para detectar consultas N+1.
+
+Escucha `before_cursor_execute` del engine mientras está activo y registra cada
+sentencia. Pensado para pruebas y scripts de verificación:
+
+    with limitar_consultas(3):
+        client.get("/api/turnos/turnos/medico/M-1")
+
+falla (AssertionError, con el listado de sentencias) si la petición ejecutó más
+de 3. Con ContadorConsultas se puede comparar la cantidad entre dos tamaños de
+datos para verificar que sea constante.
+"""
+
+from contextlib import contextmanager
+from threading import Lock
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.backend.db.db import engine as default_engine
+
+
+class ContadorConsultas:
+    """Context manager que registra las sentencias SQL ejecutadas por un engine."""
+
+    def __init__(self, bind: Engine = default_engine):
+        self.bind = bind
+        self.sentencias: List[str] = []
+        self._lock = Lock()
+
+    @property
+    def cantidad(self) -> int:
+        return len(self.sentencias)
+
+    def __enter__(self) -> "ContadorConsultas":
+        event.listen(self.bind, "before_cursor_execute", self._registrar)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.bind, "before_cursor_execute", self._registrar)
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        # Las peticiones de FastAPI corren en otro hilo (threadpool)
+        with self._lock:
+            self.sentencias.append(statement)
+
+
+@contextmanager
+def limitar_consultas(maximo: int, bind: Engine = default_engine):
+    """Falla si el bloque ejecuta más de `maximo` sentencias SQL."""
+    with ContadorConsultas(bind) as contador:
+        yield contador
+    if contador.cantidad > maximo:
+        detalle = "\n".join(f"  {i}. {s}" for i, s in enumerate(contador.sentencias, 1))
+        raise AssertionError(
+            f"Se ejecutaron {contador.cantidad} sentencias SQL (máximo {maximo}):\n{detalle}"
+        )
@@ -1,5 +1,6 @@
 from app.backend.db.db import SessionLocal
-from app.backend.models.models import Estado
+from app.backend.models.models import Estado, IDS_ESTADOS_QUE_OCUPAN_DDL
+from app.backend.services.catalogos import cargar_catalogos, estados_que_ocupan
 
 def init_estados():
     db = SessionLocal()
@@ -21,32 +22,20 @@ def init_estados():
             db.add(nuevo)
 
     db.commit()
-    db.close()
-
-    print("✔ Estados iniciales cargados correctamente.")
-from app.backend.db.db import SessionLocal
-from app.backend.models.models import Estado
-
-def init_estados():
-    db = SessionLocal()
 
-    estados = [
-        "Pendiente",
-        "Confirmado",
-        "Cancelado",
-        "Atendido",
-        "Finalizado",
-        "Ausente",
-        "Anunciado"
-    ]
-
-    for desc in estados:
-        existe = db.query(Estado).filter_by(Descripcion=desc).first()
-        if not existe:
-            nuevo = Estado(Descripcion=desc)
-            db.add(nuevo)
-
-    db.commit()
+    # Registro en memoria de Estados y Roles (nombre <-> id) para todo el proceso
+    catalogos = cargar_catalogos(db)
     db.close()
 
-    print("✔ Estados iniciales cargados correctamente.")
\ No newline at end of file
+    # El índice único parcial de Turnos se declara con ids literales (el DDL no admite
+    # otra cosa): si no coinciden con el catálogo, el índice protege estados
+    # equivocados y no se puede seguir
+    ocupan = tuple(sorted(estados_que_ocupan()))
+    if ocupan != tuple(sorted(IDS_ESTADOS_QUE_OCUPAN_DDL)):
+        raise RuntimeError(
+            f"Los ids de los estados que ocupan lugar {ocupan} no coinciden con los del "
+            f"índice ux_turnos_medico_fecha_hora_activos {IDS_ESTADOS_QUE_OCUPAN_DDL}: "
+            "corrija la tabla Estados o IDS_ESTADOS_QUE_OCUPAN_DDL (y el índice) antes de iniciar."
+        )
+
+    print(f"✔ Estados iniciales cargados correctamente ({len(catalogos.estados)} estados, {len(catalogos.roles)} roles).")
@@ -0,0 +1,23 @@
+from app.backend.db.db import SessionLocal
+from app.backend.services.report_service import periodos_comunes, precalentar_reportes
+from app.backend.services.turno_repository import TurnoRepository
+
+
+def init_reportes():
+    """
+    Precalienta la caché de reportes (mes actual y anterior, todos los tipos)
+    para que el primer refresco del tablero de administración no los calcule.
+    """
+    db = SessionLocal()
+
+    try:
+        total = precalentar_reportes(TurnoRepository(db))
+    except Exception as e:
+        # Es solo una optimización: un error no debe impedir levantar la API
+        print(f"❌ ERROR al precalentar la caché de reportes: {e}")
+        return
+    finally:
+        db.close()
+
+    periodos = ", ".join(f"{desde} a {hasta}" for desde, hasta in periodos_comunes())
+    print(f"✔ Caché de reportes precalentada ({total} reportes: {periodos}).")
@@ -0,0 +1,44 @@
+"""
+Calendario materializado de slots (tabla Slots).
+
+Al arrancar la app solo se corre el horizonte rodante (días nuevos y vencidos),
+igual que el job diario: el costo no crece con médicos × HORIZONTE_DIAS.
+
+La reconstrucción completa queda como comando de mantenimiento, para reparar
+cambios hechos por fuera de los repositorios (ej. datos cargados a mano):
+    python -m app.backend.db.init_slots --reconstruir
+"""
+
+import sys
+
+from app.backend.db.db import SessionLocal
+from app.backend.services.slot_repository import SlotRepository, HORIZONTE_DIAS
+
+
+def init_slots(reconstruir: bool = False):
+    """
+    Asegura el calendario de slots de todos los médicos para el horizonte
+    rodante de HORIZONTE_DIAS días. Con reconstruir=True lo rematerializa entero.
+    """
+    db = SessionLocal()
+
+    try:
+        repo = SlotRepository(db)
+        total = repo.reconstruir_todos() if reconstruir else repo.extender_todos()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    accion = "reconstruido" if reconstruir else "al día"
+    print(f"✔ Calendario de slots {accion} ({total} médicos, {HORIZONTE_DIAS} días).")
+
+
+if __name__ == "__main__":
+    from app.backend.db.db import Base, engine
+    from app.backend.db.migraciones import aplicar_migraciones
+
+    Base.metadata.create_all(bind=engine)
+    aplicar_migraciones(engine)
+    init_slots(reconstruir="--reconstruir" in sys.argv)
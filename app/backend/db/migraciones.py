@@ -0,0 +1,320 @@
+"""
+Migraciones versionadas del esquema SQLite.
+
+`Base.metadata.create_all` solo crea las tablas que faltan: no agrega índices
+ni columnas a una base existente. Cada migración se registra con su número de
+versión y se aplica una única vez, en orden, sobre el archivo existente; las
+aplicadas quedan registradas en la tabla Schema_Version.
+
+Uso (desde la raíz del proyecto):
+    python -m app.backend.db.migraciones            # aplica pendientes + verifica planes
+    python -m app.backend.db.migraciones --verificar # solo verifica planes
+"""
+
+import re
+import sys
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.backend.db.db import Base, engine as default_engine
+from app.backend.models.models import (
+    IDS_ESTADOS_QUE_OCUPAN_DDL,
+    ResumenTurnoDiario,
+    SchemaVersion,
+    sql_dia,
+    sql_minutos,
+)
+from app.backend.services.catalogos import estados_que_ocupan
+
+_MIGRACIONES: List[Tuple[int, str, Callable[[Connection], None]]] = []
+
+
+def migracion(version: int, descripcion: str):
+    """Registra una migración (usable como decorador)."""
+
+    def registrar(funcion: Callable[[Connection], None]):
+        _MIGRACIONES.append((version, descripcion, funcion))
+        return funcion
+
+    return registrar
+
+
+# ==================================================================
+# Migraciones
+# ==================================================================
+@migracion(1, "Índices compuestos para las consultas calientes de turnos, agendas y recetas")
+def _indices_consultas_calientes(conn: Connection) -> None:
+    # Disponibilidad (ocupación), reportes por médico y TurnoRepository.get_by_medico_matricula
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_turnos_medico_fecha_estado "
+        "ON Turnos (Medico_Matricula, Fecha, Estado_Id, Hora, Duracion)"
+    ))
+    # Notificaciones / recordatorios (fecha + estado + rango de hora)
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_turnos_fecha_estado_hora "
+        "ON Turnos (Fecha, Estado_Id, Hora)"
+    ))
+    # Turnos de un paciente (la PK empieza por Fecha)
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_turnos_paciente ON Turnos (Paciente_nroPaciente)"
+    ))
+    # Excepciones de un médico que se solapan con un rango de fechas
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_agendas_exc_medico_fechas "
+        "ON Agendas_Excepcionales (Medico_Matricula, Fecha_inicio, Fecha_Fin)"
+    ))
+    # Recetas de un turno
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_recetas_turno "
+        "ON Recetas (Turno_Fecha, Turno_Hora, Turno_Paciente_nroPaciente)"
+    ))
+
+
+@migracion(2, "Columnas enteras de fecha/hora (días y minutos) e índices sobre ellas")
+def _columnas_fecha_hora(conn: Connection) -> None:
+    # 1. Normalizar horas de un dígito ("9:00" → "09:00") para que el texto también ordene bien
+    horas_texto = {
+        "Turnos": ["Hora"],
+        "Recetas": ["Turno_Hora"],
+        "Agendas_Regulares": ["Hora_inicio", "Hora_fin"],
+        "Agendas_Excepcionales": ["Hora_inicio", "Hora_Fin"],
+    }
+    for tabla, columnas in horas_texto.items():
+        for columna in columnas:
+            conn.execute(text(
+                f"UPDATE OR IGNORE {tabla} SET {columna} = '0' || {columna} "
+                f"WHERE {columna} GLOB '[0-9]:[0-9][0-9]'"
+            ))
+
+    # 2. Columnas generadas (VIRTUAL: SQLite permite agregarlas con ALTER TABLE)
+    derivadas = {
+        "Turnos": [("Fecha_Dia", sql_dia("Fecha")), ("Hora_Minutos", sql_minutos("Hora"))],
+        "Agendas_Regulares": [
+            ("Inicio_Minutos", sql_minutos("Hora_inicio")),
+            ("Fin_Minutos", sql_minutos("Hora_fin")),
+        ],
+        "Agendas_Excepcionales": [
+            ("Fecha_inicio_Dia", sql_dia("Fecha_inicio")),
+            ("Fecha_Fin_Dia", sql_dia("Fecha_Fin")),
+            ("Inicio_Minutos", sql_minutos("Hora_inicio")),
+            ("Fin_Minutos", sql_minutos("Hora_Fin")),
+        ],
+    }
+    for tabla, columnas in derivadas.items():
+        # table_xinfo (a diferencia de table_info) también lista las columnas generadas
+        existentes = {fila[1] for fila in conn.execute(text(f"PRAGMA table_xinfo({tabla})"))}
+        for nombre, expresion in columnas:
+            if nombre not in existentes:
+                conn.execute(text(
+                    f"ALTER TABLE {tabla} ADD COLUMN {nombre} INTEGER "
+                    f"GENERATED ALWAYS AS ({expresion}) VIRTUAL"
+                ))
+
+    # 3. Los índices por rango pasan a las columnas enteras
+    conn.execute(text("DROP INDEX IF EXISTS ix_turnos_medico_fecha_estado"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_turnos_medico_dia_estado "
+        "ON Turnos (Medico_Matricula, Fecha_Dia, Estado_Id, Hora_Minutos, Duracion, Hora)"
+    ))
+    conn.execute(text("DROP INDEX IF EXISTS ix_agendas_exc_medico_fechas"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_agendas_exc_medico_dias "
+        "ON Agendas_Excepcionales (Medico_Matricula, Fecha_inicio_Dia, Fecha_Fin_Dia)"
+    ))
+
+
+@migracion(3, "Índice único parcial: un turno activo por médico, fecha y hora")
+def _unico_turno_activo_por_medico(conn: Connection) -> None:
+    # Si ya hay duplicados el índice no se puede crear: se listan para resolverlos a mano
+    duplicados = conn.execute(text(
+        "SELECT Medico_Matricula, Fecha, Hora, COUNT(*) FROM Turnos "
+        f"WHERE Estado_Id IN {IDS_ESTADOS_QUE_OCUPAN_DDL} "
+        "GROUP BY Medico_Matricula, Fecha, Hora HAVING COUNT(*) > 1"
+    )).all()
+    if duplicados:
+        detalle = ", ".join(f"{m} {f} {h} (x{n})" for m, f, h, n in duplicados)
+        raise RuntimeError(f"Turnos activos duplicados por médico/fecha/hora: {detalle}")
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_turnos_medico_fecha_hora_activos "
+        f"ON Turnos (Medico_Matricula, Fecha, Hora) WHERE Estado_Id IN {IDS_ESTADOS_QUE_OCUPAN_DDL}"
+    ))
+
+
+@migracion(4, "Índices para la búsqueda paginada de turnos (keyset por Fecha, Hora, Paciente)")
+def _indices_busqueda_turnos(conn: Connection) -> None:
+    # Filtro por médico recorriendo en el orden del cursor
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_turnos_medico_fecha_hora_paciente "
+        "ON Turnos (Medico_Matricula, Fecha, Hora, Paciente_nroPaciente)"
+    ))
+    # Filtro por paciente: reemplaza al índice de una sola columna
+    conn.execute(text("DROP INDEX IF EXISTS ix_turnos_paciente"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_turnos_paciente_fecha_hora "
+        "ON Turnos (Paciente_nroPaciente, Fecha, Hora)"
+    ))
+
+
+@migracion(5, "Índice de turnos por sucursal y día (tablero de recepción)")
+def _indice_tablero_sucursal(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_turnos_sucursal_fecha_hora "
+        "ON Turnos (Sucursal_Id, Fecha, Hora)"
+    ))
+
+
+@migracion(6, "Resumen diario de turnos: índice del archivo por médico y carga inicial")
+def _resumen_turnos_diario(conn: Connection) -> None:
+    from app.backend.services.resumen_turnos_repository import (
+        COLUMNAS_RESUMEN,
+        select_resumen,
+    )
+
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_turnos_archivo_medico_fecha "
+        "ON Turnos_Archivo (Medico_Matricula, Fecha)"
+    ))
+    # Carga inicial desde los datos crudos (después la mantiene TurnoRepository)
+    conn.execute(ResumenTurnoDiario.__table__.delete())
+    conn.execute(ResumenTurnoDiario.__table__.insert().from_select(COLUMNAS_RESUMEN, select_resumen()))
+
+
+@migracion(7, "Índice del archivo de turnos por paciente (historial del paciente)")
+def _indice_archivo_paciente(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_turnos_archivo_paciente_fecha_hora "
+        "ON Turnos_Archivo (Paciente_nroPaciente, Fecha, Hora)"
+    ))
+
+
+# ==================================================================
+# Aplicación
+# ==================================================================
+def versiones_aplicadas(bind: Engine = default_engine) -> set:
+    SchemaVersion.__table__.create(bind=bind, checkfirst=True)
+    with bind.connect() as conn:
+        return {v for (v,) in conn.execute(text("SELECT Version FROM Schema_Version"))}
+
+
+def aplicar_migraciones(bind: Engine = default_engine) -> List[int]:
+    """Aplica, en orden de versión, las migraciones que todavía no se corrieron."""
+    aplicadas = versiones_aplicadas(bind)
+    nuevas = []
+    for version, descripcion, funcion in sorted(_MIGRACIONES, key=lambda m: m[0]):
+        if version in aplicadas:
+            continue
+        # Cada migración y su registro en Schema_Version van en la misma transacción
+        with bind.begin() as conn:
+            funcion(conn)
+            conn.execute(
+                SchemaVersion.__table__.insert().values(
+                    Version=version,
+                    Descripcion=descripcion,
+                    Aplicada_En=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                )
+            )
+        print(f"✔ Migración {version} aplicada: {descripcion}")
+        nuevas.append(version)
+    return nuevas
+
+
+# ==================================================================
+# Verificación de planes de ejecución
+# ==================================================================
+# Consultas clave de TurnoRepository / AgendaRepository / RecetaRepository. La de
+# ocupación se arma en consultas_clave() con los ids del catálogo, los mismos que usa el código.
+CONSULTA_OCUPACION = (
+    "ocupación de un médico (AgendaRepository.get_turnos_by_rango)",
+    "SELECT Fecha, Hora, Hora_Minutos, Duracion FROM Turnos WHERE Medico_Matricula = :m "
+    "AND Fecha_Dia >= :desde AND Fecha_Dia <= :hasta AND Estado_Id IN ({ocupan})",
+)
+CONSULTAS_CLAVE = {
+    "turnos de un médico (TurnoRepository.get_by_medico_matricula)": (
+        "SELECT * FROM Turnos WHERE Medico_Matricula = :m"
+    ),
+    "turnos de un paciente (TurnoRepository.get_by_paciente_nro)": (
+        "SELECT * FROM Turnos WHERE Paciente_nroPaciente = :p"
+    ),
+    "turnos archivados de un médico (TurnoRepository.get_by_medico_matricula)": (
+        "SELECT * FROM Turnos_Archivo WHERE Medico_Matricula = :m"
+    ),
+    "turnos archivados de un paciente (TurnoRepository.get_by_paciente_nro)": (
+        "SELECT * FROM Turnos_Archivo WHERE Paciente_nroPaciente = :p"
+    ),
+    "recordatorios (TurnoRepository.get_turnos_by_time_range)": (
+        "SELECT * FROM Turnos WHERE Fecha = :f AND Estado_Id IN (2) "
+        "AND Hora >= :desde AND Hora <= :hasta"
+    ),
+    "reportes por período (TurnoRepository._turnos_periodo)": (
+        "SELECT * FROM Turnos WHERE Fecha >= :desde AND Fecha <= :hasta"
+    ),
+    "reportes por período, archivo (TurnoRepository._turnos_periodo)": (
+        "SELECT * FROM Turnos_Archivo WHERE Fecha >= :desde AND Fecha <= :hasta"
+    ),
+    "reportes por período, resumen diario (ResumenTurnosRepository)": (
+        "SELECT * FROM Resumen_Turnos_Diario WHERE Fecha >= :desde AND Fecha <= :hasta"
+    ),
+    "recálculo de un médico-día (ResumenTurnosRepository.refrescar_dias)": (
+        "SELECT * FROM Turnos_Archivo WHERE Medico_Matricula = :m AND Fecha = :f"
+    ),
+    "excepciones por rango (AgendaRepository.get_agendas_excepcionales_by_rango)": (
+        "SELECT * FROM Agendas_Excepcionales WHERE Medico_Matricula = :m "
+        "AND Fecha_inicio_Dia <= :hasta AND Fecha_Fin_Dia >= :desde"
+    ),
+    "recetas de un turno (RecetaRepository.get_by_turno)": (
+        "SELECT * FROM Recetas WHERE Turno_Fecha = :f AND Turno_Hora = :h "
+        "AND Turno_Paciente_nroPaciente = :p"
+    ),
+    "slots libres (SlotRepository.get_libres)": (
+        "SELECT * FROM Slots WHERE Medico_Matricula = :m "
+        "AND Fecha >= :desde AND Fecha <= :hasta AND Ocupado = 0"
+    ),
+}
+
+_SCAN_COMPLETO = re.compile(r"^SCAN (\w+)$")
+
+
+def consultas_clave() -> Dict[str, str]:
+    """CONSULTAS_CLAVE más la de ocupación, con los estados que ocupan según el catálogo."""
+    nombre, sql = CONSULTA_OCUPACION
+    ocupan = ", ".join(str(id_) for id_ in estados_que_ocupan())
+    return {nombre: sql.format(ocupan=ocupan), **CONSULTAS_CLAVE}
+
+
+def verificar_planes(bind: Engine = default_engine) -> List[str]:
+    """
+    Corre EXPLAIN QUERY PLAN sobre las consultas clave y devuelve las que hacen un
+    recorrido completo de tabla (lista vacía = todas usan índice).
+    """
+    problemas = []
+    with bind.connect() as conn:
+        for nombre, sql in consultas_clave().items():
+            parametros = {p: "" for p in re.findall(r":(\w+)", sql)}
+            plan = conn.execute(text("EXPLAIN QUERY PLAN " + sql), parametros).all()
+            for fila in plan:
+                detalle = fila[-1]
+                if _SCAN_COMPLETO.match(detalle):
+                    problemas.append(f"{nombre}: {detalle}")
+    return problemas
+
+
+if __name__ == "__main__":
+    # En una base nueva las migraciones y los planes suponen las tablas creadas
+    # (lo que hace main.py al arrancar la app)
+    Base.metadata.create_all(bind=default_engine)
+    if "--verificar" not in sys.argv:
+        aplicar_migraciones()
+    # Catálogo de estados (y su chequeo contra el DDL), como al iniciar la app
+    from app.backend.db.init_estados import init_estados
+
+    init_estados()
+
+    problemas = verificar_planes()
+    for problema in problemas:
+        print(f"❌ Recorrido completo de tabla → {problema}")
+    if problemas:
+        sys.exit(1)
+    print(f"✔ Las {len(consultas_clave())} consultas clave usan índices.")
@@ -1,13 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from threading import Thread
 
 from app.backend.api.routes import router as api_router
 from app.backend.db.db import Base, engine
 from app.backend.db.init_estados import init_estados
 from app.backend.db.init_roles_and_admin import init_roles_and_admin
+from app.backend.db.init_slots import init_slots
+from app.backend.db.init_reportes import init_reportes
+from app.backend.db.migraciones import aplicar_migraciones
 # ⭐ Crear tablas si no existen
 Base.metadata.create_all(bind=engine)
+# ⭐ Aplicar migraciones pendientes (índices, columnas nuevas) sobre la base existente
+aplicar_migraciones(engine)
 
 
 # ⭐ Nuevo sistema de Lifespan
@@ -15,9 +21,13 @@ Base.metadata.create_all(bind=engine)
 async def lifespan(app: FastAPI):
     # Se ejecuta AL INICIAR FastAPI
     print("▶ Cargando estados en la base de datos...")
-    init_estados()
     init_roles_and_admin()
+    # Después de los roles: init_estados deja cargado el catálogo de Estados y Roles
+    init_estados()
     print("✔ Estados y roles inicializados correctamente.")
+    init_slots()
+    # En segundo plano: no demora el arranque
+    Thread(target=init_reportes, name="precalentar-reportes", daemon=True).start()
 
     yield  # ← punto donde la app ya está levantada
 
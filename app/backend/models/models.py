@@ -6,20 +6,37 @@ from sqlalchemy import (
     String,
     ForeignKey,
     Float,
+    Index,
+    Computed,
+    text,
 )
 from app.backend.db.db import Base
-from app.backend.state.estados_turno import (
-    PendienteState,
-    ConfirmadoState,
-    CanceladoState,
-    AtendidoState,
-    FinalizadoState,
-    AusenteState,
-    AnunciadoState,
-)
 from sqlalchemy.orm import relationship
 
 
+# Ids de Pendiente, Confirmado y Anunciado tal como los crea init_estados. Solo para
+# DDL (índices parciales), que no admite subconsultas; el código usa services/catalogos.py.
+IDS_ESTADOS_QUE_OCUPAN_DDL = (1, 2, 7)
+
+
+# ----------------------------------------------------
+# Columnas derivadas de fecha/hora (generadas por SQLite)
+# ----------------------------------------------------
+# Fechas y horas se siguen guardando como texto ("YYYY-MM-DD" / "HH:MM") por
+# compatibilidad, y SQLite calcula al lado columnas enteras indexables:
+# días desde 1970-01-01 y minutos desde la medianoche (acepta "9:00").
+def sql_dia(columna: str) -> str:
+    return f"CAST(julianday({columna}) - 2440587.5 AS INTEGER)"
+
+
+def sql_minutos(columna: str) -> str:
+    return (
+        f"CASE WHEN instr({columna}, ':') > 0 THEN "
+        f"CAST(substr({columna}, 1, instr({columna}, ':') - 1) AS INTEGER) * 60 + "
+        f"CAST(substr({columna}, instr({columna}, ':') + 1) AS INTEGER) END"
+    )
+
+
 class Sucursal(Base):
     __tablename__ = "Sucursales"
     Id = Column(Integer, primary_key=True, autoincrement=True)
@@ -133,6 +150,9 @@ class AgendaRegular(Base):
         nullable=True,
     )
 
+    Inicio_Minutos = Column(Integer, Computed(sql_minutos("Hora_inicio"), persisted=False))
+    Fin_Minutos = Column(Integer, Computed(sql_minutos("Hora_fin"), persisted=False))
+
 
 class AgendaExcepcional(Base):
     __tablename__ = "Agendas_Excepcionales"
@@ -157,6 +177,11 @@ class AgendaExcepcional(Base):
     Consultorio_Numero = Column(Integer)
     Consultorio_Sucursal_Id = Column(Integer)
 
+    Fecha_inicio_Dia = Column(Integer, Computed(sql_dia("Fecha_inicio"), persisted=False))
+    Fecha_Fin_Dia = Column(Integer, Computed(sql_dia("Fecha_Fin"), persisted=False))
+    Inicio_Minutos = Column(Integer, Computed(sql_minutos("Hora_inicio"), persisted=False))
+    Fin_Minutos = Column(Integer, Computed(sql_minutos("Hora_Fin"), persisted=False))
+
     __table_args__ = (
         ForeignKeyConstraint(
             ["Consultorio_Numero", "Consultorio_Sucursal_Id"],
@@ -164,6 +189,123 @@ class AgendaExcepcional(Base):
             ondelete="SET NULL",
             onupdate="CASCADE",
         ),
+        # Índices agregados por migración (ver db/migraciones.py)
+        Index(
+            "ix_agendas_exc_medico_dias",
+            "Medico_Matricula",
+            "Fecha_inicio_Dia",
+            "Fecha_Fin_Dia",
+        ),
+    )
+
+
+class Slot(Base):
+    """Calendario materializado de slots (horizonte rodante por médico)."""
+
+    __tablename__ = "Slots"
+    Id = Column(Integer, primary_key=True, autoincrement=True)
+    Medico_Matricula = Column(
+        String,
+        ForeignKey("Medicos.Matricula", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+    )
+    Fecha = Column(Text, nullable=False)
+    Hora = Column(Text, nullable=False)
+    Especialidad_Id = Column(
+        Integer,
+        ForeignKey(
+            "Especialidades.Id_especialidad", ondelete="CASCADE", onupdate="CASCADE"
+        ),
+        nullable=False,
+    )
+    Sucursal_Id = Column(
+        Integer,
+        ForeignKey("Sucursales.Id", ondelete="SET NULL", onupdate="CASCADE"),
+        nullable=True,
+    )
+    Duracion = Column(Integer, nullable=False)
+    Ocupado = Column(Integer, nullable=False, default=0)  # 1: tiene turno, 0: libre
+
+    __table_args__ = (
+        Index("ix_slots_medico_fecha_hora", "Medico_Matricula", "Fecha", "Hora"),
+    )
+
+
+class SlotHorizonte(Base):
+    """Rango de fechas materializado en Slots para cada médico."""
+
+    __tablename__ = "Slots_Horizonte"
+    Medico_Matricula = Column(
+        String,
+        ForeignKey("Medicos.Matricula", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    )
+    Fecha_desde = Column(Text, nullable=False)
+    Fecha_hasta = Column(Text, nullable=False)
+
+
+class ReservaTemporal(Base):
+    """
+    Retención corta de un horario mientras el paciente completa la reserva
+    (ver services/reservas_temporales.py). Vence sola: Vence es epoch en segundos.
+    """
+
+    __tablename__ = "Reservas_Temporales"
+    Token = Column(String, primary_key=True)
+    Medico_Matricula = Column(
+        String,
+        ForeignKey("Medicos.Matricula", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+    )
+    Fecha = Column(Text, nullable=False)
+    Hora = Column(Text, nullable=False)
+    Duracion = Column(Integer, nullable=False)
+    Paciente_nroPaciente = Column(
+        Integer,
+        ForeignKey("Pacientes.nroPaciente", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=True,
+    )
+    Vence = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_reservas_temporales_medico_fecha", "Medico_Matricula", "Fecha", "Vence"),
+    )
+
+
+class EventoTurno(Base):
+    """
+    Outbox de cambios de turnos: cada alta, modificación, cambio de estado o
+    baja agrega una fila en la MISMA transacción que el cambio. El Id creciente
+    es el offset del feed SSE (GET /turnos/eventos).
+    """
+
+    __tablename__ = "Eventos_Turnos"
+
+    Id = Column(Integer, primary_key=True, autoincrement=True)
+    Tipo = Column(Text, nullable=False)  # creado | modificado | estado | eliminado
+    Fecha = Column(Text, nullable=False)
+    Hora = Column(Text, nullable=False)
+    Paciente_nroPaciente = Column(Integer, nullable=False)
+    Medico_Matricula = Column(String, nullable=False)
+    Sucursal_Id = Column(Integer, nullable=True)
+    Estado_Id = Column(Integer, nullable=True)
+    # Clave anterior cuando una modificación cambia la fecha u hora del turno
+    Fecha_Anterior = Column(Text, nullable=True)
+    Hora_Anterior = Column(Text, nullable=True)
+    Creado = Column(Float, nullable=False)  # epoch
+
+    @property
+    def estado(self):
+        from app.backend.services.catalogos import estado_descripcion
+
+        return estado_descripcion(self.Estado_Id)
+
+    __table_args__ = (
+        Index("ix_eventos_turnos_medico", "Medico_Matricula", "Id"),
+        Index("ix_eventos_turnos_sucursal", "Sucursal_Id", "Id"),
+        Index("ix_eventos_turnos_creado", "Creado"),
+        # AUTOINCREMENT: los Id no se reutilizan aunque se purguen los eventos viejos
+        {"sqlite_autoincrement": True},
     )
 
 
@@ -209,15 +351,119 @@ class Turno(Base):
     Motivo = Column(Text)
     Diagnostico = Column(Text)
 
+    Fecha_Dia = Column(Integer, Computed(sql_dia("Fecha"), persisted=False))
+    Hora_Minutos = Column(Integer, Computed(sql_minutos("Hora"), persisted=False))
+
+    # Índices agregados por migración (ver db/migraciones.py)
+    __table_args__ = (
+        # Disponibilidad y reportes por médico (cubre la ocupación: minutos y duración)
+        Index(
+            "ix_turnos_medico_dia_estado",
+            "Medico_Matricula",
+            "Fecha_Dia",
+            "Estado_Id",
+            "Hora_Minutos",
+            "Duracion",
+            "Hora",
+        ),
+        # Notificaciones y jobs por día/estado
+        Index("ix_turnos_fecha_estado_hora", "Fecha", "Estado_Id", "Hora"),
+        # Búsqueda paginada por médico o por paciente (keyset en el orden de la PK)
+        Index(
+            "ix_turnos_medico_fecha_hora_paciente",
+            "Medico_Matricula",
+            "Fecha",
+            "Hora",
+            "Paciente_nroPaciente",
+        ),
+        Index("ix_turnos_paciente_fecha_hora", "Paciente_nroPaciente", "Fecha", "Hora"),
+        # Tablero de recepción: turnos de una sucursal en un día
+        Index("ix_turnos_sucursal_fecha_hora", "Sucursal_Id", "Fecha", "Hora"),
+        # Un médico no puede tener dos turnos activos que empiecen a la misma hora
+        Index(
+            "ux_turnos_medico_fecha_hora_activos",
+            "Medico_Matricula",
+            "Fecha",
+            "Hora",
+            unique=True,
+            sqlite_where=text(f"Estado_Id IN {IDS_ESTADOS_QUE_OCUPAN_DDL}"),
+        ),
+    )
+
     estado_rel = relationship("Estado")
     paciente = relationship("Paciente")
     medico = relationship("Medico")
     especialidad = relationship("Especialidad")
 
-    # PROPIEDAD PARA OBTENER EL NOMBRE DEL ESTADO (Texto)
+    # PROPIEDAD PARA OBTENER EL NOMBRE DEL ESTADO (Texto), resuelto en memoria
+    @property
+    def estado(self):
+        from app.backend.services.catalogos import estado_descripcion
+
+        return estado_descripcion(self.Estado_Id)
+
+    @property
+    def medico_nombre(self):
+        return self.medico.Nombre if self.medico else None
+
+    @property
+    def medico_apellido(self):
+        return self.medico.Apellido if self.medico else None
+
+    @property
+    def especialidad_descripcion(self):
+        return self.especialidad.descripcion if self.especialidad else None
+
+
+class TurnoArchivo(Base):
+    """
+    Archivo de turnos cerrados (Finalizado/Cancelado/Ausente) más viejos que la
+    retención (ver services/archivo_turnos_service.py). Mismas columnas que
+    Turnos, sin claves foráneas ni columnas generadas: es histórico y de solo
+    lectura. Los listados de turnos (TurnoRepository) y los reportes lo unen con
+    Turnos, así el archivo no cambia lo que ve la API.
+    """
+
+    __tablename__ = "Turnos_Archivo"
+
+    Fecha = Column(Text, primary_key=True)
+    Hora = Column(Text, primary_key=True)
+    Paciente_nroPaciente = Column(Integer, primary_key=True)
+    Medico_Matricula = Column(String, nullable=False)
+    Especialidad_Id = Column(Integer, nullable=False)
+    Estado_Id = Column(Integer, nullable=True)
+    Sucursal_Id = Column(Integer, nullable=True)
+    Duracion = Column(Integer)
+    Motivo = Column(Text)
+    Diagnostico = Column(Text)
+    Archivado = Column(Float, nullable=False)  # epoch
+
+    __table_args__ = (
+        # Reportes por rango de fechas (y estado)
+        Index("ix_turnos_archivo_fecha_estado", "Fecha", "Estado_Id"),
+        # Recálculo del resumen diario por médico-día (migración 6)
+        Index("ix_turnos_archivo_medico_fecha", "Medico_Matricula", "Fecha"),
+        # Historial de un paciente (migración 7)
+        Index("ix_turnos_archivo_paciente_fecha_hora", "Paciente_nroPaciente", "Fecha", "Hora"),
+    )
+
+    # Sin claves foráneas: las relaciones se declaran solo para lectura
+    medico = relationship(
+        "Medico",
+        primaryjoin="foreign(TurnoArchivo.Medico_Matricula) == Medico.Matricula",
+        viewonly=True,
+    )
+    especialidad = relationship(
+        "Especialidad",
+        primaryjoin="foreign(TurnoArchivo.Especialidad_Id) == Especialidad.Id_especialidad",
+        viewonly=True,
+    )
+
     @property
     def estado(self):
-        return self.estado_rel.Descripcion if self.estado_rel else None
+        from app.backend.services.catalogos import estado_descripcion
+
+        return estado_descripcion(self.Estado_Id)
 
     @property
     def medico_nombre(self):
@@ -231,26 +477,42 @@ class Turno(Base):
     def especialidad_descripcion(self):
         return self.especialidad.descripcion if self.especialidad else None
 
-    def get_state(self, db):
-        estado = db.query(Estado).filter(Estado.Id == self.Estado_Id).first()
-        if not estado:
-            raise Exception("Estado inválido")
 
-        mapping = {
-            "Pendiente": PendienteState,
-            "Confirmado": ConfirmadoState,
-            "Cancelado": CanceladoState,
-            "Atendido": AtendidoState,
-            "Finalizado": FinalizadoState,
-            "Ausente": AusenteState,
-            "Anunciado": AnunciadoState,
-        }
+# Columnas que Turnos y Turnos_Archivo comparten (orden del INSERT ... SELECT al archivar)
+COLUMNAS_TURNO_ARCHIVO = [
+    columna.name for columna in TurnoArchivo.__table__.columns if columna.name != "Archivado"
+]
+
+
+class ResumenTurnoDiario(Base):
+    """
+    Resumen diario de turnos (Turnos + Turnos_Archivo) por médico, fecha,
+    especialidad, sucursal y estado, para los reportes por período. Se mantiene
+    en la misma transacción que cada cambio de turnos, recalculando los
+    médico-días afectados (ver services/resumen_turnos_repository.py).
+    """
+
+    __tablename__ = "Resumen_Turnos_Diario"
 
-        cls = mapping.get(estado.Descripcion)
-        if not cls:
-            raise Exception(f"Estado desconocido: {estado.Descripcion}")
+    # La PK empieza por médico y fecha: es la clave del recálculo incremental
+    Medico_Matricula = Column(String, primary_key=True)
+    Fecha = Column(Text, primary_key=True)
+    Especialidad_Id = Column(Integer, primary_key=True)
+    Sucursal_Id = Column(Integer, primary_key=True)  # 0 = sin sucursal
+    Estado_Id = Column(Integer, primary_key=True)  # 0 = sin estado
+    Cantidad = Column(Integer, nullable=False)
+    Minutos = Column(Integer, nullable=False)  # suma de Duracion
 
-        return cls(self, db)
+    __table_args__ = (
+        # Reportes por rango de fechas: cubre los conteos por estado y por especialidad
+        Index(
+            "ix_resumen_turnos_fecha_estado",
+            "Fecha",
+            "Estado_Id",
+            "Especialidad_Id",
+            "Cantidad",
+        ),
+    )
 
 
 class Receta(Base):
@@ -270,6 +532,16 @@ class Receta(Base):
         "DetalleReceta", back_populates="receta", cascade="all, delete"
     )
 
+    # Índices agregados por migración (ver db/migraciones.py)
+    __table_args__ = (
+        Index(
+            "ix_recetas_turno",
+            "Turno_Fecha",
+            "Turno_Hora",
+            "Turno_Paciente_nroPaciente",
+        ),
+    )
+
 
 class Droga(Base):
     __tablename__ = "Drogas"
@@ -310,6 +582,15 @@ class DetalleReceta(Base):
     medicamento = relationship("Medicamento", back_populates="detalles")
 
 
+class SchemaVersion(Base):
+    """Migraciones de esquema aplicadas sobre la base (ver db/migraciones.py)."""
+
+    __tablename__ = "Schema_Version"
+    Version = Column(Integer, primary_key=True)
+    Descripcion = Column(Text, nullable=False)
+    Aplicada_En = Column(Text, nullable=False)
+
+
 class Role(Base):
     __tablename__ = "Roles"
 
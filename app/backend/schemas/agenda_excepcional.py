@@ -1,17 +1,18 @@
 # app/backend/schemas/agenda_excepcional.py
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
+from app.backend.schemas.validadores import normalizar_fecha, normalizar_hora
 
 # -----------------
 # Schema de Entrada (CREATE)
 # -----------------
 class AgendaExcepcionalCreate(BaseModel):
-    # Fechas y Horas en formato string (YYYY-MM-DD y HH:MM)
-    Fecha_inicio: str = Field(..., pattern=r"^\d{4}-\d{2}-\d{2}$", description="Formato YYYY-MM-DD")
-    Hora_inicio: str = Field(..., pattern=r"^\d{2}:\d{2}$", description="Formato HH:MM")
-    Fecha_Fin: str = Field(..., pattern=r"^\d{4}-\d{2}-\d{2}$", description="Formato YYYY-MM-DD")
-    Hora_Fin: str = Field(..., pattern=r"^\d{2}:\d{2}$", description="Formato HH:MM")
+    # Fechas y Horas en formato string (YYYY-MM-DD y HH:MM); se guardan normalizadas
+    Fecha_inicio: str = Field(..., pattern=r"^\d{4}-\d{1,2}-\d{1,2}$", description="Formato YYYY-MM-DD")
+    Hora_inicio: str = Field(..., pattern=r"^\d{1,2}:\d{2}$", description="Formato HH:MM")
+    Fecha_Fin: str = Field(..., pattern=r"^\d{4}-\d{1,2}-\d{1,2}$", description="Formato YYYY-MM-DD")
+    Hora_Fin: str = Field(..., pattern=r"^\d{1,2}:\d{2}$", description="Formato HH:MM")
     
     # 1: Disponible (default), 0: No Disponible
     Es_Disponible: int = Field(1, ge=0, le=1) 
@@ -24,6 +25,16 @@ class AgendaExcepcionalCreate(BaseModel):
     Consultorio_Numero: Optional[int] = None
     Consultorio_Sucursal_Id: Optional[int] = None
 
+    @field_validator("Fecha_inicio", "Fecha_Fin")
+    @classmethod
+    def _normalizar_fecha(cls, v: str) -> str:
+        return normalizar_fecha(v)
+
+    @field_validator("Hora_inicio", "Hora_Fin")
+    @classmethod
+    def _normalizar_hora(cls, v: str) -> str:
+        return normalizar_hora(v)
+
 
 # -----------------
 # Schema de Salida (OUT)
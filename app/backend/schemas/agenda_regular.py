@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
+from app.backend.schemas.validadores import normalizar_hora
 
 # -----------------
 # Schema de Entrada (CREATE)
@@ -8,15 +9,21 @@ class AgendaRegularCreate(BaseModel):
     # La validación asegura que el día de la semana esté entre 1 (Lunes) y 7 (Domingo)
     Dia_de_semana: int = Field(..., ge=1, le=7, description="Día de la semana (1=Lunes, 7=Domingo)")
     
-    # Se usan strings para Hora_inicio/fin ya que así están definidos en el Model (Text)
-    Hora_inicio: str = Field(..., pattern=r"^\d{2}:\d{2}$", description="Formato HH:MM") 
-    Hora_fin: str = Field(..., pattern=r"^\d{2}:\d{2}$", description="Formato HH:MM")
+    # Se usan strings para Hora_inicio/fin ya que así están definidos en el Model (Text).
+    # Se acepta "9:00" y se guarda normalizado ("09:00").
+    Hora_inicio: str = Field(..., pattern=r"^\d{1,2}:\d{2}$", description="Formato HH:MM") 
+    Hora_fin: str = Field(..., pattern=r"^\d{1,2}:\d{2}$", description="Formato HH:MM")
     
     # FKs necesarias
     Especialidad_Id: int
     Duracion: int = Field(..., gt=0, description="Duración del turno en minutos")
     Sucursal_Id: Optional[int] = None
 
+    @field_validator("Hora_inicio", "Hora_fin")
+    @classmethod
+    def _normalizar_hora(cls, v: str) -> str:
+        return normalizar_hora(v)
+
 # -----------------
 # Schema de Salida (OUT)
 # -----------------
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field, ConfigDict
+
+class EventoTurnoOut(BaseModel):
+    id: int = Field(alias="Id")
+    tipo: str = Field(alias="Tipo")  # creado | modificado | estado | eliminado
+    fecha: str = Field(alias="Fecha")
+    hora: str = Field(alias="Hora")
+    paciente_nroPaciente: int = Field(alias="Paciente_nroPaciente")
+    medico_matricula: str = Field(alias="Medico_Matricula")
+    sucursal_id: int | None = Field(default=None, alias="Sucursal_Id")
+    estado: str | None = Field(default=None)  # <-- propiedad @property "estado"
+    # Clave anterior si la modificación movió el turno
+    fecha_anterior: str | None = Field(default=None, alias="Fecha_Anterior")
+    hora_anterior: str | None = Field(default=None, alias="Hora_Anterior")
+    creado: float = Field(alias="Creado")  # epoch en segundos
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from datetime import date
+from app.backend.schemas.validadores import normalizar_hora
+
+class ReservaTemporalCreate(BaseModel):
+    fecha: date = Field(alias="Fecha")
+    hora: str = Field(alias="Hora")  # Formato "HH:MM"
+    medico_matricula: str = Field(alias="Medico_Matricula")
+    duracion: int | None = Field(default=None, alias="Duracion")
+    paciente_nroPaciente: int | None = Field(default=None, alias="Paciente_nroPaciente")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @field_validator("hora")
+    @classmethod
+    def _normalizar_hora(cls, v: str) -> str:
+        return normalizar_hora(v)
+
+class ReservaTemporalOut(BaseModel):
+    token: str = Field(alias="Token")
+    medico_matricula: str = Field(alias="Medico_Matricula")
+    fecha: str = Field(alias="Fecha")
+    hora: str = Field(alias="Hora")
+    duracion: int = Field(alias="Duracion")
+    vence: float = Field(alias="Vence")  # epoch en segundos
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List
+
+class TableroTurnoOut(BaseModel):
+    hora: str = Field(alias="Hora")
+    duracion: int | None = Field(default=None, alias="Duracion")
+    estado: str | None = Field(default=None)
+    motivo: str | None = Field(default=None, alias="Motivo")
+
+    paciente_nroPaciente: int = Field(alias="Paciente_nroPaciente")
+    paciente_nombre: str | None = Field(default=None)
+    paciente_apellido: str | None = Field(default=None)
+    paciente_telefono: str | None = Field(default=None)
+
+    medico_matricula: str = Field(alias="Medico_Matricula")
+    medico_nombre: str | None = Field(default=None)
+    medico_apellido: str | None = Field(default=None)
+
+    especialidad_id: int | None = Field(default=None, alias="Especialidad_Id")
+    especialidad_descripcion: str | None = Field(default=None)
+    # Consultorio de la agenda excepcional del médico ese día (None si no figura)
+    consultorio_numero: int | None = Field(default=None, alias="Consultorio_Numero")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+# Tablero de recepción (GET /sucursales/{id}/tablero)
+class TableroOut(BaseModel):
+    sucursal_id: int
+    fecha: str
+    turnos: List[TableroTurnoOut]
+    # Epoch en que se armó (las respuestas pueden venir de la caché)
+    generado: float
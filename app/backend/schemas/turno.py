@@ -1,6 +1,9 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 from datetime import date
-from typing import Optional
+from typing import List, Literal, Optional
+from app.backend.schemas.validadores import normalizar_hora
+from app.backend.schemas.agenda_disponible import AgendaDisponibleOut
+from app.backend.state.estados_turno import ACCIONES
 
 class TurnoBase(BaseModel):
     Fecha: date
@@ -25,9 +28,16 @@ class TurnoCreate(BaseModel):
     sucursal_id: int | None = Field(default=None, alias="Sucursal_Id")
     duracion: int | None = Field(default=None, alias="Duracion")
     motivo: str | None = Field(default=None, alias="Motivo")
+    # Token de una retención temporal del horario (POST /turnos/retenciones)
+    reserva_token: str | None = Field(default=None, alias="Reserva_Token")
 
     model_config = ConfigDict(populate_by_name=True)
 
+    @field_validator("hora")
+    @classmethod
+    def _normalizar_hora(cls, v: str) -> str:
+        return normalizar_hora(v)
+
 class TurnoUpdate(BaseModel):
     Medico_Matricula: Optional[str]
     Especialidad_Id: Optional[int]
@@ -60,6 +70,15 @@ class TurnoOut(BaseModel):
         from_attributes = True
         populate_by_name = True
 
+# Búsqueda paginada (GET /turnos/buscar)
+LIMITE_PAGINA_TURNOS = 50
+MAX_LIMITE_PAGINA_TURNOS = 500
+
+class TurnoPaginaOut(BaseModel):
+    items: List[TurnoOut]
+    # Cursor para la página siguiente (None si es la última)
+    siguiente: str | None = None
+
 class TurnoUpdate(BaseModel):
     fecha: date | None = Field(default=None, alias="Fecha")
     hora: str | None = Field(default=None, alias="Hora")
@@ -67,3 +86,121 @@ class TurnoUpdate(BaseModel):
     diagnostico: str | None = Field(default=None, alias="Diagnostico")
 
     model_config = ConfigDict(populate_by_name=True)
+
+    @field_validator("hora")
+    @classmethod
+    def _normalizar_hora(cls, v: str | None) -> str | None:
+        return normalizar_hora(v) if v is not None else v
+
+
+# ============================
+# ALTA EN LOTE
+# ============================
+MAX_TURNOS_LOTE = 500
+
+class TurnoLoteCreate(BaseModel):
+    turnos: List[TurnoCreate] = Field(min_length=1, max_length=MAX_TURNOS_LOTE)
+    # True: si algún turno no es válido no se crea ninguno
+    atomico: bool = False
+
+class TurnoLoteResultado(BaseModel):
+    indice: int
+    creado: bool
+    turno: TurnoOut | None = None
+    error: str | None = None
+
+class TurnoLoteOut(BaseModel):
+    creados: int
+    rechazados: int
+    resultados: List[TurnoLoteResultado]
+
+
+# ============================
+# CAMBIO DE ESTADO EN LOTE
+# ============================
+# Acciones de la máquina de estados (state/estados_turno.py)
+AccionTurno = Literal[ACCIONES]
+
+class TurnoEstadoLoteItem(BaseModel):
+    fecha: date = Field(alias="Fecha")
+    hora: str = Field(alias="Hora")
+    paciente_nroPaciente: int = Field(alias="Paciente_nroPaciente")
+    # Si se omite se usa la Accion del lote
+    accion: AccionTurno | None = Field(default=None, alias="Accion")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @field_validator("hora")
+    @classmethod
+    def _normalizar_hora(cls, v: str) -> str:
+        return normalizar_hora(v)
+
+class TurnoEstadoLoteUpdate(BaseModel):
+    accion: AccionTurno | None = Field(default=None, alias="Accion")
+    turnos: List[TurnoEstadoLoteItem] = Field(min_length=1, max_length=MAX_TURNOS_LOTE)
+    # True: si alguna transición no es válida no se aplica ninguna
+    atomico: bool = False
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @model_validator(mode="after")
+    def _validar_acciones(self):
+        if self.accion is None and any(t.accion is None for t in self.turnos):
+            raise ValueError("Cada turno debe indicar su Accion si el lote no define una.")
+        return self
+
+class TurnoEstadoLoteResultado(BaseModel):
+    indice: int
+    aplicado: bool
+    turno: TurnoOut | None = None
+    error: str | None = None
+
+class TurnoEstadoLoteOut(BaseModel):
+    aplicados: int
+    rechazados: int
+    resultados: List[TurnoEstadoLoteResultado]
+
+
+# ============================
+# SERIES (TURNOS RECURRENTES)
+# ============================
+class TurnoSerieCreate(BaseModel):
+    medico_matricula: str = Field(alias="Medico_Matricula")
+    paciente_nroPaciente: int = Field(alias="Paciente_nroPaciente")
+    especialidad_id: int = Field(alias="Especialidad_Id")
+    sucursal_id: int | None = Field(default=None, alias="Sucursal_Id")
+    duracion: int | None = Field(default=None, alias="Duracion")
+    motivo: str | None = Field(default=None, alias="Motivo")
+
+    fecha_inicio: date = Field(alias="Fecha_inicio")
+    hora: str = Field(alias="Hora")  # Formato "HH:MM"
+    dias_semana: List[int] = Field(alias="Dias_semana", min_length=1)  # 1 = lunes ... 7 = domingo
+    semanas: int = Field(alias="Semanas", ge=1, le=52)
+    intervalo_semanas: int = Field(default=1, alias="Intervalo_semanas", ge=1)
+    alternativas: int = Field(default=3, alias="Alternativas", ge=0, le=10)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @field_validator("hora")
+    @classmethod
+    def _normalizar_hora(cls, v: str) -> str:
+        return normalizar_hora(v)
+
+    @field_validator("dias_semana")
+    @classmethod
+    def _validar_dias(cls, v: List[int]) -> List[int]:
+        if any(d < 1 or d > 7 for d in v):
+            raise ValueError("Los días de semana van de 1 (lunes) a 7 (domingo).")
+        return v
+
+class TurnoSerieOcurrencia(BaseModel):
+    fecha: str
+    hora: str
+    disponible: bool
+    turno: TurnoOut | None = None
+    motivo: str | None = None
+    alternativas: List[AgendaDisponibleOut] = []
+
+class TurnoSerieOut(BaseModel):
+    creada: bool
+    ocurrencias: List[TurnoSerieOcurrencia]
@@ -0,0 +1,30 @@
+"""
+Normalización de fechas y horas recibidas por la API.
+
+Las columnas de texto se comparan lexicográficamente, así que todo lo que se
+persiste tiene que estar en formato canónico: "HH:MM" y "YYYY-MM-DD".
+Se aceptan también las variantes sin cero a la izquierda ("9:00", "2025-3-7").
+"""
+
+from datetime import date
+
+
+def normalizar_hora(valor: str) -> str:
+    """'H:MM' / 'HH:MM' → 'HH:MM' (valida que sea una hora real)."""
+    try:
+        horas, minutos = valor.split(":")
+        horas, minutos = int(horas), int(minutos)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Formato de hora inválido: {valor}. Use HH:MM")
+    if not (0 <= horas < 24 and 0 <= minutos < 60):
+        raise ValueError(f"Hora fuera de rango: {valor}")
+    return f"{horas:02d}:{minutos:02d}"
+
+
+def normalizar_fecha(valor: str) -> str:
+    """'YYYY-M-D' / 'YYYY-MM-DD' → 'YYYY-MM-DD' (valida que sea una fecha real)."""
+    try:
+        anio, mes, dia = (int(parte) for parte in valor.split("-"))
+        return date(anio, mes, dia).strftime("%Y-%m-%d")
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError(f"Fecha inválida: {valor}. Use YYYY-MM-DD")
@@ -0,0 +1,65 @@
+"""
+Caché en memoria de agendas compiladas (AgendaCompilada) por médico.
+
+LRU acotada con invalidación versionada: cada alta/baja de agenda incrementa la
+versión del médico, y una agenda compilada con una versión anterior nunca se
+vuelve a servir (aunque otra request la haya estado construyendo en paralelo).
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from app.backend.services.disponibilidad_engine import AgendaCompilada
+from app.backend.services.eventos import suscribir_cambios_agenda
+
+
+class AgendaCompiladaCache:
+    def __init__(self, max_entradas: int = 512):
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[str, Tuple[int, AgendaCompilada]]" = OrderedDict()
+        self._versiones: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def version(self, medico_matricula: str) -> int:
+        with self._lock:
+            return self._versiones.get(medico_matricula, 0)
+
+    def obtener(self, medico_matricula: str) -> Optional[AgendaCompilada]:
+        with self._lock:
+            entrada = self._entradas.get(medico_matricula)
+            if entrada is None:
+                return None
+            version, agenda = entrada
+            if version != self._versiones.get(medico_matricula, 0):
+                del self._entradas[medico_matricula]
+                return None
+            self._entradas.move_to_end(medico_matricula)
+            return agenda
+
+    def guardar(
+        self, medico_matricula: str, agenda: AgendaCompilada, version: int
+    ) -> None:
+        with self._lock:
+            if version != self._versiones.get(medico_matricula, 0):
+                return  # Se invalidó mientras se compilaba
+            self._entradas[medico_matricula] = (version, agenda)
+            self._entradas.move_to_end(medico_matricula)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, medico_matricula: str) -> None:
+        with self._lock:
+            self._versiones[medico_matricula] = (
+                self._versiones.get(medico_matricula, 0) + 1
+            )
+            self._entradas.pop(medico_matricula, None)
+
+
+# Instancia única del proceso
+agenda_cache = AgendaCompiladaCache()
+
+
+@suscribir_cambios_agenda
+def _invalidar_agenda(medico_matricula: str):
+    agenda_cache.invalidar(medico_matricula)
@@ -1,10 +1,22 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, select, union_all, literal, null
 from app.backend.models.models import AgendaRegular, AgendaExcepcional, Turno, Medico
 from app.backend.schemas.agenda_excepcional import AgendaExcepcionalCreate
 from app.backend.schemas.agenda_regular import AgendaRegularCreate
+from app.backend.services.slot_repository import SlotRepository
+from app.backend.services.disponibilidad_engine import (
+    AgendaCompilada,
+    OcupacionDia,
+    fecha_a_dia,
+    minutos_a_hora,
+)
+from app.backend.services.ocupacion_cache import ocupacion_cache
+from app.backend.services.agenda_cache import agenda_cache
+from app.backend.services.catalogos import estados_que_ocupan
 from datetime import date, time, datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+MINUTOS_POR_DIA = 24 * 60
 
 
 class AgendaRepository:
@@ -29,6 +41,8 @@ class AgendaRepository:
             Consultorio_Sucursal_Id=data.Consultorio_Sucursal_Id,
         )
         self.db.add(agenda)
+        self.db.flush()
+        self._sincronizar_slots_excepcional(agenda)
         self.db.commit()
         self.db.refresh(agenda)
         return agenda
@@ -47,6 +61,8 @@ class AgendaRepository:
             Sucursal_Id=data.Sucursal_Id,
         )
         self.db.add(agenda)
+        self.db.flush()
+        self._sincronizar_slots(medico_matricula, dia_de_semana=agenda.Dia_de_semana)
         self.db.commit()
         self.db.refresh(agenda)
         return agenda
@@ -82,127 +98,263 @@ class AgendaRepository:
             .all()
         )
 
+    def get_matriculas_by_sucursal(self, sucursal_id: int) -> List[str]:
+        """Médicos con alguna agenda (regular o excepcional) en la sucursal."""
+        regulares = select(AgendaRegular.Medico_Matricula).where(
+            AgendaRegular.Sucursal_Id == sucursal_id
+        )
+        excepcionales = select(AgendaExcepcional.Medico_Matricula).where(
+            AgendaExcepcional.Consultorio_Sucursal_Id == sucursal_id
+        )
+        filas = self.db.execute(regulares.union(excepcionales)).all()
+        return sorted(m for (m,) in filas)
+
     def delete_agenda_regular(self, agenda: AgendaRegular) -> None:
         self.db.delete(agenda)
+        self.db.flush()
+        self._sincronizar_slots(
+            agenda.Medico_Matricula, dia_de_semana=agenda.Dia_de_semana
+        )
         self.db.commit()
 
     # ==================================================================
+    # Sincronización del calendario materializado (tabla Slots)
+    # ==================================================================
+    def _sincronizar_slots(
+        self,
+        medico_matricula: str,
+        fecha_inicio: Optional[date] = None,
+        fecha_fin: Optional[date] = None,
+        dia_de_semana: Optional[int] = None,
+    ) -> None:
+        slot_repo = SlotRepository(self.db)
+        if not slot_repo.get_horizonte(medico_matricula):
+            # Primera agenda del médico: se materializa el horizonte completo
+            slot_repo.asegurar_horizonte(medico_matricula)
+            return
+
+        slot_repo.refrescar(
+            medico_matricula,
+            fecha_inicio or date.min,
+            fecha_fin or date.max,
+            dia_de_semana,
+        )
 
-    def verificar_disponibilidad(
-        self, medico_matricula: str, fecha_turno: date, hora_turno: time, duracion: int
-    ) -> str | None:
-        """
-        Verifica la disponibilidad y conflictos. Retorna un mensaje de error (str) o None (disponible).
-        """
-
-        # --- CÓDIGO DE PREPARACIÓN DE HORA (USANDO %H:%M) ---
-        hora_inicio_str = hora_turno.strftime("%H:%M")
+    def _sincronizar_slots_excepcional(self, agenda: AgendaExcepcional) -> None:
+        self._sincronizar_slots(
+            agenda.Medico_Matricula,
+            datetime.strptime(agenda.Fecha_inicio, "%Y-%m-%d").date(),
+            datetime.strptime(agenda.Fecha_Fin, "%Y-%m-%d").date(),
+        )
 
-        turno_datetime = datetime.combine(fecha_turno, hora_turno)
-        turno_fin = turno_datetime + timedelta(minutes=duracion)
-        hora_fin_str = turno_fin.strftime("%H:%M")
+    # ==================================================================
 
-        # 1. CHEQUEO DE CONFLICTO con Turnos Existentes: (¡CORREGIDO!)
-        # Solapamiento Simplificado: Chequea si otro turno empieza a la misma hora para ese médico.
-        turno_ocupado = (
-            self.db.query(Turno)
-            .filter(
-                Turno.Medico_Matricula == medico_matricula,
-                Turno.Fecha == fecha_turno.strftime("%Y-%m-%d"),
-                Turno.Estado_Id.in_([1, 2, 7]),
-            )
-            .all()
+    def cargar_hechos_disponibilidad(
+        self, medico_matricula: str, fecha_turno: date, excluir: Optional[tuple] = None
+    ) -> dict:
+        """
+        Obtiene en UNA sola consulta (UNION ALL) todo lo necesario para decidir la
+        disponibilidad de un médico en una fecha: turnos que ocupan lugar,
+        agendas excepcionales vigentes ese día y agendas regulares de ese día de semana.
+        `excluir` (Fecha, Hora, Paciente_nroPaciente) deja afuera un turno (el que se mueve).
+        """
+        dia = fecha_a_dia(fecha_turno)
+
+        turnos = select(
+            literal("T").label("tipo"),
+            Turno.Hora.label("hora_inicio"),
+            null().label("hora_fin"),
+            Turno.Hora_Minutos.label("minuto_inicio"),
+            null().label("minuto_fin"),
+            Turno.Duracion.label("duracion"),
+            null().label("es_disponible"),
+            null().label("motivo"),
+        ).where(
+            Turno.Medico_Matricula == medico_matricula,
+            Turno.Fecha_Dia == dia,
+            Turno.Estado_Id.in_(estados_que_ocupan()),
         )
-
-        for turno_existente in turno_ocupado:
-            try:
-                exist_inicio = datetime.combine(
-                    fecha_turno, datetime.strptime(turno_existente.Hora, "%H:%M").time()
-                )
-            except ValueError:
-                print(
-                    f"ALERTA: Formato de hora inconsistente en DB: {turno_existente.Hora}"
+        if excluir is not None:
+            fecha, hora, paciente_nro = excluir
+            turnos = turnos.where(
+                ~and_(
+                    Turno.Fecha == str(fecha),
+                    Turno.Hora == hora,
+                    Turno.Paciente_nroPaciente == paciente_nro,
                 )
-                continue
-
-            exist_duracion = (
-                turno_existente.Duracion
-                if turno_existente.Duracion and turno_existente.Duracion > 0
-                else 30
             )
-            exist_fin = exist_inicio + timedelta(minutes=exist_duracion)
+        excepciones = select(
+            literal("E").label("tipo"),
+            AgendaExcepcional.Hora_inicio.label("hora_inicio"),
+            AgendaExcepcional.Hora_Fin.label("hora_fin"),
+            AgendaExcepcional.Inicio_Minutos.label("minuto_inicio"),
+            AgendaExcepcional.Fin_Minutos.label("minuto_fin"),
+            null().label("duracion"),
+            AgendaExcepcional.Es_Disponible.label("es_disponible"),
+            AgendaExcepcional.Motivo.label("motivo"),
+        ).where(
+            AgendaExcepcional.Medico_Matricula == medico_matricula,
+            AgendaExcepcional.Fecha_inicio_Dia <= dia,
+            AgendaExcepcional.Fecha_Fin_Dia >= dia,
+        )
+        regulares = select(
+            literal("R").label("tipo"),
+            AgendaRegular.Hora_inicio.label("hora_inicio"),
+            AgendaRegular.Hora_fin.label("hora_fin"),
+            AgendaRegular.Inicio_Minutos.label("minuto_inicio"),
+            AgendaRegular.Fin_Minutos.label("minuto_fin"),
+            AgendaRegular.Duracion.label("duracion"),
+            null().label("es_disponible"),
+            null().label("motivo"),
+        ).where(
+            AgendaRegular.Medico_Matricula == medico_matricula,
+            AgendaRegular.Dia_de_semana == fecha_turno.isoweekday(),
+        )
 
-            if turno_datetime < exist_fin and turno_fin > exist_inicio:
-                return f"El horario solicitado esta ocupado con otro turno que comenzó a las {turno_existente.Hora} y finaliza a las {exist_fin.strftime('%H:%M')}."
+        hechos = {"turnos": [], "excepciones": [], "regulares": []}
+        destino = {"T": "turnos", "E": "excepciones", "R": "regulares"}
+        for fila in self.db.execute(union_all(turnos, excepciones, regulares)):
+            hechos[destino[fila.tipo]].append(fila)
 
-        # 2. CHEQUEO DE BLOQUEO Excepcional:
-        bloqueo = (
-            self.db.query(AgendaExcepcional)
-            .filter(
-                AgendaExcepcional.Medico_Matricula == medico_matricula,
-                AgendaExcepcional.Es_Disponible
-                == 0,  # Marcado como NO disponible (Bloqueo)
-                AgendaExcepcional.Fecha_inicio <= fecha_turno.strftime("%Y-%m-%d"),
-                AgendaExcepcional.Fecha_Fin >= fecha_turno.strftime("%Y-%m-%d"),
-                # Lógica de solapamiento de horas
-                AgendaExcepcional.Hora_inicio <= hora_inicio_str,
-                AgendaExcepcional.Hora_Fin >= hora_fin_str,
-            )
-            .first()
+        hechos["ocupacion"] = OcupacionDia.desde_minutos(
+            (t.minuto_inicio, t.duracion, t.hora_inicio) for t in hechos["turnos"]
         )
+        return hechos
 
-        if bloqueo:
-            return f"El médico tiene un bloqueo excepcional activo en el horario solicitado por: {bloqueo.Motivo}"
-
-        # 3. VERIFICAR COBERTURA (¿El médico dijo que sí?)
+    def cargar_hechos_disponibilidad_lote(
+        self, dias: set
+    ) -> Dict[tuple, dict]:
+        """
+        Versión en lote de cargar_hechos_disponibilidad para varios médico-días
+        {(matricula, date)}: tres consultas en total (turnos, excepciones y
+        regulares de todos los médicos) en lugar de una por día. Devuelve
+        (matricula, "YYYY-MM-DD") -> hechos, con una ocupación propia (copia)
+        que el llamador puede ampliar con OcupacionDia.agregar.
+
+        Es la verificación de las altas en lote: los turnos se leen siempre de la
+        DB (igual que en verificar_disponibilidad), nunca de la caché de ocupación.
+        """
+        if not dias:
+            return {}
+        matriculas = sorted({m for m, _ in dias})
+        numeros = sorted({fecha_a_dia(f) for _, f in dias})
+        generacion = ocupacion_cache.generacion
+
+        hechos: Dict[tuple, dict] = {}
+        for matricula, fecha in dias:
+            hechos[(matricula, fecha.strftime("%Y-%m-%d"))] = {
+                "turnos": [], "excepciones": [], "regulares": []
+            }
 
-        # A. Chequeo de DISPONIBILIDAD excepcional:
-        disponibilidad_excepcional = (
-            self.db.query(AgendaExcepcional)
-            .filter(
-                AgendaExcepcional.Medico_Matricula == medico_matricula,
-                AgendaExcepcional.Es_Disponible == 1,  # Marcado como Disponible
-                AgendaExcepcional.Fecha_inicio <= fecha_turno.strftime("%Y-%m-%d"),
-                AgendaExcepcional.Fecha_Fin >= fecha_turno.strftime("%Y-%m-%d"),
-                AgendaExcepcional.Hora_inicio <= hora_inicio_str,
-                AgendaExcepcional.Hora_Fin >= hora_fin_str,
-            )
-            .first()
+        # 1. Turnos que ocupan lugar (la ocupación leída refresca la caché de los listados)
+        ternas: Dict[tuple, list] = {clave: [] for clave in hechos}
+        filas = self.db.query(
+            Turno.Medico_Matricula, Turno.Fecha, Turno.Hora_Minutos, Turno.Duracion, Turno.Hora
+        ).filter(
+            Turno.Medico_Matricula.in_(matriculas),
+            Turno.Fecha_Dia.in_(numeros),
+            Turno.Estado_Id.in_(estados_que_ocupan()),
         )
+        for matricula, fecha, minutos, duracion, hora in filas:
+            if (matricula, fecha) in ternas:
+                ternas[(matricula, fecha)].append((minutos, duracion, hora))
+        for clave, del_dia in ternas.items():
+            ocupacion = OcupacionDia.desde_minutos(del_dia)
+            ocupacion_cache.guardar(clave, ocupacion, generacion)
+            hechos[clave]["ocupacion"] = ocupacion.copia()
+
+        # 2. Excepciones que tocan el rango (se reparten por día en memoria)
+        excepciones = self.db.execute(
+            select(
+                AgendaExcepcional.Medico_Matricula.label("matricula"),
+                AgendaExcepcional.Fecha_inicio_Dia.label("dia_desde"),
+                AgendaExcepcional.Fecha_Fin_Dia.label("dia_hasta"),
+                AgendaExcepcional.Hora_inicio.label("hora_inicio"),
+                AgendaExcepcional.Hora_Fin.label("hora_fin"),
+                AgendaExcepcional.Inicio_Minutos.label("minuto_inicio"),
+                AgendaExcepcional.Fin_Minutos.label("minuto_fin"),
+                AgendaExcepcional.Es_Disponible.label("es_disponible"),
+                AgendaExcepcional.Motivo.label("motivo"),
+            ).where(
+                AgendaExcepcional.Medico_Matricula.in_(matriculas),
+                AgendaExcepcional.Fecha_inicio_Dia <= numeros[-1],
+                AgendaExcepcional.Fecha_Fin_Dia >= numeros[0],
+            )
+        ).all()
+
+        # 3. Agendas regulares de los días de semana involucrados
+        regulares = self.db.execute(
+            select(
+                AgendaRegular.Medico_Matricula.label("matricula"),
+                AgendaRegular.Dia_de_semana.label("dia_de_semana"),
+                AgendaRegular.Hora_inicio.label("hora_inicio"),
+                AgendaRegular.Hora_fin.label("hora_fin"),
+                AgendaRegular.Inicio_Minutos.label("minuto_inicio"),
+                AgendaRegular.Fin_Minutos.label("minuto_fin"),
+                AgendaRegular.Duracion.label("duracion"),
+            ).where(
+                AgendaRegular.Medico_Matricula.in_(matriculas),
+                AgendaRegular.Dia_de_semana.in_({f.isoweekday() for _, f in dias}),
+            )
+        ).all()
+
+        for matricula, fecha in dias:
+            del_dia = hechos[(matricula, fecha.strftime("%Y-%m-%d"))]
+            numero = fecha_a_dia(fecha)
+            del_dia["excepciones"] = [
+                e for e in excepciones
+                if e.matricula == matricula and e.dia_desde <= numero <= e.dia_hasta
+            ]
+            del_dia["regulares"] = [
+                r for r in regulares
+                if r.matricula == matricula and r.dia_de_semana == fecha.isoweekday()
+            ]
+        return hechos
+
+    @staticmethod
+    def decidir_disponibilidad(
+        hechos: dict, fecha_turno: date, hora_turno: time, duracion: int
+    ) -> str | None:
+        """
+        Decide en memoria (sin tocar la DB) a partir de los hechos cargados.
+        Retorna un mensaje de error (str) o None (disponible).
+        """
+        turno_inicio = hora_turno.hour * 60 + hora_turno.minute
+        turno_fin = turno_inicio + duracion
+        hora_inicio_str = minutos_a_hora(turno_inicio)
+
+        # 1. CHEQUEO DE CONFLICTO con Turnos Existentes (AND sobre el bitset del día)
+        conflicto = hechos["ocupacion"].conflicto(turno_inicio, turno_fin)
+        if conflicto:
+            _, exist_fin, exist_hora = conflicto
+            return f"El horario solicitado esta ocupado con otro turno que comenzó a las {exist_hora} y finaliza a las {minutos_a_hora(exist_fin % MINUTOS_POR_DIA)}."
+
+        def cubre(fila) -> bool:
+            # Comparación entera (el texto fallaba con horas como "9:00")
+            return (
+                fila.minuto_inicio is not None
+                and fila.minuto_fin is not None
+                and fila.minuto_inicio <= turno_inicio
+                and fila.minuto_fin >= turno_fin
+            )
 
-        if disponibilidad_excepcional:
-            return None  # ¡OK! Cobertura excepcional encontrada.
-
-        # B. Chequeo de Agendas Regulares (Solo si no hay excepción activa)
-        dia_semana = fecha_turno.isoweekday()
+        # 2. CHEQUEO DE BLOQUEO Excepcional
+        for excepcion in hechos["excepciones"]:
+            if excepcion.es_disponible == 0 and cubre(excepcion):
+                return f"El médico tiene un bloqueo excepcional activo en el horario solicitado por: {excepcion.motivo}"
 
-        cobertura_regular = (
-            self.db.query(AgendaRegular)
-            .filter(
-                AgendaRegular.Medico_Matricula == medico_matricula,
-                AgendaRegular.Dia_de_semana == dia_semana,
-                AgendaRegular.Hora_inicio <= hora_inicio_str,
-                AgendaRegular.Hora_fin >= hora_fin_str,
-            )
-            .first()
-        )
+        # 3. VERIFICAR COBERTURA (¿El médico dijo que sí?)
+        # A. Disponibilidad excepcional
+        if any(e.es_disponible == 1 and cubre(e) for e in hechos["excepciones"]):
+            return None  # ¡OK! Cobertura excepcional encontrada.
 
-        if cobertura_regular:
+        # B. Agendas Regulares
+        if any(cubre(r) for r in hechos["regulares"]):
             return None  # ¡OK! Cobertura regular encontrada.
 
         # 4. DECISIÓN FINAL: Si no encontró NINGUNA cobertura, es un error.
-        dia_semana = fecha_turno.isoweekday()
-
-        agenda_solo_por_dia = (
-            self.db.query(AgendaRegular)
-            .filter(
-                AgendaRegular.Medico_Matricula == medico_matricula,
-                AgendaRegular.Dia_de_semana == dia_semana,
-            )
-            .first()
-        )
-
-        if not agenda_solo_por_dia:
+        if not hechos["regulares"]:
+            dia_semana = fecha_turno.isoweekday()
             dias = {
                 1: "Lunes",
                 2: "Martes",
@@ -216,9 +368,96 @@ class AgendaRepository:
 
             return f"El médico no tiene agenda configurada para el día {nombre_dia} ({fecha_turno.strftime('%Y-%m-%d')})."
         else:
-            franja_inicio = agenda_solo_por_dia.Hora_inicio
-            franja_fin = agenda_solo_por_dia.Hora_fin
-            return f"El horario solicitado ({hora_inicio_str}) está fuera de la franja laboral definida para ese día. Franja: {franja_inicio} a {franja_fin}."
+            franja = hechos["regulares"][0]
+            return f"El horario solicitado ({hora_inicio_str}) está fuera de la franja laboral definida para ese día. Franja: {franja.hora_inicio} a {franja.hora_fin}."
+
+    def verificar_disponibilidad(
+        self,
+        medico_matricula: str,
+        fecha_turno: date,
+        hora_turno: time,
+        duracion: int,
+        excluir: Optional[tuple] = None,
+    ) -> str | None:
+        """
+        Verifica la disponibilidad y conflictos. Retorna un mensaje de error (str) o None (disponible).
+        Una única ida a la DB; la decisión se toma en memoria.
+
+        Es la barrera de las reservas: los turnos se leen SIEMPRE de la DB. La caché
+        de ocupación solo se invalida con los cambios de este proceso (no ve los de
+        otros workers ni del scheduler), así que no se usa para decidir; solo se
+        refresca con lo leído para los listados de disponibilidad.
+
+        `excluir` (PK) no cuenta ese turno como ocupación: al reprogramar un turno
+        no choca consigo mismo.
+        """
+        generacion = ocupacion_cache.generacion
+        hechos = self.cargar_hechos_disponibilidad(medico_matricula, fecha_turno, excluir)
+        if excluir is None:
+            ocupacion_cache.guardar(
+                (medico_matricula, fecha_turno.strftime("%Y-%m-%d")), hechos["ocupacion"], generacion
+            )
+        return self.decidir_disponibilidad(hechos, fecha_turno, hora_turno, duracion)
+
+    def get_agenda_compilada(self, medico_matricula: str) -> AgendaCompilada:
+        """
+        Agenda regular + excepcional del médico compilada a enteros. Se sirve desde
+        la caché en memoria; solo ante un miss se leen las tablas de agendas.
+        """
+        agenda = agenda_cache.obtener(medico_matricula)
+        if agenda is not None:
+            return agenda
+
+        version = agenda_cache.version(medico_matricula)
+        agenda = AgendaCompilada(
+            self.get_agendas_regulares_by_medico(medico_matricula),
+            self.get_agendas_excepcionales_by_medico(medico_matricula),
+        )
+        agenda_cache.guardar(medico_matricula, agenda, version)
+        return agenda
+
+    def get_ocupacion_by_rango(
+        self, medico_matricula: str, fecha_inicio: date, fecha_fin: date
+    ) -> Dict[str, OcupacionDia]:
+        """
+        Ocupación (bitsets) de cada día del rango. Los días que no están en la caché
+        se reconstruyen desde la DB con una sola consulta por rango.
+        """
+        generacion = ocupacion_cache.generacion
+        resultado: Dict[str, OcupacionDia] = {}
+        faltantes = []
+
+        dia = fecha_inicio
+        while dia <= fecha_fin:
+            fecha_str = dia.strftime("%Y-%m-%d")
+            ocupacion = ocupacion_cache.obtener((medico_matricula, fecha_str))
+            if ocupacion is None:
+                faltantes.append(fecha_str)
+            else:
+                resultado[fecha_str] = ocupacion
+            dia += timedelta(days=1)
+
+        if faltantes:
+            por_fecha: Dict[str, list] = {fecha: [] for fecha in faltantes}
+            # Solo columnas enteras (índice cubriente): ni objetos ORM ni parseo de horas
+            filas = self.db.query(
+                Turno.Fecha, Turno.Hora_Minutos, Turno.Duracion, Turno.Hora
+            ).filter(
+                Turno.Medico_Matricula == medico_matricula,
+                Turno.Fecha_Dia >= fecha_a_dia(_a_fecha(faltantes[0])),
+                Turno.Fecha_Dia <= fecha_a_dia(_a_fecha(faltantes[-1])),
+                Turno.Estado_Id.in_(estados_que_ocupan()),
+            )
+            for fecha, minutos, duracion, hora in filas:
+                if fecha in por_fecha:
+                    por_fecha[fecha].append((minutos, duracion, hora))
+
+            for fecha, ternas in por_fecha.items():
+                ocupacion = OcupacionDia.desde_minutos(ternas)
+                ocupacion_cache.guardar((medico_matricula, fecha), ocupacion, generacion)
+                resultado[fecha] = ocupacion
+
+        return resultado
 
     def get_agendas_excepcionales_by_rango(
         self, medico_matricula: str, fecha_inicio: date, fecha_fin: date
@@ -227,8 +466,8 @@ class AgendaRepository:
             self.db.query(AgendaExcepcional)
             .filter(
                 AgendaExcepcional.Medico_Matricula == medico_matricula,
-                AgendaExcepcional.Fecha_inicio <= fecha_fin.strftime("%Y-%m-%d"),
-                AgendaExcepcional.Fecha_Fin >= fecha_inicio.strftime("%Y-%m-%d"),
+                AgendaExcepcional.Fecha_inicio_Dia <= fecha_a_dia(fecha_fin),
+                AgendaExcepcional.Fecha_Fin_Dia >= fecha_a_dia(fecha_inicio),
             )
             .all()
         )
@@ -240,17 +479,41 @@ class AgendaRepository:
             self.db.query(Turno)
             .filter(
                 Turno.Medico_Matricula == medico_matricula,
-                Turno.Fecha >= fecha_inicio.strftime("%Y-%m-%d"),
-                Turno.Fecha <= fecha_fin.strftime("%Y-%m-%d"),
-                Turno.Estado_Id.in_(
-                    [1, 2, 7]
-                ),  # Pendiente, Confirmado, Anunciado (Ocupan lugar)
+                Turno.Fecha_Dia >= fecha_a_dia(fecha_inicio),
+                Turno.Fecha_Dia <= fecha_a_dia(fecha_fin),
+                Turno.Estado_Id.in_(estados_que_ocupan()),
+            )
+            .all()
+        )
+
+    def get_turnos_by_rango_medicos(
+        self, matriculas: List[str], fecha_inicio: date, fecha_fin: date
+    ) -> Dict[str, List[tuple]]:
+        """
+        Turnos que ocupan lugar de varios médicos en una sola consulta:
+        matrícula -> [(Fecha, Hora, Duracion)].
+        """
+        filas = (
+            self.db.query(
+                Turno.Medico_Matricula, Turno.Fecha, Turno.Hora, Turno.Duracion
+            )
+            .filter(
+                Turno.Medico_Matricula.in_(matriculas),
+                Turno.Fecha_Dia >= fecha_a_dia(fecha_inicio),
+                Turno.Fecha_Dia <= fecha_a_dia(fecha_fin),
+                Turno.Estado_Id.in_(estados_que_ocupan()),
             )
             .all()
         )
+        por_medico: Dict[str, List[tuple]] = {}
+        for matricula, fecha, hora, duracion in filas:
+            por_medico.setdefault(matricula, []).append((fecha, hora, duracion))
+        return por_medico
 
     def delete_agenda_excepcional(self, agenda: AgendaExcepcional) -> None:
         self.db.delete(agenda)
+        self.db.flush()
+        self._sincronizar_slots_excepcional(agenda)
         self.db.commit()
 
     def get_agenda_excepcional_by_pk(
@@ -270,3 +533,7 @@ class AgendaRepository:
             )
             .first()
         )
+
+
+def _a_fecha(valor: str) -> date:
+    return datetime.strptime(valor, "%Y-%m-%d").date()
@@ -6,18 +6,36 @@ from app.backend.schemas.agenda_excepcional import AgendaExcepcionalCreate
 from app.backend.schemas.agenda_regular import AgendaRegularCreate
 from app.backend.models.models import AgendaRegular, AgendaExcepcional
 from app.backend.services.exceptions import RecursoNoEncontradoError, ValueError
+from app.backend.services.disponibilidad_engine import MotorDisponibilidad
+from app.backend.services.disponibilidad_lote import calcular_disponibilidad_lote
+from app.backend.services.slot_repository import SlotRepository
+from app.backend.services.eventos import publicar_cambios_agenda
+from app.backend.services.disponibilidad_cache import disponibilidad_cache
+from app.backend.services.reservas_temporales import reservas_temporales
 from datetime import datetime, date, timedelta, time
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
+import heapq
+from itertools import groupby, islice
 from sqlalchemy.orm import (
     Session,
 )  # Aunque el Service es independiente, la inyección del repo lo requiere
 
 
+BLOQUE_STREAMING_DIAS = 14  # Días que se cargan juntos al generar en streaming
+DIAS_MAXIMOS_CACHE = 31  # Rangos más largos se calculan sin pasar por la caché
+
+
 class AgendaService:
-    def __init__(self, agenda_repo: AgendaRepository, medico_repo: MedicoRepository):
+    def __init__(
+        self,
+        agenda_repo: AgendaRepository,
+        medico_repo: MedicoRepository,
+        slot_repo: Optional[SlotRepository] = None,
+    ):
         # DEPENDENCIAS
         self.agenda_repo = agenda_repo
         self.medico_repo = medico_repo
+        self.slot_repo = slot_repo  # Calendario materializado (opcional)
 
     def registrar_agenda_excepcional(
         self, medico_matricula: str, data: AgendaExcepcionalCreate
@@ -48,7 +66,9 @@ class AgendaService:
             raise ValueError(f"Error en datos de agenda excepcional: {str(e)}")
 
         # Persistencia (Llama al Repository)
-        return self.agenda_repo.create_agenda_excepcional(medico_matricula, data)
+        agenda = self.agenda_repo.create_agenda_excepcional(medico_matricula, data)
+        publicar_cambios_agenda(medico_matricula)
+        return agenda
 
     def registrar_agenda_regular(
         self, medico_matricula: str, data: AgendaRegularCreate
@@ -71,7 +91,9 @@ class AgendaService:
 
         # 3. Persistencia (Llama al Repository)
         # Se asume que el Repository maneja la unicidad de las claves compuestas (Matricula, Especialidad, Dia_de_semana, Hora_inicio)
-        return self.agenda_repo.create_agenda_regular(medico_matricula, data)
+        agenda = self.agenda_repo.create_agenda_regular(medico_matricula, data)
+        publicar_cambios_agenda(medico_matricula)
+        return agenda
 
     def obtener_agendas_excepcionales(
         self, medico_matricula: str ) -> List[AgendaExcepcional]:
@@ -111,6 +133,7 @@ class AgendaService:
 
         # 2. Llamar al Repository para eliminarla
         self.agenda_repo.delete_agenda_regular(agenda_a_eliminar)
+        publicar_cambios_agenda(medico_matricula)
 
     def eliminar_agenda_excepcional(
         self, medico_matricula: str, especialidad_id: int, fecha_inicio: str, hora_inicio: str
@@ -125,6 +148,7 @@ class AgendaService:
 
         # 2. Llamar al Repository para eliminarla
         self.agenda_repo.delete_agenda_excepcional(agenda)
+        publicar_cambios_agenda(medico_matricula)
 
     def consultar_agenda_disponible(
         self, medico_matricula: str, fecha: date
@@ -134,134 +158,288 @@ class AgendaService:
     def obtener_turnos_disponibles(
         self, medico_matricula: str, fecha_inicio: date, fecha_fin: date
     ) -> List[dict]:
-        # 1. Obtener datos
-        agendas_regulares = self.agenda_repo.get_agendas_regulares_by_medico(
-            medico_matricula
+        """
+        Slots libres del rango. Cada médico-día se sirve desde disponibilidad_cache
+        y solo se calculan los días que faltan (o vencieron / fueron invalidados).
+        Los horarios retenidos temporalmente se quitan al final (no se cachean).
+        """
+        dias = (fecha_fin - fecha_inicio).days + 1
+        if dias <= 0 or dias > DIAS_MAXIMOS_CACHE:
+            # Rangos largos (exportaciones) no desplazan a los días más consultados
+            return reservas_temporales.filtrar(
+                medico_matricula,
+                self._calcular_turnos_disponibles(medico_matricula, fecha_inicio, fecha_fin),
+            )
+
+        generacion = disponibilidad_cache.generacion
+        fechas = [
+            (fecha_inicio + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(dias)
+        ]
+        por_fecha = {}
+        faltantes = []
+        for fecha in fechas:
+            slots = disponibilidad_cache.obtener((medico_matricula, fecha))
+            if slots is None:
+                faltantes.append(fecha)
+            else:
+                por_fecha[fecha] = slots
+
+        if faltantes:
+            calculados = {fecha: [] for fecha in faltantes}
+            for slot in self._calcular_turnos_disponibles(
+                medico_matricula,
+                datetime.strptime(faltantes[0], "%Y-%m-%d").date(),
+                datetime.strptime(faltantes[-1], "%Y-%m-%d").date(),
+            ):
+                if slot["fecha"] in calculados:
+                    calculados[slot["fecha"]].append(slot)
+            for fecha, slots in calculados.items():
+                disponibilidad_cache.guardar((medico_matricula, fecha), slots, generacion)
+                por_fecha[fecha] = slots
+
+        return reservas_temporales.filtrar(
+            medico_matricula, [slot for fecha in fechas for slot in por_fecha[fecha]]
         )
-        agendas_excepcionales = self.agenda_repo.get_agendas_excepcionales_by_rango(
+
+    def _calcular_turnos_disponibles(
+        self, medico_matricula: str, fecha_inicio: date, fecha_fin: date
+    ) -> List[dict]:
+        # 0. Si el rango está materializado, basta con un range scan sobre Slots
+        if self.slot_repo and self.slot_repo.cubre(
             medico_matricula, fecha_inicio, fecha_fin
-        )
-        turnos = self.agenda_repo.get_turnos_by_rango(
+        ):
+            return self.slot_repo.get_libres(medico_matricula, fecha_inicio, fecha_fin)
+
+        # 1. Obtener datos (agenda compilada y ocupación salen de cachés en memoria)
+        agenda = self.agenda_repo.get_agenda_compilada(medico_matricula)
+        ocupacion = self.agenda_repo.get_ocupacion_by_rango(
             medico_matricula, fecha_inicio, fecha_fin
         )
 
-        available_slots = []
+        # 2. Calcular slots libres (intervalos en minutos + bitsets de ocupación)
+        motor = MotorDisponibilidad(
+            medico_matricula, agenda=agenda, ocupacion=ocupacion
+        )
+        return motor.calcular(fecha_inicio, fecha_fin)
 
-        # Mapa de duraciones por especialidad (para agendas excepcionales)
-        duraciones_por_especialidad = {}
-        for ag in agendas_regulares:
-            duraciones_por_especialidad[ag.Especialidad_Id] = ag.Duracion
+    def obtener_turnos_disponibles_lote(
+        self,
+        fecha_inicio: date,
+        fecha_fin: date,
+        matriculas: Optional[List[str]] = None,
+    ) -> Dict[str, List[dict]]:
+        """
+        Disponibilidad de muchos médicos a la vez (por defecto, todos) calculada en
+        lote con NumPy: matrícula -> mismas filas que obtener_turnos_disponibles.
+        """
+        if fecha_inicio > fecha_fin:
+            raise ValueError("La fecha de inicio debe ser anterior o igual a la fecha de fin.")
+        if matriculas is None:
+            matriculas = [medico.Matricula for medico in self.medico_repo.get_all()]
+
+        agendas = {m: self.agenda_repo.get_agenda_compilada(m) for m in matriculas}
+        turnos = self.agenda_repo.get_turnos_by_rango_medicos(
+            matriculas, fecha_inicio, fecha_fin
+        )
+        return {
+            matricula: reservas_temporales.filtrar(matricula, slots)
+            for matricula, slots in calcular_disponibilidad_lote(
+                agendas, turnos, fecha_inicio, fecha_fin
+            ).items()
+        }
 
-        current_date = fecha_inicio
-        while current_date <= fecha_fin:
-            day_of_week = current_date.isoweekday()
+    # ----------------------------------------------------
+    # Disponibilidad en streaming (rangos largos)
+    # ----------------------------------------------------
+    def _dias_disponibles(
+        self, medico_matricula: str, fecha_inicio: date, fecha_fin: date
+    ) -> Iterator[List[dict]]:
+        """
+        Genera exactamente una lista de slots libres por día del rango. La ocupación
+        se carga por bloques de BLOQUE_STREAMING_DIAS, así la memoria no depende
+        del largo del rango.
+        """
+        agenda = None
+        desde = fecha_inicio
+        while desde <= fecha_fin:
+            hasta = min(desde + timedelta(days=BLOQUE_STREAMING_DIAS - 1), fecha_fin)
+
+            if self.slot_repo and self.slot_repo.cubre(medico_matricula, desde, hasta):
+                libres = self.slot_repo.get_libres(medico_matricula, desde, hasta)
+                por_fecha = {
+                    fecha: list(slots)
+                    for fecha, slots in groupby(libres, key=lambda s: s["fecha"])
+                }
+                dia = desde
+                while dia <= hasta:
+                    yield reservas_temporales.filtrar(
+                        medico_matricula, por_fecha.get(dia.strftime("%Y-%m-%d"), [])
+                    )
+                    dia += timedelta(days=1)
+            else:
+                if agenda is None:
+                    agenda = self.agenda_repo.get_agenda_compilada(medico_matricula)
+                motor = MotorDisponibilidad(
+                    medico_matricula,
+                    agenda=agenda,
+                    ocupacion=self.agenda_repo.get_ocupacion_by_rango(
+                        medico_matricula, desde, hasta
+                    ),
+                )
+                for slots in motor.iterar_dias(desde, hasta):
+                    yield reservas_temporales.filtrar(medico_matricula, slots)
 
-            # Candidatos del día
-            daily_slots = []
+            desde = hasta + timedelta(days=1)
 
-            # A. Agendas Regulares
-            for ag in agendas_regulares:
-                if ag.Dia_de_semana == day_of_week:
-                    start_dt = datetime.combine(
-                        current_date, datetime.strptime(ag.Hora_inicio, "%H:%M").time()
-                    )
-                    end_dt = datetime.combine(
-                        current_date, datetime.strptime(ag.Hora_fin, "%H:%M").time()
-                    )
+    def iterar_turnos_disponibles(
+        self, medico_matricula: str, fecha_inicio: date, fecha_fin: date
+    ) -> Iterator[List[dict]]:
+        """
+        Variante perezosa de obtener_turnos_disponibles: devuelve un generador con
+        los slots libres de a un día. Las validaciones se hacen antes de generar.
+        """
+        if fecha_inicio > fecha_fin:
+            raise ValueError("La fecha de inicio debe ser anterior o igual a la fecha de fin.")
+        if not self.medico_repo.get_by_matricula(medico_matricula):
+            raise RecursoNoEncontradoError(
+                f"Médico con matrícula {medico_matricula} no encontrado."
+            )
 
-                    curr_dt = start_dt
-                    while curr_dt + timedelta(minutes=ag.Duracion) <= end_dt:
-                        daily_slots.append(
-                            {
-                                "fecha": current_date.strftime("%Y-%m-%d"),
-                                "hora": curr_dt.strftime("%H:%M"),
-                                "medico_matricula": medico_matricula,
-                                "especialidad_id": ag.Especialidad_Id,
-                                "duracion": ag.Duracion,
-                                "sucursal_id": ag.Sucursal_Id,
-                            }
-                        )
-                        curr_dt += timedelta(minutes=ag.Duracion)
-
-            # B. Agendas Excepcionales (Disponibles)
-            for ag in agendas_excepcionales:
-                ag_inicio = datetime.strptime(ag.Fecha_inicio, "%Y-%m-%d").date()
-                ag_fin = datetime.strptime(ag.Fecha_Fin, "%Y-%m-%d").date()
-
-                if ag_inicio <= current_date <= ag_fin and ag.Es_Disponible == 1:
-                    duracion = duraciones_por_especialidad.get(
-                        ag.Especialidad_Id, 20
-                    )  # Default 20 min
-
-                    start_dt = datetime.combine(
-                        current_date, datetime.strptime(ag.Hora_inicio, "%H:%M").time()
-                    )
-                    end_dt = datetime.combine(
-                        current_date, datetime.strptime(ag.Hora_Fin, "%H:%M").time()
-                    )
+        return self._dias_disponibles(medico_matricula, fecha_inicio, fecha_fin)
+
+    def iterar_disponibles_sucursal(
+        self, sucursal_id: int, fecha_inicio: date, fecha_fin: date
+    ) -> Iterator[List[dict]]:
+        """
+        Slots libres de todos los médicos que atienden en la sucursal, de a un día
+        (ordenados por hora y matrícula). Solo se mantiene en memoria un bloque
+        de días por médico.
+        """
+        if fecha_inicio > fecha_fin:
+            raise ValueError("La fecha de inicio debe ser anterior o igual a la fecha de fin.")
+
+        matriculas = self.agenda_repo.get_matriculas_by_sucursal(sucursal_id)
+
+        def generar() -> Iterator[List[dict]]:
+            flujos = [
+                self._dias_disponibles(matricula, fecha_inicio, fecha_fin)
+                for matricula in matriculas
+            ]
+            # Cada flujo produce una lista por día → zip alinea los días
+            for dias in zip(*flujos):
+                del_dia = [
+                    slot
+                    for slots in dias
+                    for slot in slots
+                    if slot["sucursal_id"] == sucursal_id
+                ]
+                del_dia.sort(key=lambda s: (s["hora"], s["medico_matricula"]))
+                yield del_dia
+
+        return generar()
 
-                    curr_dt = start_dt
-                    while curr_dt + timedelta(minutes=duracion) <= end_dt:
-                        slot = {
-                            "fecha": current_date.strftime("%Y-%m-%d"),
-                            "hora": curr_dt.strftime("%H:%M"),
-                            "medico_matricula": medico_matricula,
-                            "especialidad_id": ag.Especialidad_Id,
-                            "duracion": duracion,
-                            "sucursal_id": ag.Consultorio_Sucursal_Id,
-                        }
-                        # Evitar duplicados exactos
-                        if slot not in daily_slots:
-                            daily_slots.append(slot)
-                        curr_dt += timedelta(minutes=duracion)
-
-            # C. Filtrar Bloqueos y Turnos
-            final_slots = []
-            for slot in daily_slots:
-                slot_start = datetime.combine(
-                    current_date, datetime.strptime(slot["hora"], "%H:%M").time()
+    # ----------------------------------------------------
+    # Búsqueda del primer turno libre entre todos los médicos
+    # ----------------------------------------------------
+    def _iterar_disponibles(
+        self,
+        medico_matricula: str,
+        fecha_inicio: date,
+        fecha_fin: date,
+        especialidad_id: int,
+        sucursal_id: Optional[int],
+        limite: int,
+    ) -> Iterator[dict]:
+        """
+        Flujo perezoso y ordenado por (fecha, hora) de los slots libres de un médico
+        para una especialidad (y sucursal opcional).
+        """
+        if self.slot_repo and self.slot_repo.cubre(
+            medico_matricula, fecha_inicio, fecha_fin
+        ):
+            # Ningún médico aporta más de `limite` slots al resultado final. Las
+            # retenciones se filtran después del LIMIT: se piden de más (una por
+            # retención del médico) y, si igual no alcanza, se duplica el pedido.
+            pedido = limite + reservas_temporales.contar(medico_matricula)
+            while True:
+                filas = self.slot_repo.get_libres(
+                    medico_matricula,
+                    fecha_inicio,
+                    fecha_fin,
+                    especialidad_id=especialidad_id,
+                    sucursal_id=sucursal_id,
+                    limite=pedido,
+                    por_hora=True,
+                )
+                libres = reservas_temporales.filtrar(medico_matricula, filas)
+                if len(libres) >= limite or len(filas) < pedido:
+                    break
+                pedido *= 2
+            yield from libres[:limite]
+            return
+
+        motor = MotorDisponibilidad(
+            medico_matricula,
+            agenda=self.agenda_repo.get_agenda_compilada(medico_matricula),
+            ocupacion=self.agenda_repo.get_ocupacion_by_rango(
+                medico_matricula, fecha_inicio, fecha_fin
+            ),
+        )
+        # Los días se generan recién cuando el merge los necesita
+        for slots in motor.iterar_dias(fecha_inicio, fecha_fin):
+            del_dia = [
+                slot
+                for slot in reservas_temporales.filtrar(medico_matricula, slots)
+                if slot["especialidad_id"] == especialidad_id
+                and (sucursal_id is None or slot["sucursal_id"] == sucursal_id)
+            ]
+            del_dia.sort(key=lambda slot: slot["hora"])
+            yield from del_dia
+
+    def buscar_primeros_disponibles(
+        self,
+        especialidad: str,
+        fecha_inicio: date,
+        fecha_fin: date,
+        sucursal_id: Optional[int] = None,
+        cantidad: int = 10,
+    ) -> List[dict]:
+        """
+        Devuelve los primeros `cantidad` slots libres de la especialidad entre todos
+        los médicos que la atienden, mediante un merge k-way (heap) de los flujos
+        ordenados de cada médico.
+        """
+        if fecha_inicio > fecha_fin:
+            raise ValueError("La fecha de inicio debe ser anterior o igual a la fecha de fin.")
+        if cantidad <= 0:
+            raise ValueError("La cantidad de turnos solicitados debe ser positiva.")
+
+        medicos = self.medico_repo.get_filtered(especialidad=especialidad)
+
+        flujos = []
+        for medico in medicos:
+            especialidad_id = next(
+                (
+                    e.Id_especialidad
+                    for e in medico.especialidades
+                    if e.descripcion == especialidad
+                ),
+                None,
+            )
+            if especialidad_id is None:
+                continue
+            flujos.append(
+                self._iterar_disponibles(
+                    medico.Matricula,
+                    fecha_inicio,
+                    fecha_fin,
+                    especialidad_id,
+                    sucursal_id,
+                    cantidad,
                 )
-                slot_end = slot_start + timedelta(minutes=slot["duracion"])
-
-                is_blocked = False
-
-                # 1. Chequear Bloqueos Excepcionales
-                for ag in agendas_excepcionales:
-                    ag_inicio = datetime.strptime(ag.Fecha_inicio, "%Y-%m-%d").date()
-                    ag_fin = datetime.strptime(ag.Fecha_Fin, "%Y-%m-%d").date()
-
-                    if ag_inicio <= current_date <= ag_fin and ag.Es_Disponible == 0:
-                        block_start = datetime.combine(
-                            current_date,
-                            datetime.strptime(ag.Hora_inicio, "%H:%M").time(),
-                        )
-                        block_end = datetime.combine(
-                            current_date, datetime.strptime(ag.Hora_Fin, "%H:%M").time()
-                        )
-
-                        if slot_start < block_end and block_start < slot_end:
-                            is_blocked = True
-                            break
-
-                if is_blocked:
-                    continue
-
-                # 2. Chequear Turnos
-                for turno in turnos:
-                    if turno.Fecha == slot["fecha"]:
-                        turno_start = datetime.combine(
-                            current_date, datetime.strptime(turno.Hora, "%H:%M").time()
-                        )
-                        turno_end = turno_start + timedelta(minutes=turno.Duracion)
-
-                        if slot_start < turno_end and turno_start < slot_end:
-                            is_blocked = True
-                            break
-
-                if not is_blocked:
-                    final_slots.append(slot)
-
-            available_slots.extend(final_slots)
-            current_date += timedelta(days=1)
-
-        return available_slots
+            )
+
+        primeros = heapq.merge(
+            *flujos, key=lambda slot: (slot["fecha"], slot["hora"])
+        )
+        return list(islice(primeros, cantidad))
@@ -0,0 +1,66 @@
+"""
+Archivo de turnos cerrados (partición fría, ver scheduler_main.py).
+
+Los turnos Finalizado/Cancelado/Ausente más viejos que la retención ya no se
+reservan ni se modifican, pero siguen en Turnos y agrandan cada escaneo de
+TurnoRepository y AgendaRepository. Este job los mueve por lotes a
+Turnos_Archivo (mismas columnas). Para la API no desaparecen: los listados de
+TurnoRepository (por médico, por paciente, /turnos/buscar), la búsqueda del
+turno de una receta y los reportes (_turnos_periodo) leen también el archivo.
+"""
+
+import time
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from app.backend.services.catalogos import estado_ids
+from app.backend.services.turno_repository import TurnoRepository
+from app.backend.services.exceptions import ValueError
+
+ESTADOS_ARCHIVABLES = ("Finalizado", "Cancelado", "Ausente")
+RETENCION_ARCHIVO_DIAS = 180
+TAMANO_LOTE_ARCHIVO = 1000
+
+
+class ArchivoTurnosService:
+    def __init__(
+        self,
+        turno_repo: TurnoRepository,
+        estados: Iterable[str] = ESTADOS_ARCHIVABLES,
+        retencion_dias: int = RETENCION_ARCHIVO_DIAS,
+        tamano_lote: int = TAMANO_LOTE_ARCHIVO,
+    ):
+        if retencion_dias < 0:
+            raise ValueError("La retención del archivo no puede ser negativa.")
+        self.turno_repo = turno_repo
+        self.estados = tuple(estados)
+        self.retencion_dias = retencion_dias
+        self.tamano_lote = tamano_lote
+
+    def ejecutar(self, hoy: Optional[date] = None) -> dict:
+        """
+        Archiva los turnos cerrados con Fecha anterior a `hoy` menos la
+        retención. Cada lote se confirma por separado (igual que el cierre
+        automático), así el job no bloquea la base en una transacción larga.
+
+        Devuelve el informe: {"fecha_limite", "filas", "lotes", "segundos"}.
+        """
+        hoy = hoy or date.today()
+        fecha_limite = (hoy - timedelta(days=self.retencion_dias)).strftime("%Y-%m-%d")
+        origenes = estado_ids(*self.estados)
+
+        inicio = time.perf_counter()
+        filas, lotes = 0, 0
+        while True:
+            archivadas = self.turno_repo.archivar_lote(origenes, fecha_limite, self.tamano_lote)
+            if not archivadas:
+                break
+            filas += archivadas
+            lotes += 1
+
+        return {
+            "fecha_limite": fecha_limite,
+            "filas": filas,
+            "lotes": lotes,
+            "segundos": round(time.perf_counter() - inicio, 3),
+        }
@@ -0,0 +1,125 @@
+"""
+Catálogos de referencia (Estados de turno y Roles) cargados una sola vez.
+
+Las tablas Estados y Roles son datos de referencia que no cambian mientras la
+aplicación corre. init_estados (al iniciar, en el lifespan) las lee y deja acá
+un registro inmutable nombre <-> id; transiciones de estado, reportes,
+disponibilidad y role_required resuelven contra él en memoria, sin consultar
+la DB ni depender de ids fijos en el código.
+
+Si se usa sin el lifespan (scripts, benchmarks), el primer acceso carga los
+catálogos desde la base por defecto.
+"""
+
+from threading import Lock
+from types import MappingProxyType
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+# Estados de un turno que ocupan lugar en la agenda del médico
+ESTADOS_QUE_OCUPAN = ("Pendiente", "Confirmado", "Anunciado")
+
+
+class Catalogo:
+    """Mapa inmutable descripción <-> id de una tabla de referencia."""
+
+    __slots__ = ("nombre", "_por_id", "_por_descripcion")
+
+    def __init__(self, nombre: str, filas: Iterable[Tuple[int, str]]):
+        self.nombre = nombre
+        por_id = dict(filas)
+        self._por_id = MappingProxyType(por_id)
+        self._por_descripcion = MappingProxyType({d: i for i, d in por_id.items()})
+
+    def id(self, descripcion: str) -> int:
+        try:
+            return self._por_descripcion[descripcion]
+        except KeyError:
+            raise RuntimeError(
+                f"{self.nombre} '{descripcion}' no existe en la base de datos. Ejecute init_estados."
+            )
+
+    def ids(self, *descripciones: str) -> List[int]:
+        return [self.id(d) for d in descripciones]
+
+    def descripcion(self, id_: Optional[int]) -> Optional[str]:
+        return self._por_id.get(id_)
+
+    def __contains__(self, descripcion: str) -> bool:
+        return descripcion in self._por_descripcion
+
+    def __len__(self) -> int:
+        return len(self._por_id)
+
+
+class Catalogos:
+    """Conjunto de catálogos cargados juntos (se reemplaza entero, nunca se muta)."""
+
+    __slots__ = ("estados", "roles")
+
+    def __init__(self, estados: Catalogo, roles: Catalogo):
+        self.estados = estados
+        self.roles = roles
+
+
+_actual: Optional[Catalogos] = None
+_lock = Lock()
+
+
+def cargar_catalogos(db: Optional[Session] = None) -> Catalogos:
+    """Lee Estados y Roles y publica un registro nuevo (lo llama init_estados)."""
+    global _actual
+    from app.backend.models.models import Estado, Role
+
+    propia = db is None
+    if propia:
+        from app.backend.db.db import SessionLocal
+
+        db = SessionLocal()
+    try:
+        nuevos = Catalogos(
+            estados=Catalogo("Estado", db.query(Estado.Id, Estado.Descripcion).all()),
+            roles=Catalogo("Rol", db.query(Role.Id, Role.Nombre).all()),
+        )
+    finally:
+        if propia:
+            db.close()
+    with _lock:
+        _actual = nuevos
+    return nuevos
+
+
+def catalogos() -> Catalogos:
+    actual = _actual
+    if actual is None:
+        actual = cargar_catalogos()
+    return actual
+
+
+# ----------------------------------------------------
+# Atajos
+# ----------------------------------------------------
+def estado_id(descripcion: str) -> int:
+    return catalogos().estados.id(descripcion)
+
+
+def estado_ids(*descripciones: str) -> List[int]:
+    return catalogos().estados.ids(*descripciones)
+
+
+def estado_descripcion(id_: Optional[int]) -> Optional[str]:
+    return catalogos().estados.descripcion(id_)
+
+
+def estados_que_ocupan() -> List[int]:
+    """Ids de Pendiente, Confirmado y Anunciado."""
+    return catalogos().estados.ids(*ESTADOS_QUE_OCUPAN)
+
+
+def rol_id(nombre: str) -> int:
+    return catalogos().roles.id(nombre)
+
+
+def rol_nombre(id_: Optional[int]) -> Optional[str]:
+    return catalogos().roles.descripcion(id_)
@@ -0,0 +1,109 @@
+"""
+Cierre automático de turnos vencidos (job de fin de día, ver scheduler_main.py).
+
+Los turnos pasados que nadie cerró (Pendiente/Confirmado/Anunciado, o Atendido
+sin finalizar) siguen contando como ocupación en los escaneos de agenda y
+distorsionan los reportes de asistencia. Cada regla indica qué estados se
+cierran, a qué estado pasan y cuántos días de gracia se dejan antes de hacerlo.
+Se aplican en orden, con UPDATEs por lotes (nunca un bucle ORM por turno).
+
+El cierre es administrativo: no pasa por las acciones de la máquina de estados
+(por ejemplo, Pendiente -> Ausente no es una acción válida para un usuario).
+"""
+
+import time
+from datetime import date, timedelta
+from typing import List, Optional
+
+from app.backend.services.catalogos import catalogos
+from app.backend.services.turno_repository import TurnoRepository
+from app.backend.services.exceptions import ValueError
+
+TAMANO_LOTE_CIERRE = 500
+
+# Reglas por defecto: {"nombre", "estados" (origen), "destino", "dias_gracia"}
+REGLAS_CIERRE = [
+    {
+        "nombre": "Sin atender",
+        "estados": ("Pendiente", "Confirmado", "Anunciado"),
+        "destino": "Ausente",
+        "dias_gracia": 0,
+    },
+    {
+        "nombre": "Atendidos sin finalizar",
+        "estados": ("Atendido",),
+        "destino": "Finalizado",
+        "dias_gracia": 0,
+    },
+]
+
+
+class CierreTurnosService:
+    def __init__(
+        self,
+        turno_repo: TurnoRepository,
+        reglas: Optional[List[dict]] = None,
+        tamano_lote: int = TAMANO_LOTE_CIERRE,
+    ):
+        self.turno_repo = turno_repo
+        self.reglas = REGLAS_CIERRE if reglas is None else reglas
+        self.tamano_lote = tamano_lote
+
+    def ejecutar(self, hoy: Optional[date] = None) -> dict:
+        """
+        Aplica las reglas a los turnos de días anteriores a `hoy` (menos los días
+        de gracia de cada regla). Cada lote se confirma por separado, así un
+        cierre grande no bloquea la base en una sola transacción larga.
+
+        Devuelve el informe: {"reglas": [{"nombre", "destino", "fecha_limite",
+        "filas", "lotes", "dias", "segundos"}], "filas", "segundos"}.
+        """
+        hoy = hoy or date.today()
+        compiladas = [self._compilar(regla, hoy) for regla in self.reglas]
+
+        inicio_total = time.perf_counter()
+        informe = []
+        for regla, (origenes, destino, fecha_limite) in zip(self.reglas, compiladas):
+            inicio = time.perf_counter()
+            filas, lotes, dias = 0, 0, set()
+            while True:
+                actualizadas, dias_lote = self.turno_repo.cerrar_vencidos_lote(
+                    origenes, destino, fecha_limite, self.tamano_lote
+                )
+                if not dias_lote:
+                    break
+                filas += actualizadas
+                lotes += 1
+                dias |= dias_lote
+            informe.append({
+                "nombre": regla["nombre"],
+                "destino": regla["destino"],
+                "fecha_limite": fecha_limite,
+                "filas": filas,
+                "lotes": lotes,
+                "dias": len(dias),
+                "segundos": round(time.perf_counter() - inicio, 3),
+            })
+
+        return {
+            "reglas": informe,
+            "filas": sum(r["filas"] for r in informe),
+            "segundos": round(time.perf_counter() - inicio_total, 3),
+        }
+
+    # ----------------------------------------------------
+    # Helpers
+    # ----------------------------------------------------
+    @staticmethod
+    def _compilar(regla: dict, hoy: date) -> tuple:
+        """Valida la regla y la traduce a (ids de origen, id destino, "YYYY-MM-DD" límite)."""
+        estados = catalogos().estados
+        origenes = estados.ids(*regla["estados"])
+        destino = estados.id(regla["destino"])
+        if destino in origenes:
+            raise ValueError(f"Regla '{regla['nombre']}': el estado destino no puede ser uno de origen.")
+        dias_gracia = regla.get("dias_gracia", 0)
+        if dias_gracia < 0:
+            raise ValueError(f"Regla '{regla['nombre']}': los días de gracia no pueden ser negativos.")
+        fecha_limite = (hoy - timedelta(days=dias_gracia)).strftime("%Y-%m-%d")
+        return origenes, destino, fecha_limite
@@ -0,0 +1,135 @@
+"""
+Caché en memoria del resultado de disponibilidad por médico-día.
+
+Guarda las filas ya calculadas de obtener_turnos_disponibles para cada
+(matricula, fecha), con vencimiento (TTL) y tamaño acotado (LRU). Se invalida
+con precisión a partir de los eventos de eventos.py:
+- cambios de turnos → solo los médico-días afectados;
+- cambios de agenda → todos los días del médico.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.backend.services.eventos import (
+    suscribir_cambios_agenda,
+    suscribir_cambios_turnos,
+)
+
+
+class DisponibilidadCache:
+    """Caché LRU con TTL de slots libres por (matricula, "YYYY-MM-DD")."""
+
+    def __init__(self, max_entradas: int = 5000, ttl_segundos: float = 300):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._entradas: "OrderedDict[tuple, tuple]" = OrderedDict()  # clave -> (vence, slots)
+        self._por_medico: Dict[str, Set[str]] = {}
+        self._lock = Lock()
+        # Igual que OcupacionCache: un resultado calculado antes de una invalidación
+        # concurrente no se guarda.
+        self.generacion = 0
+
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+        self.vencidas = 0
+        self.invalidaciones = 0
+
+    # ----------------------------------------------------
+    # Lectura / escritura
+    # ----------------------------------------------------
+    def obtener(self, clave: tuple) -> Optional[List[dict]]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return None
+            vence, slots = entrada
+            if vence < time.monotonic():
+                self._quitar(clave)
+                self.vencidas += 1
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            return slots
+
+    def guardar(self, clave: tuple, slots: List[dict], generacion: int) -> None:
+        with self._lock:
+            if generacion != self.generacion:
+                return
+            self._entradas[clave] = (time.monotonic() + self.ttl_segundos, slots)
+            self._entradas.move_to_end(clave)
+            self._por_medico.setdefault(clave[0], set()).add(clave[1])
+            while len(self._entradas) > self.max_entradas:
+                vieja, _ = self._entradas.popitem(last=False)
+                self._desindexar(vieja)
+
+    # ----------------------------------------------------
+    # Invalidación
+    # ----------------------------------------------------
+    def invalidar(self, dias: Iterable[tuple]) -> None:
+        with self._lock:
+            self.generacion += 1
+            for clave in dias:
+                if clave in self._entradas:
+                    self._quitar(clave)
+                    self.invalidaciones += 1
+
+    def invalidar_medico(self, medico_matricula: str) -> None:
+        with self._lock:
+            self.generacion += 1
+            for fecha in list(self._por_medico.get(medico_matricula, ())):
+                self._quitar((medico_matricula, fecha))
+                self.invalidaciones += 1
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self.generacion += 1
+            self._entradas.clear()
+            self._por_medico.clear()
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl_segundos,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / consultas, 4) if consultas else 0.0,
+                "vencidas": self.vencidas,
+                "invalidaciones": self.invalidaciones,
+            }
+
+    # ----------------------------------------------------
+    # Helpers (se llaman con el lock tomado)
+    # ----------------------------------------------------
+    def _quitar(self, clave: tuple) -> None:
+        self._entradas.pop(clave, None)
+        self._desindexar(clave)
+
+    def _desindexar(self, clave: tuple) -> None:
+        fechas = self._por_medico.get(clave[0])
+        if fechas is not None:
+            fechas.discard(clave[1])
+            if not fechas:
+                del self._por_medico[clave[0]]
+
+
+# Instancia única del proceso
+disponibilidad_cache = DisponibilidadCache()
+
+
+@suscribir_cambios_turnos
+def _invalidar_dias(dias):
+    disponibilidad_cache.invalidar(dias)
+
+
+@suscribir_cambios_agenda
+def _invalidar_medico(medico_matricula):
+    disponibilidad_cache.invalidar_medico(medico_matricula)
@@ -0,0 +1,367 @@
+"""
+Motor de disponibilidad basado en intervalos de minutos enteros.
+
+Las agendas de un médico se compilan una sola vez a intervalos [inicio, fin)
+expresados en minutos desde la medianoche. La ocupación de cada día (turnos y
+bloqueos) se representa como un bitset de minutos, de modo que decidir si un
+slot está libre es una operación de desplazamiento y máscara (sin volver a
+parsear strings dentro de los bucles).
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DURACION_TURNO_DEFAULT = 30  # Igual que en AgendaRepository.verificar_disponibilidad
+DURACION_EXCEPCIONAL_DEFAULT = 20  # Duración si la especialidad no tiene agenda regular
+
+
+# ----------------------------------------------------
+# Conversión de formatos ("HH:MM" <-> minutos)
+# ----------------------------------------------------
+def hora_a_minutos(hora: str) -> int:
+    """Convierte 'HH:MM' (o 'H:MM') a minutos desde la medianoche."""
+    try:
+        horas, minutos = hora.split(":")
+        horas, minutos = int(horas), int(minutos)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Formato de hora inválido: {hora}")
+    if not (0 <= horas < 24 and 0 <= minutos < 60):
+        raise ValueError(f"Formato de hora inválido: {hora}")
+    return horas * 60 + minutos
+
+
+def minutos_a_hora(minutos: int) -> str:
+    """Convierte minutos desde la medianoche a 'HH:MM'."""
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+EPOCA = date(1970, 1, 1)
+
+
+def fecha_a_dia(fecha: date) -> int:
+    """Convierte una fecha a días desde 1970-01-01 (mismo valor que las columnas *_Dia)."""
+    return (fecha - EPOCA).days
+
+
+def dia_a_fecha(dia: int) -> date:
+    return EPOCA + timedelta(days=dia)
+
+
+def minutos_de(fila, campo_minutos: str, campo_hora: str) -> int:
+    """
+    Minutos desde la medianoche de una fila de la DB: usa la columna entera
+    derivada (ej. Hora_Minutos) si está cargada y solo parsea el texto si no.
+    """
+    minutos = getattr(fila, campo_minutos, None)
+    if minutos is not None:
+        return minutos
+    return hora_a_minutos(getattr(fila, campo_hora))
+
+
+def fecha_de(fila, campo_dia: str, campo_fecha: str) -> date:
+    """Igual que minutos_de, para fechas (columnas *_Dia)."""
+    dia = getattr(fila, campo_dia, None)
+    if dia is not None:
+        return dia_a_fecha(dia)
+    return datetime.strptime(getattr(fila, campo_fecha), "%Y-%m-%d").date()
+
+
+def mascara(inicio: int, fin: int) -> int:
+    """Bitset con los minutos [inicio, fin) encendidos."""
+    if fin <= inicio:
+        return 0
+    return ((1 << (fin - inicio)) - 1) << inicio
+
+
+def esta_libre(bits: int, inicio: int, fin: int) -> bool:
+    """O(1): ningún minuto de [inicio, fin) está encendido en `bits`."""
+    return not (bits >> inicio) & ((1 << (fin - inicio)) - 1)
+
+
+class OcupacionDia:
+    """
+    Ocupación de un médico en un día: bitset de 1440 minutos (un bit por minuto
+    ocupado por un turno activo) más los turnos que lo forman.
+    """
+
+    __slots__ = ("bits", "turnos")
+
+    def __init__(self):
+        self.bits = 0
+        self.turnos: List[Tuple[int, int, str]] = []  # (inicio, fin, "HH:MM" original)
+
+    @classmethod
+    def desde_minutos(
+        cls, turnos: Iterable[Tuple[Optional[int], Optional[int], str]]
+    ) -> "OcupacionDia":
+        """Construye la ocupación a partir de ternas (minutos de inicio, Duracion, Hora)."""
+        ocupacion = cls()
+        for inicio, duracion, hora in turnos:
+            if inicio is None:
+                print(f"ALERTA: Formato de hora inconsistente en DB: {hora}")
+                continue
+            if not duracion or duracion <= 0:
+                duracion = DURACION_TURNO_DEFAULT
+            ocupacion.agregar(inicio, inicio + duracion, hora)
+        return ocupacion
+
+    @classmethod
+    def desde_turnos(cls, turnos: Iterable[Tuple[str, Optional[int]]]) -> "OcupacionDia":
+        """Construye la ocupación a partir de pares (Hora, Duracion)."""
+        ocupacion = cls()
+        for hora, duracion in turnos:
+            try:
+                inicio = hora_a_minutos(hora)
+            except ValueError:
+                print(f"ALERTA: Formato de hora inconsistente en DB: {hora}")
+                continue
+            if not duracion or duracion <= 0:
+                duracion = DURACION_TURNO_DEFAULT
+            ocupacion.agregar(inicio, inicio + duracion, hora)
+        return ocupacion
+
+    def copia(self) -> "OcupacionDia":
+        """Copia independiente (las de la caché se comparten y no deben mutarse)."""
+        ocupacion = OcupacionDia()
+        ocupacion.bits = self.bits
+        ocupacion.turnos = list(self.turnos)
+        return ocupacion
+
+    def agregar(self, inicio: int, fin: int, hora: str) -> None:
+        self.bits |= mascara(inicio, fin)
+        self.turnos.append((inicio, fin, hora))
+
+    def conflicto(self, inicio: int, fin: int) -> Optional[Tuple[int, int, str]]:
+        """Devuelve el turno que se solapa con [inicio, fin), o None si está libre."""
+        if esta_libre(self.bits, inicio, fin):
+            return None
+        # Solo ante un conflicto se busca qué turno lo provoca (para el mensaje)
+        for turno in self.turnos:
+            if inicio < turno[1] and fin > turno[0]:
+                return turno
+        return None
+
+
+OCUPACION_VACIA = OcupacionDia()
+
+
+class AgendaCompilada:
+    """
+    Agenda de un médico precompilada a enteros, independiente del rango consultado:
+    reglas semanales como rangos de minutos, excepciones como lista de intervalos de
+    fechas ordenada por inicio y duraciones por especialidad. Es inmutable una vez
+    construida, por lo que puede compartirse entre requests (ver agenda_cache).
+    """
+
+    __slots__ = ("regulares_por_dia", "duraciones", "excepciones", "_inicios")
+
+    def __init__(self, agendas_regulares: list, agendas_excepcionales: list):
+        # Reglas semanales: dia_de_semana -> [(inicio, fin, duracion, especialidad, sucursal)]
+        self.regulares_por_dia: Dict[int, List[tuple]] = {}
+        # Mapa de duraciones por especialidad (para agendas excepcionales)
+        self.duraciones: Dict[int, int] = {}
+        for ag in agendas_regulares:
+            self.regulares_por_dia.setdefault(ag.Dia_de_semana, []).append(
+                (
+                    minutos_de(ag, "Inicio_Minutos", "Hora_inicio"),
+                    minutos_de(ag, "Fin_Minutos", "Hora_fin"),
+                    ag.Duracion,
+                    ag.Especialidad_Id,
+                    ag.Sucursal_Id,
+                )
+            )
+            self.duraciones[ag.Especialidad_Id] = ag.Duracion
+
+        # Excepciones: (desde, hasta, inicio, fin, es_disponible, especialidad, sucursal, orden)
+        # ordenadas por fecha de inicio; `orden` conserva el orden original de la DB.
+        excepciones = []
+        for orden, ag in enumerate(agendas_excepcionales):
+            if not ag.Fecha_inicio or not ag.Fecha_Fin:
+                continue
+            excepciones.append(
+                (
+                    fecha_de(ag, "Fecha_inicio_Dia", "Fecha_inicio"),
+                    fecha_de(ag, "Fecha_Fin_Dia", "Fecha_Fin"),
+                    minutos_de(ag, "Inicio_Minutos", "Hora_inicio"),
+                    minutos_de(ag, "Fin_Minutos", "Hora_Fin"),
+                    ag.Es_Disponible,
+                    ag.Especialidad_Id,
+                    ag.Consultorio_Sucursal_Id,
+                    orden,
+                )
+            )
+        excepciones.sort(key=lambda exc: exc[0])
+        self.excepciones: List[tuple] = excepciones
+        self._inicios = [exc[0] for exc in excepciones]
+
+    def excepciones_por_dia(
+        self, fecha_inicio: date, fecha_fin: date
+    ) -> Dict[date, List[tuple]]:
+        """Indexa las excepciones por cada día del rango en que están vigentes."""
+        indice: Dict[date, List[tuple]] = {}
+        # Solo pueden solaparse las que empiezan antes del fin del rango
+        for exc in self.excepciones[: bisect_right(self._inicios, fecha_fin)]:
+            dia = max(exc[0], fecha_inicio)
+            hasta = min(exc[1], fecha_fin)
+            while dia <= hasta:
+                indice.setdefault(dia, []).append(exc)
+                dia += timedelta(days=1)
+        for excepciones in indice.values():
+            excepciones.sort(key=lambda exc: exc[7])
+        return indice
+
+
+class MotorDisponibilidad:
+    """
+    Calcula los slots libres de un médico a partir de sus agendas y turnos.
+    Produce exactamente las mismas filas que AgendaDisponibleOut espera.
+    """
+
+    def __init__(
+        self,
+        medico_matricula: str,
+        agendas_regulares: Optional[list] = None,
+        agendas_excepcionales: Optional[list] = None,
+        turnos: Optional[list] = None,
+        ocupacion: Optional[Dict[str, OcupacionDia]] = None,
+        agenda: Optional[AgendaCompilada] = None,
+    ):
+        self.medico_matricula = medico_matricula
+        # La agenda puede llegar ya compilada (caché) o armarse desde las filas
+        self.agenda = agenda or AgendaCompilada(
+            agendas_regulares or [], agendas_excepcionales or []
+        )
+
+        # Ocupación por fecha ("YYYY-MM-DD" -> OcupacionDia). Se puede recibir
+        # ya construida (caché de bitsets) o armarla a partir de los turnos.
+        self._ocupacion: Dict[str, OcupacionDia] = dict(ocupacion or {})
+        if turnos:
+            por_fecha: Dict[str, list] = {}
+            for turno in turnos:
+                try:
+                    inicio = minutos_de(turno, "Hora_Minutos", "Hora")
+                except ValueError:
+                    inicio = None
+                por_fecha.setdefault(turno.Fecha, []).append(
+                    (inicio, turno.Duracion, turno.Hora)
+                )
+            for fecha, ternas in por_fecha.items():
+                self._ocupacion[fecha] = OcupacionDia.desde_minutos(ternas)
+
+    # ----------------------------------------------------
+    # Cálculo por día
+    # ----------------------------------------------------
+    def _candidatos_del_dia(self, dia: date, excepciones: List[tuple]):
+        """
+        Devuelve las corridas de slots candidatos del día
+        [(inicios ascendentes, duracion, especialidad, sucursal)] y el bitset de bloqueos.
+        """
+        corridas = []
+        bloqueos = 0
+        vistos = set()
+
+        # A. Agendas Regulares
+        for inicio, fin, duracion, especialidad, sucursal in self.agenda.regulares_por_dia.get(
+            dia.isoweekday(), []
+        ):
+            if not duracion or duracion <= 0:
+                continue
+            inicios = list(range(inicio, fin - duracion + 1, duracion))
+            corridas.append((inicios, duracion, especialidad, sucursal))
+            vistos.update((i, especialidad, duracion, sucursal) for i in inicios)
+
+        # B. Agendas Excepcionales (Disponibles) y bloqueos del día
+        for _, _, inicio, fin, disponible, especialidad, sucursal, _ in excepciones:
+            if disponible == 0:
+                bloqueos |= mascara(inicio, fin)
+                continue
+            if disponible != 1:
+                continue
+
+            duracion = self.agenda.duraciones.get(especialidad, DURACION_EXCEPCIONAL_DEFAULT)
+            if not duracion or duracion <= 0:
+                continue
+
+            inicios = []
+            for i in range(inicio, fin - duracion + 1, duracion):
+                clave = (i, especialidad, duracion, sucursal)
+                # Evitar duplicados exactos
+                if clave not in vistos:
+                    vistos.add(clave)
+                    inicios.append(i)
+            corridas.append((inicios, duracion, especialidad, sucursal))
+
+        return corridas, bloqueos
+
+    def _fila(self, fecha_str: str, inicio: int, duracion, especialidad, sucursal) -> dict:
+        return {
+            "fecha": fecha_str,
+            "hora": minutos_a_hora(inicio),
+            "medico_matricula": self.medico_matricula,
+            "especialidad_id": especialidad,
+            "duracion": duracion,
+            "sucursal_id": sucursal,
+        }
+
+    def _slots_del_dia(self, dia: date, excepciones: List[tuple]) -> List[dict]:
+        fecha_str = dia.strftime("%Y-%m-%d")
+        corridas, bloqueos = self._candidatos_del_dia(dia, excepciones)
+
+        # C. Descontar bloqueos y turnos: un AND por slot sobre el bitset del día
+        ocupados = bloqueos | self._ocupacion.get(fecha_str, OCUPACION_VACIA).bits
+
+        slots = []
+        for inicios, duracion, especialidad, sucursal in corridas:
+            for inicio in inicios:
+                if esta_libre(ocupados, inicio, inicio + duracion):
+                    slots.append(
+                        self._fila(fecha_str, inicio, duracion, especialidad, sucursal)
+                    )
+        return slots
+
+    def _calendario_del_dia(self, dia: date, excepciones: List[tuple]) -> List[dict]:
+        """Igual que _slots_del_dia pero conserva los slots con turno (ocupado=True)."""
+        fecha_str = dia.strftime("%Y-%m-%d")
+        corridas, bloqueos = self._candidatos_del_dia(dia, excepciones)
+        turnos = self._ocupacion.get(fecha_str, OCUPACION_VACIA).bits
+
+        slots = []
+        for inicios, duracion, especialidad, sucursal in corridas:
+            for inicio in inicios:
+                if not esta_libre(bloqueos, inicio, inicio + duracion):
+                    continue
+                fila = self._fila(fecha_str, inicio, duracion, especialidad, sucursal)
+                fila["ocupado"] = not esta_libre(turnos, inicio, inicio + duracion)
+                slots.append(fila)
+        return slots
+
+    # ----------------------------------------------------
+    # API pública
+    # ----------------------------------------------------
+    def iterar_dias(
+        self, fecha_inicio: date, fecha_fin: date
+    ) -> Iterator[List[dict]]:
+        """Genera los slots libres de a un día por vez (en orden cronológico)."""
+        excepciones = self.agenda.excepciones_por_dia(fecha_inicio, fecha_fin)
+        dia = fecha_inicio
+        while dia <= fecha_fin:
+            yield self._slots_del_dia(dia, excepciones.get(dia, []))
+            dia += timedelta(days=1)
+
+    def iterar_calendario(
+        self, fecha_inicio: date, fecha_fin: date
+    ) -> Iterator[List[dict]]:
+        """Genera, día por día, todos los slots habilitados con su marca de ocupado."""
+        excepciones = self.agenda.excepciones_por_dia(fecha_inicio, fecha_fin)
+        dia = fecha_inicio
+        while dia <= fecha_fin:
+            yield self._calendario_del_dia(dia, excepciones.get(dia, []))
+            dia += timedelta(days=1)
+
+    def calcular(self, fecha_inicio: date, fecha_fin: date) -> List[dict]:
+        """Devuelve todos los slots libres del rango [fecha_inicio, fecha_fin]."""
+        available_slots = []
+        for slots in self.iterar_dias(fecha_inicio, fecha_fin):
+            available_slots.extend(slots)
+        return available_slots
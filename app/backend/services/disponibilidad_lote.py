@@ -0,0 +1,314 @@
+"""
+Cálculo de disponibilidad en lote (muchos médicos a la vez) con NumPy.
+
+Pensado para los snapshots nocturnos del call center: en lugar de recorrer
+slot por slot, todo el lote se representa como arrays de enteros en minutos
+desde fecha_inicio (desplazados por médico para que cada uno ocupe su propio
+tramo de la recta numérica):
+
+- candidatos: las reglas semanales y las excepciones disponibles se expanden
+  a todos los días del rango con repeat/tile;
+- ocupación: turnos y bloqueos se ordenan una vez por inicio y se acumula el
+  máximo de los finales;
+- resta de intervalos: un único searchsorted decide, para cada candidato, si
+  algún intervalo ocupado se solapa con él.
+
+Devuelve exactamente las mismas filas (y en el mismo orden) que
+MotorDisponibilidad.calcular para cada médico.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.backend.services.disponibilidad_engine import (
+    DURACION_EXCEPCIONAL_DEFAULT,
+    DURACION_TURNO_DEFAULT,
+    AgendaCompilada,
+    hora_a_minutos,
+    minutos_a_hora,
+)
+
+MINUTOS_POR_DIA = 1440
+SIN_VALOR = -1  # Representa None (sucursal/especialidad) dentro de los arrays
+
+# Tipos de corrida: las regulares van antes que las excepcionales en cada día
+_REGULAR = 0
+_EXCEPCIONAL = 1
+
+_HORAS = [minutos_a_hora(m) for m in range(MINUTOS_POR_DIA)]
+
+
+def _entero(valor) -> int:
+    return SIN_VALOR if valor is None else int(valor)
+
+
+def _a_lista(valores: np.ndarray) -> list:
+    """Array de enteros → lista de Python, devolviendo SIN_VALOR a None."""
+    lista = valores.astype(object)
+    lista[valores == SIN_VALOR] = None
+    return lista.tolist()
+
+
+class _Candidatos:
+    """
+    Corridas de slots candidatos: los días e inicios de cada corrida son arrays,
+    el resto de las columnas es constante por corrida y se expande al final.
+    """
+
+    ESCALARES = ("medico", "duracion", "especialidad", "sucursal", "tipo", "seq")
+
+    def __init__(self):
+        self.dias: List[np.ndarray] = []
+        self.inicios: List[np.ndarray] = []
+        self.cantidades: List[int] = []
+        self.escalares: List[tuple] = []
+
+    def concatenar(self) -> Dict[str, np.ndarray]:
+        if not self.escalares:
+            return {c: np.empty(0, dtype=np.int64) for c in ("dia", "inicio") + self.ESCALARES}
+        cantidades = np.array(self.cantidades, dtype=np.int64)
+        escalares = np.array(self.escalares, dtype=np.int64)
+        columnas = {"dia": np.concatenate(self.dias), "inicio": np.concatenate(self.inicios)}
+        for i, campo in enumerate(self.ESCALARES):
+            columnas[campo] = np.repeat(escalares[:, i], cantidades)
+        return columnas
+
+
+class _Acumulador:
+    """Junta bloques de arrays y los concatena una sola vez al final."""
+
+    def __init__(self, *campos: str):
+        self.campos = campos
+        self.partes: Dict[str, List[np.ndarray]] = {c: [] for c in campos}
+
+    def agregar(self, **columnas) -> None:
+        for campo in self.campos:
+            self.partes[campo].append(columnas[campo])
+
+    def concatenar(self) -> Dict[str, np.ndarray]:
+        return {
+            c: (np.concatenate(p) if p else np.empty(0, dtype=np.int64))
+            for c, p in self.partes.items()
+        }
+
+
+def _candidatos_medico(
+    cand: _Candidatos,
+    ocup: _Acumulador,
+    indice_medico: int,
+    agenda: AgendaCompilada,
+    fecha_inicio: date,
+    fecha_fin: date,
+) -> None:
+    """Expande las reglas del médico sobre todos los días del rango."""
+    n_dias = (fecha_fin - fecha_inicio).days + 1
+    dias = np.arange(n_dias, dtype=np.int64)
+    dia_semana = (fecha_inicio.isoweekday() - 1 + dias) % 7 + 1
+
+    # A. Agendas Regulares: una plantilla por día de la semana, repetida por día
+    for dia_de_semana, reglas in agenda.regulares_por_dia.items():
+        dias_w = dias[dia_semana == dia_de_semana]
+        if not len(dias_w):
+            continue
+        for seq, (inicio, fin, duracion, especialidad, sucursal) in enumerate(reglas):
+            if not duracion or duracion <= 0:
+                continue
+            inicios = np.arange(inicio, fin - duracion + 1, duracion, dtype=np.int64)
+            if not len(inicios):
+                continue
+            _agregar_corrida(
+                cand, indice_medico, dias_w, inicios, duracion,
+                especialidad, sucursal, _REGULAR, seq,
+            )
+
+    # B. Agendas Excepcionales: disponibles como corridas, no disponibles como bloqueos
+    for desde, hasta, inicio, fin, disponible, especialidad, sucursal, orden in agenda.excepciones:
+        primer_dia = max((desde - fecha_inicio).days, 0)
+        ultimo_dia = min((hasta - fecha_inicio).days, n_dias - 1)
+        if primer_dia > ultimo_dia:
+            continue
+        dias_e = dias[primer_dia : ultimo_dia + 1]
+
+        if disponible == 0:
+            if fin > inicio:
+                base = dias_e * MINUTOS_POR_DIA
+                ocup.agregar(
+                    medico=np.full(len(dias_e), indice_medico, dtype=np.int64),
+                    inicio=base + inicio,
+                    fin=base + fin,
+                )
+            continue
+        if disponible != 1:
+            continue
+
+        duracion = agenda.duraciones.get(especialidad, DURACION_EXCEPCIONAL_DEFAULT)
+        if not duracion or duracion <= 0:
+            continue
+        inicios = np.arange(inicio, fin - duracion + 1, duracion, dtype=np.int64)
+        if not len(inicios):
+            continue
+        _agregar_corrida(
+            cand, indice_medico, dias_e, inicios, duracion,
+            especialidad, sucursal, _EXCEPCIONAL, orden,
+        )
+
+
+def _agregar_corrida(
+    cand: _Candidatos,
+    indice_medico: int,
+    dias: np.ndarray,
+    inicios: np.ndarray,
+    duracion: int,
+    especialidad,
+    sucursal,
+    tipo: int,
+    seq: int,
+) -> None:
+    cand.dias.append(np.repeat(dias, len(inicios)))
+    cand.inicios.append(np.tile(inicios, len(dias)))
+    cand.cantidades.append(len(dias) * len(inicios))
+    cand.escalares.append(
+        (indice_medico, duracion, _entero(especialidad), _entero(sucursal), tipo, seq)
+    )
+
+
+def _turnos_lote(
+    ocup: _Acumulador,
+    matriculas: List[str],
+    turnos: Dict[str, List[Tuple[str, str, Optional[int]]]],
+    indice_fecha: Dict[str, int],
+) -> None:
+    """Turnos (fecha, hora, duracion) → intervalos ocupados, recortados al día."""
+    minutos_por_hora: Dict[str, Optional[int]] = {}  # Pocas horas distintas: se parsean una vez
+    medicos, inicios, fines = [], [], []
+    for indice, matricula in enumerate(matriculas):
+        for fecha, hora, duracion in turnos.get(matricula, ()):
+            dia = indice_fecha.get(str(fecha))
+            if dia is None:
+                continue
+            inicio = minutos_por_hora.get(hora, -1)
+            if inicio == -1:
+                try:
+                    inicio = hora_a_minutos(hora)
+                except ValueError:
+                    print(f"ALERTA: Formato de hora inconsistente en DB: {hora}")
+                    inicio = None
+                minutos_por_hora[hora] = inicio
+            if inicio is None:
+                continue
+            if not duracion or duracion <= 0:
+                duracion = DURACION_TURNO_DEFAULT
+            medicos.append(indice)
+            inicios.append(dia * MINUTOS_POR_DIA + inicio)
+            fines.append(dia * MINUTOS_POR_DIA + inicio + duracion)
+
+    if inicios:
+        dias = np.array(inicios, dtype=np.int64) // MINUTOS_POR_DIA
+        ocup.agregar(
+            medico=np.array(medicos, dtype=np.int64),
+            inicio=np.array(inicios, dtype=np.int64),
+            # Igual que el bitset del día: lo que pasa de medianoche no ocupa el día siguiente
+            fin=np.minimum(np.array(fines, dtype=np.int64), (dias + 1) * MINUTOS_POR_DIA),
+        )
+
+
+def calcular_disponibilidad_lote(
+    agendas: Dict[str, AgendaCompilada],
+    turnos: Dict[str, List[Tuple[str, str, Optional[int]]]],
+    fecha_inicio: date,
+    fecha_fin: date,
+) -> Dict[str, List[dict]]:
+    """
+    Slots libres de [fecha_inicio, fecha_fin] para todos los médicos de `agendas`.
+    `turnos` mapea matrícula -> [(Fecha, Hora, Duracion)] de los turnos que ocupan lugar.
+    """
+    matriculas = list(agendas)
+    resultado: Dict[str, List[dict]] = {m: [] for m in matriculas}
+    if fecha_inicio > fecha_fin or not matriculas:
+        return resultado
+
+    n_dias = (fecha_fin - fecha_inicio).days + 1
+    # Cada médico ocupa su propio tramo: los intervalos de médicos distintos nunca se tocan
+    tramo = (n_dias + 1) * MINUTOS_POR_DIA
+
+    cand = _Candidatos()
+    ocup = _Acumulador("medico", "inicio", "fin")
+    fechas = [
+        (fecha_inicio + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(n_dias)
+    ]
+    for indice, matricula in enumerate(matriculas):
+        _candidatos_medico(cand, ocup, indice, agendas[matricula], fecha_inicio, fecha_fin)
+    _turnos_lote(ocup, matriculas, turnos, {f: d for d, f in enumerate(fechas)})
+
+    c = cand.concatenar()
+    if not len(c["medico"]):
+        return resultado
+
+    # 1. Orden de salida del motor: (médico, día, regulares→excepcionales, regla, hora)
+    orden = np.lexsort((c["inicio"], c["seq"], c["tipo"], c["dia"], c["medico"]))
+    c = {k: v[orden] for k, v in c.items()}
+
+    # 2. Duplicados exactos: una excepción no repite un slot ya generado ese día
+    por_clave = np.lexsort(
+        (
+            np.arange(len(c["medico"])),
+            c["sucursal"], c["duracion"], c["especialidad"],
+            c["inicio"], c["dia"], c["medico"],
+        )
+    )
+    claves = np.stack(
+        [c[k][por_clave] for k in ("medico", "dia", "inicio", "especialidad", "duracion", "sucursal")]
+    )
+    repetido = np.zeros(len(por_clave), dtype=bool)
+    repetido[1:] = np.all(claves[:, 1:] == claves[:, :-1], axis=0)
+    descartar = np.zeros(len(por_clave), dtype=bool)
+    descartar[por_clave] = repetido & (c["tipo"][por_clave] == _EXCEPCIONAL)
+
+    # 3. Resta de intervalos: candidato libre si ningún intervalo ocupado se solapa
+    inicio_abs = c["medico"] * tramo + c["dia"] * MINUTOS_POR_DIA + c["inicio"]
+    fin_abs = inicio_abs + c["duracion"]
+    o = ocup.concatenar()
+    libre = ~descartar
+    if len(o["medico"]):
+        ocup_inicio = o["medico"] * tramo + o["inicio"]
+        ocup_fin = o["medico"] * tramo + o["fin"]
+        por_inicio = np.argsort(ocup_inicio, kind="stable")
+        ocup_inicio = ocup_inicio[por_inicio]
+        max_fin = np.maximum.accumulate(ocup_fin[por_inicio])
+        # Último intervalo ocupado que empieza antes del fin del candidato
+        j = np.searchsorted(ocup_inicio, fin_abs, side="left") - 1
+        solapa = (j >= 0) & (max_fin[np.maximum(j, 0)] > inicio_abs)
+        libre &= ~solapa
+
+    # 4. Armar las filas (mismo formato que AgendaDisponibleOut), médico por médico
+    c = {k: v[libre] for k, v in c.items()}
+    columnas = {
+        "fecha": np.array(fechas, dtype=object)[c["dia"]].tolist(),
+        "hora": np.array(_HORAS, dtype=object)[c["inicio"]].tolist(),
+        "especialidad_id": _a_lista(c["especialidad"]),
+        "duracion": c["duracion"].tolist(),
+        "sucursal_id": _a_lista(c["sucursal"]),
+    }
+    limites = np.searchsorted(c["medico"], np.arange(len(matriculas) + 1)).tolist()
+    for indice, matricula in enumerate(matriculas):
+        desde, hasta = limites[indice], limites[indice + 1]
+        resultado[matricula] = [
+            {
+                "fecha": fecha,
+                "hora": hora,
+                "medico_matricula": matricula,
+                "especialidad_id": especialidad,
+                "duracion": duracion,
+                "sucursal_id": sucursal,
+            }
+            for fecha, hora, especialidad, duracion, sucursal in zip(
+                columnas["fecha"][desde:hasta],
+                columnas["hora"][desde:hasta],
+                columnas["especialidad_id"][desde:hasta],
+                columnas["duracion"][desde:hasta],
+                columnas["sucursal_id"][desde:hasta],
+            )
+        ]
+    return resultado
@@ -0,0 +1,40 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from app.backend.models.models import EventoTurno
+from typing import List, Optional
+
+
+class EventoTurnoRepository:
+    """Clase responsable de la lectura y purga del outbox Eventos_Turnos."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_ultimo_id(self) -> int:
+        """Offset actual del feed (0 si no hay eventos)."""
+        return self.db.query(func.max(EventoTurno.Id)).scalar() or 0
+
+    def get_desde(
+        self,
+        desde_id: int,
+        limite: int,
+        medico_matricula: Optional[str] = None,
+        sucursal_id: Optional[int] = None,
+    ) -> List[EventoTurno]:
+        """Eventos con Id > desde_id, en orden (por ix_eventos_turnos_medico/_sucursal si se filtra)."""
+        query = self.db.query(EventoTurno).filter(EventoTurno.Id > desde_id)
+        if medico_matricula is not None:
+            query = query.filter(EventoTurno.Medico_Matricula == medico_matricula)
+        if sucursal_id is not None:
+            query = query.filter(EventoTurno.Sucursal_Id == sucursal_id)
+        return query.order_by(EventoTurno.Id).limit(limite).all()
+
+    def delete_anteriores(self, antes_de: float) -> int:
+        """Purga los eventos creados antes del epoch `antes_de`."""
+        borrados = (
+            self.db.query(EventoTurno)
+            .filter(EventoTurno.Creado < antes_de)
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return borrados
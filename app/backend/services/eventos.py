@@ -0,0 +1,48 @@
+"""
+Notificación de cambios entre componentes (Patrón Observer).
+
+Los repositorios y services publican qué cambió (médico-días con turnos
+modificados, médicos con agenda modificada) DESPUÉS de hacer commit, y las
+cachés en memoria se suscriben para invalidar solo las entradas afectadas.
+"""
+
+from typing import Callable, Iterable, List, Set, Tuple
+
+DiaMedico = Tuple[str, str]  # (Medico_Matricula, "YYYY-MM-DD")
+
+_suscriptores_turnos: List[Callable[[Set[DiaMedico]], None]] = []
+_suscriptores_agendas: List[Callable[[str], None]] = []
+
+
+def suscribir_cambios_turnos(callback: Callable[[Set[DiaMedico]], None]):
+    """Registra un observador de cambios de turnos (usable como decorador)."""
+    _suscriptores_turnos.append(callback)
+    return callback
+
+
+def publicar_cambios_turnos(dias: Iterable[DiaMedico]) -> None:
+    """Notifica a los observadores los médico-días cuyos turnos cambiaron."""
+    dias = set(dias)
+    if not dias:
+        return
+    for callback in list(_suscriptores_turnos):
+        try:
+            callback(dias)
+        except Exception as e:
+            # Un observador con errores no debe romper la operación ya confirmada
+            print(f"❌ ERROR al notificar cambio de turnos a {callback.__name__}: {e}")
+
+
+def suscribir_cambios_agenda(callback: Callable[[str], None]):
+    """Registra un observador de cambios de agendas de un médico (usable como decorador)."""
+    _suscriptores_agendas.append(callback)
+    return callback
+
+
+def publicar_cambios_agenda(medico_matricula: str) -> None:
+    """Notifica que cambió la agenda (regular o excepcional) de un médico."""
+    for callback in list(_suscriptores_agendas):
+        try:
+            callback(medico_matricula)
+        except Exception as e:
+            print(f"❌ ERROR al notificar cambio de agenda a {callback.__name__}: {e}")
@@ -23,7 +23,7 @@ class HorarioNoDisponibleError(Exception):
 
 
 class TransicionInvalidaError(Exception):
-    """Excepción lanzada al intentar un cambio de estado de Turno no permitido (Patrón State)."""
+    """Excepción lanzada al intentar un cambio de estado de Turno no permitido por la máquina de estados."""
 
     pass
 
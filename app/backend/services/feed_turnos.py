@@ -0,0 +1,144 @@
+"""
+Feed de cambios de turnos por Server-Sent Events (GET /turnos/eventos).
+
+Las pantallas de recepción y los tableros de médicos, en vez de recargar la
+lista completa cada pocos segundos, mantienen una conexión abierta y reciben
+solo los eventos nuevos del outbox (Eventos_Turnos), filtrados por médico o
+sucursal. Cada evento SSE lleva como `id` el Id del outbox: al reconectarse,
+el navegador envía Last-Event-ID y el feed sigue desde ahí sin perder eventos.
+
+Los streams no sondean la base en un bucle: duermen hasta que este proceso
+confirma un cambio de turnos (eventos.publicar_cambios_turnos) o, para ver los
+cambios hechos por otros procesos (scheduler, otros workers), hasta que pasa
+INTERVALO_SONDEO_SEGUNDOS.
+"""
+
+import asyncio
+import time
+from threading import Lock
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.backend.db.db import SessionLocal
+from app.backend.schemas.evento_turno import EventoTurnoOut
+from app.backend.services.evento_turno_repository import EventoTurnoRepository
+from app.backend.services.eventos import suscribir_cambios_turnos
+
+INTERVALO_SONDEO_SEGUNDOS = 5
+INTERVALO_KEEPALIVE_SEGUNDOS = 15
+LOTE_EVENTOS = 200
+REINTENTO_MS = 3000  # campo `retry` de SSE: espera del navegador antes de reconectar
+RETENCION_EVENTOS_DIAS = 7  # el scheduler purga los eventos más viejos
+
+
+class AvisoCambiosTurnos:
+    """
+    Despierta a los streams (corrutinas, posiblemente en otro event loop) cuando
+    se confirma un cambio. La versión evita perder un aviso que llega entre la
+    lectura de la base y el momento de ponerse a esperar.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._esperando: set = set()  # {(loop, asyncio.Event)}
+        self._lock = Lock()
+
+    def avisar(self) -> None:
+        with self._lock:
+            self.version += 1
+            esperando = list(self._esperando)
+        for loop, evento in esperando:
+            try:
+                loop.call_soon_threadsafe(evento.set)
+            except RuntimeError:
+                pass  # loop cerrado: su stream ya terminó
+
+    async def esperar(self, version: int, timeout: float) -> None:
+        """Vuelve cuando hubo un aviso posterior a `version` o cuando pasa `timeout`."""
+        evento = asyncio.Event()
+        clave = (asyncio.get_running_loop(), evento)
+        with self._lock:
+            if self.version != version:
+                return
+            self._esperando.add(clave)
+        try:
+            await asyncio.wait_for(evento.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._esperando.discard(clave)
+
+
+# Instancia única del proceso
+aviso_cambios_turnos = AvisoCambiosTurnos()
+
+
+@suscribir_cambios_turnos
+def _avisar_streams(dias) -> None:
+    aviso_cambios_turnos.avisar()
+
+
+# ----------------------------------------------------
+# Lectura del outbox (en el threadpool, con una sesión corta por consulta)
+# ----------------------------------------------------
+def _ultimo_id() -> int:
+    with SessionLocal() as db:
+        return EventoTurnoRepository(db).get_ultimo_id()
+
+
+def _leer(
+    desde_id: int, medico_matricula: Optional[str], sucursal_id: Optional[int]
+) -> List[Tuple[int, str, str]]:
+    """[(Id, Tipo, JSON)] de los eventos posteriores a desde_id."""
+    with SessionLocal() as db:
+        eventos = EventoTurnoRepository(db).get_desde(
+            desde_id, LOTE_EVENTOS, medico_matricula, sucursal_id
+        )
+        return [
+            (e.Id, e.Tipo, EventoTurnoOut.model_validate(e).model_dump_json(by_alias=True))
+            for e in eventos
+        ]
+
+
+def formatear_sse(id_: int, tipo: str, datos: str) -> str:
+    return f"id: {id_}\nevent: {tipo}\ndata: {datos}\n\n"
+
+
+async def transmitir_eventos(
+    desde_id: Optional[int],
+    desconectado: Callable[[], Awaitable[bool]],
+    medico_matricula: Optional[str] = None,
+    sucursal_id: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """
+    Genera el stream SSE. Sin `desde_id` arranca desde el último evento actual
+    (solo cambios nuevos); con él, reenvía primero lo pendiente desde ese offset.
+    """
+    if desde_id is None:
+        desde_id = await run_in_threadpool(_ultimo_id)
+    yield f"retry: {REINTENTO_MS}\n\n"
+
+    ultimo_envio = time.monotonic()
+    while not await desconectado():
+        version = aviso_cambios_turnos.version
+        eventos = await run_in_threadpool(_leer, desde_id, medico_matricula, sucursal_id)
+        for id_, tipo, datos in eventos:
+            yield formatear_sse(id_, tipo, datos)
+            desde_id = id_
+        if eventos:
+            ultimo_envio = time.monotonic()
+            if len(eventos) == LOTE_EVENTOS:
+                continue  # hay más pendientes: seguir sin esperar
+        elif time.monotonic() - ultimo_envio >= INTERVALO_KEEPALIVE_SEGUNDOS:
+            # Comentario SSE: mantiene viva la conexión a través de proxies
+            yield ": keepalive\n\n"
+            ultimo_envio = time.monotonic()
+        await aviso_cambios_turnos.esperar(version, INTERVALO_SONDEO_SEGUNDOS)
+
+
+def purgar_eventos(db, ahora: Optional[float] = None) -> int:
+    """Borra del outbox los eventos con más de RETENCION_EVENTOS_DIAS días."""
+    ahora = time.time() if ahora is None else ahora
+    return EventoTurnoRepository(db).delete_anteriores(ahora - RETENCION_EVENTOS_DIAS * 86400)
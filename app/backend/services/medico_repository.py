@@ -4,7 +4,7 @@ from app.backend.models.models import (
     Especialidad,
     Medico,
 )  # Asume que tu Medico model está importado
-from typing import List
+from typing import Iterable, List, Set
 from app.backend.schemas.medico import MedicoUpdate  # Para tipado en el update
 
 
@@ -22,6 +22,14 @@ class MedicoRepository:
             .filter(Medico.Matricula == matricula)
             .first()
         )
+    def get_matriculas_existentes(self, matriculas: Iterable[str]) -> Set[str]:
+        """De las matrículas dadas, devuelve las que existen (una sola consulta)."""
+        matriculas = set(matriculas)
+        if not matriculas:
+            return set()
+        filas = self.db.query(Medico.Matricula).filter(Medico.Matricula.in_(matriculas))
+        return {matricula for (matricula,) in filas}
+
     def get_by_user_id(self, user_id: int) -> Medico | None:
         """Obtiene un médico por su user_id."""
         return (
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from app.backend.schemas.medico import MedicoCreate, MedicoUpdate
 from app.backend.models.models import Medico, User, Role
+from app.backend.services.catalogos import catalogos
 from app.backend.services.medico_repository import MedicoRepository
 from app.backend.services.user_repository import UserRepository
 from app.backend.core.security import (
@@ -37,13 +38,13 @@ class MedicoService:
             )
 
         # --- CREACIÓN DEL USER ---
-        role_medico = self.user_repo.get_role_by_name("Médico")
-        if not role_medico:
+        roles = catalogos().roles
+        if "Médico" not in roles:
             raise RecursoNoEncontradoError(
                 "El rol 'Médico' no está configurado en la base de datos."
             )
 
-        role_id = role_medico.Id
+        role_id = roles.id("Médico")
         hashed_password = hash_password(data.password_temporal)
 
         nuevo_user = User(
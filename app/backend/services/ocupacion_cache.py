@@ -0,0 +1,61 @@
+"""
+Caché en memoria de la ocupación por médico-día (bitsets de 1440 minutos).
+
+Los bitsets (OcupacionDia) se reconstruyen desde la DB ante un miss y se
+invalidan cuando TurnoRepository confirma cambios sobre ese médico-día.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterable, Optional
+
+from app.backend.services.disponibilidad_engine import OcupacionDia
+from app.backend.services.eventos import suscribir_cambios_turnos
+
+
+class OcupacionCache:
+    """Caché LRU acotada de OcupacionDia por (matricula, fecha)."""
+
+    def __init__(self, max_entradas: int = 20000):
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[tuple, OcupacionDia]" = OrderedDict()
+        self._lock = Lock()
+        # Se incrementa en cada invalidación: evita guardar un bitset leído antes
+        # de un commit concurrente que ya lo invalidó.
+        self.generacion = 0
+
+    def obtener(self, clave: tuple) -> Optional[OcupacionDia]:
+        with self._lock:
+            ocupacion = self._entradas.get(clave)
+            if ocupacion is not None:
+                self._entradas.move_to_end(clave)
+            return ocupacion
+
+    def guardar(self, clave: tuple, ocupacion: OcupacionDia, generacion: int) -> None:
+        with self._lock:
+            if generacion != self.generacion:
+                return
+            self._entradas[clave] = ocupacion
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, dias: Iterable[tuple]) -> None:
+        with self._lock:
+            self.generacion += 1
+            for clave in dias:
+                self._entradas.pop(clave, None)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self.generacion += 1
+            self._entradas.clear()
+
+
+# Instancia única del proceso
+ocupacion_cache = OcupacionCache()
+
+
+@suscribir_cambios_turnos
+def _invalidar_ocupacion(dias):
+    ocupacion_cache.invalidar(dias)
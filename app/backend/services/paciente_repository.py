@@ -1,6 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.backend.models.models import Paciente
-from typing import List
+from typing import Iterable, List, Set
 
 
 class PacienteRepository:
@@ -15,6 +15,14 @@ class PacienteRepository:
             self.db.query(Paciente).filter(Paciente.nroPaciente == nro_paciente).first()
         )
 
+    def get_ids_existentes(self, nros_paciente: Iterable[int]) -> Set[int]:
+        """De los nroPaciente dados, devuelve los que existen (una sola consulta)."""
+        nros = set(nros_paciente)
+        if not nros:
+            return set()
+        filas = self.db.query(Paciente.nroPaciente).filter(Paciente.nroPaciente.in_(nros))
+        return {nro for (nro,) in filas}
+
     def get_by_email(self, email: str) -> Paciente | None:
         """Obtiene un paciente por su email (para verificar unicidad)."""
         return self.db.query(Paciente).filter(Paciente.Email == email).first()
@@ -31,7 +39,8 @@ class PacienteRepository:
         self, medico_matricula: str, especialidad_id: int = None
     ) -> List[Paciente]:
         """Obtiene todos los pacientes asociados a un médico específico, opcionalmente filtrando por especialidad."""
-        query = self.db.query(Paciente)
+        # Los turnos de cada paciente se usan para calcular visitas: se cargan en una consulta más
+        query = self.db.query(Paciente).options(selectinload(Paciente.turnos))
 
         if especialidad_id:
             query = query.filter(
@@ -1,12 +1,12 @@
 from sqlalchemy.orm import Session, joinedload
-from app.backend.models.models import Receta, Turno, DetalleReceta
+from app.backend.models.models import Receta, DetalleReceta
+from app.backend.services.turno_repository import TurnoRepository
 
 def crear_receta(db: Session, data):
-    turno = db.query(Turno).filter(
-        Turno.Fecha == data.Turno_Fecha,
-        Turno.Hora == data.Turno_Hora,
-        Turno.Paciente_nroPaciente == data.Turno_Paciente_nroPaciente
-    ).first()
+    # Los turnos viejos pueden estar en el archivo (Turnos_Archivo)
+    turno = TurnoRepository(db).get_by_pk_con_archivo(
+        data.Turno_Fecha, data.Turno_Hora, data.Turno_Paciente_nroPaciente
+    )
 
     if not turno:
         raise Exception("El turno especificado no existe")
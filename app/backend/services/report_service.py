@@ -7,8 +7,16 @@ from app.backend.services.reports.atendidos import ReporteAtendidosStrategy
 from app.backend.services.reports.asistencias_grafico import ReporteGraficoAsistenciasStrategy
 
 from app.backend.services.turno_repository import TurnoRepository
+from app.backend.services.evento_turno_repository import EventoTurnoRepository
+from app.backend.services.reportes_cache import (
+    ReportesCache,
+    clave_reporte,
+    periodo_abierto,
+    reportes_cache,
+)
 from app.backend.services.exceptions import RecursoNoEncontradoError, ValueError
-from typing import Dict, Any, Type, Optional
+from datetime import date, timedelta
+from typing import Dict, Any, List, Type, Optional
 
 class ReportService:
     """
@@ -24,11 +32,16 @@ class ReportService:
         "asistencias": ReporteGraficoAsistenciasStrategy,
     }
 
-    def __init__(self, turno_repo: TurnoRepository):
+    def __init__(
+        self, turno_repo: TurnoRepository, cache: Optional[ReportesCache] = reportes_cache
+    ):
         # El contexto solo necesita el repositorio para pasarlo a las estrategias
         self.turno_repo = turno_repo
+        # Caché de resultados (None = calcular siempre)
+        self.cache = cache
         # Inicialmente no tiene una estrategia seleccionada
         self._strategy: Optional[StrategyReports] = None
+        self._strategy_type: Optional[str] = None
 
     def set_strategy(self, strategy_type: str):
         """
@@ -41,6 +54,7 @@ class ReportService:
         
         # 💡 CRÍTICO: Instancia la clase de estrategia, inyectándole el TurnoRepository
         self._strategy = StrategyClass(self.turno_repo)
+        self._strategy_type = strategy_type
 
     def generate_report(self, start_date: str, end_date: str, **kwargs) -> Dict[str, Any]:
         """
@@ -49,5 +63,47 @@ class ReportService:
         if not self._strategy:
             raise ValueError("No se ha seleccionado ninguna estrategia de reporte.")
             
-        # 💡 DELEGACIÓN: Llama al método abstracto de la estrategia concreta
-        return self._strategy.generate_report(start_date, end_date, **kwargs)
\ No newline at end of file
+        if self.cache is None:
+            # 💡 DELEGACIÓN: Llama al método abstracto de la estrategia concreta
+            return self._strategy.generate_report(start_date, end_date, **kwargs)
+
+        clave = clave_reporte(self._strategy_type, start_date, end_date, kwargs)
+        # La marca de agua se lee ANTES de calcular: un cambio confirmado durante
+        # el cálculo deja la entrada vieja y la próxima consulta la recalcula.
+        marca = None
+        if periodo_abierto(end_date):
+            marca = EventoTurnoRepository(self.turno_repo.db).get_ultimo_id()
+
+        reporte = self.cache.obtener(clave, marca)
+        if reporte is None:
+            generacion = self.cache.generacion
+            reporte = self._strategy.generate_report(start_date, end_date, **kwargs)
+            self.cache.guardar(clave, reporte, marca, generacion)
+        return reporte
+
+
+# ----------------------------------------------------
+# Precalentado de la caché (períodos habituales del tablero)
+# ----------------------------------------------------
+def periodos_comunes(hoy: Optional[date] = None) -> List[tuple]:
+    """[(start_date, end_date)] del mes actual y del anterior, completos ("YYYY-MM-DD")."""
+    hoy = hoy or date.today()
+    inicio_mes = hoy.replace(day=1)
+    inicio_siguiente = (inicio_mes + timedelta(days=32)).replace(day=1)
+    fin_anterior = inicio_mes - timedelta(days=1)
+    return [
+        (inicio_mes.isoformat(), (inicio_siguiente - timedelta(days=1)).isoformat()),
+        (fin_anterior.replace(day=1).isoformat(), fin_anterior.isoformat()),
+    ]
+
+
+def precalentar_reportes(turno_repo: TurnoRepository, hoy: Optional[date] = None) -> int:
+    """Calcula y guarda en la caché todos los tipos de reporte para periodos_comunes()."""
+    service = ReportService(turno_repo)
+    total = 0
+    for start_date, end_date in periodos_comunes(hoy):
+        for strategy_type in ReportService.STRATEGY_MAP:
+            service.set_strategy(strategy_type)
+            service.generate_report(start_date, end_date)
+            total += 1
+    return total
\ No newline at end of file
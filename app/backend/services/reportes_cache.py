@@ -0,0 +1,133 @@
+"""
+Caché en memoria de los resultados de ReportService por
+(tipo, start_date, end_date, kwargs).
+
+El tablero de administración vuelve a pedir los mismos reportes en cada
+refresco. Según el período:
+- cerrado (termina antes de ayer, ya pasó el cierre de fin de día): el
+  resultado no cambia, se guarda sin marca y solo lo quitan el LRU o un cambio
+  de turnos de este proceso en un día del rango (ediciones administrativas);
+- abierto (incluye ayer, hoy o días futuros): se guarda con la marca de agua
+  del outbox de turnos (máximo Id de Eventos_Turnos) leída ANTES de calcularlo,
+  y solo se usa mientras la marca actual sea la misma. Así también se ven los
+  cambios hechos por otros procesos (scheduler, otros workers).
+"""
+
+from collections import OrderedDict
+from datetime import date, timedelta
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional
+
+from app.backend.services.eventos import suscribir_cambios_turnos
+
+# Días hacia atrás (desde hoy) que todavía pueden cambiar: el cierre automático
+# de turnos corre pasada la medianoche sobre los días anteriores.
+DIAS_PERIODO_ABIERTO = 1
+
+
+def periodo_abierto(end_date: str, hoy: Optional[date] = None) -> bool:
+    """True si el período que termina en `end_date` ("YYYY-MM-DD") todavía puede cambiar."""
+    hoy = hoy or date.today()
+    return end_date >= (hoy - timedelta(days=DIAS_PERIODO_ABIERTO)).isoformat()
+
+
+def clave_reporte(tipo: str, start_date: str, end_date: str, kwargs: Dict[str, Any]) -> tuple:
+    """Clave de la caché. Los kwargs en None se omiten (equivalen a no pasarlos)."""
+    return (
+        tipo,
+        start_date,
+        end_date,
+        tuple(sorted((k, v) for k, v in kwargs.items() if v is not None)),
+    )
+
+
+class ReportesCache:
+    """Caché LRU de reportes, con marca de agua para los períodos abiertos."""
+
+    def __init__(self, max_entradas: int = 200):
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[tuple, tuple]" = OrderedDict()  # clave -> (marca, reporte)
+        self._lock = Lock()
+        # Igual que DisponibilidadCache: un reporte calculado antes de una
+        # invalidación concurrente no se guarda.
+        self.generacion = 0
+
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+        self.desactualizadas = 0  # descartadas porque cambió la marca de agua
+        self.invalidaciones = 0
+
+    # ----------------------------------------------------
+    # Lectura / escritura
+    # ----------------------------------------------------
+    def obtener(self, clave: tuple, marca: Optional[int]) -> Optional[dict]:
+        """
+        Reporte guardado para `clave`. `marca` es la marca de agua actual (None
+        para períodos cerrados); una entrada con otra marca se descarta.
+        El reporte devuelto es compartido: no se debe modificar.
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return None
+            marca_guardada, reporte = entrada
+            if marca_guardada is not None and marca_guardada != marca:
+                del self._entradas[clave]
+                self.desactualizadas += 1
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            return reporte
+
+    def guardar(self, clave: tuple, reporte: dict, marca: Optional[int], generacion: int) -> None:
+        with self._lock:
+            if generacion != self.generacion:
+                return
+            self._entradas[clave] = (marca, reporte)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    # ----------------------------------------------------
+    # Invalidación
+    # ----------------------------------------------------
+    def invalidar_fechas(self, fechas: Iterable[str]) -> None:
+        """Quita los reportes cuyo rango [start_date, end_date] incluye alguna de las fechas."""
+        fechas = set(fechas)
+        with self._lock:
+            self.generacion += 1
+            for clave in list(self._entradas):
+                _, start_date, end_date, _ = clave
+                if any(start_date <= fecha <= end_date for fecha in fechas):
+                    del self._entradas[clave]
+                    self.invalidaciones += 1
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self.generacion += 1
+            self._entradas.clear()
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / consultas, 4) if consultas else 0.0,
+                "desactualizadas": self.desactualizadas,
+                "invalidaciones": self.invalidaciones,
+            }
+
+
+# Instancia única del proceso
+reportes_cache = ReportesCache()
+
+
+@suscribir_cambios_turnos
+def _invalidar_fechas(dias):
+    reportes_cache.invalidar_fechas(fecha for _, fecha in dias)
@@ -0,0 +1,51 @@
+"""
+Locks en proceso para serializar SOLO las reservas que pueden chocar.
+
+Lock striping: en lugar de un lock global (todo serializado) o un lock por
+médico-día (memoria sin límite), cada (matricula, fecha) se asigna a uno de N
+locks fijos por hash. Dos reservas del mismo médico-día comparten lock y se
+ejecutan de a una; reservas de médicos distintos caen (casi siempre) en locks
+distintos y siguen en paralelo.
+
+Protege el tramo "verificar disponibilidad → insertar → commit". Entre varios
+procesos, la última barrera es el índice único parcial de la DB
+(ux_turnos_medico_fecha_hora_activos).
+"""
+
+from contextlib import contextmanager
+from threading import Lock
+from typing import Iterable, Tuple
+
+DiaMedico = Tuple[str, str]  # (Medico_Matricula, "YYYY-MM-DD")
+
+
+class LockStriping:
+    def __init__(self, franjas: int = 256):
+        self.franjas = franjas
+        self._locks = [Lock() for _ in range(franjas)]
+
+    def indice(self, clave: DiaMedico) -> int:
+        matricula, fecha = clave
+        return hash((matricula, str(fecha))) % self.franjas
+
+    @contextmanager
+    def bloquear(self, claves: Iterable[DiaMedico]):
+        """
+        Toma los locks de todos los médico-días indicados. Se adquieren en orden
+        de índice (y sin repetir) para que dos operaciones sobre varios días
+        nunca queden esperándose mutuamente.
+        """
+        indices = sorted({self.indice(clave) for clave in claves})
+        tomados = []
+        try:
+            for i in indices:
+                self._locks[i].acquire()
+                tomados.append(i)
+            yield
+        finally:
+            for i in reversed(tomados):
+                self._locks[i].release()
+
+
+# Instancia única del proceso
+reserva_locks = LockStriping()
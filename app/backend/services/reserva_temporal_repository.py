@@ -0,0 +1,53 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_
+from app.backend.models.models import ReservaTemporal
+from typing import Iterable, List, Optional
+
+
+class ReservaTemporalRepository:
+    """Clase responsable de la interacción directa con la tabla Reservas_Temporales."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_token(self, token: str) -> Optional[ReservaTemporal]:
+        return self.db.query(ReservaTemporal).filter(ReservaTemporal.Token == token).first()
+
+    def get_activas_by_dias(self, dias: Iterable[tuple], ahora: float) -> List[ReservaTemporal]:
+        """Retenciones no vencidas de varios médico-días {(matricula, "YYYY-MM-DD")}."""
+        dias = set(dias)
+        if not dias:
+            return []
+        return (
+            self.db.query(ReservaTemporal)
+            .filter(
+                or_(
+                    *(
+                        and_(ReservaTemporal.Medico_Matricula == m, ReservaTemporal.Fecha == f)
+                        for m, f in dias
+                    )
+                ),
+                ReservaTemporal.Vence > ahora,
+            )
+            .all()
+        )
+
+    def create(self, reserva: ReservaTemporal) -> ReservaTemporal:
+        self.db.add(reserva)
+        self.db.commit()
+        self.db.refresh(reserva)
+        return reserva
+
+    def delete(self, reserva: ReservaTemporal) -> None:
+        self.db.delete(reserva)
+        self.db.commit()
+
+    def delete_vencidas(self, ahora: float, medico_matricula: str = None, fecha: str = None) -> int:
+        """Borra las retenciones vencidas (opcionalmente solo las de un médico-día). No hace commit."""
+        query = self.db.query(ReservaTemporal).filter(ReservaTemporal.Vence <= ahora)
+        if medico_matricula is not None:
+            query = query.filter(
+                ReservaTemporal.Medico_Matricula == medico_matricula,
+                ReservaTemporal.Fecha == fecha,
+            )
+        return query.delete(synchronize_session=False)
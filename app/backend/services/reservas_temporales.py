@@ -0,0 +1,124 @@
+"""
+Retenciones cortas (con TTL) de horarios durante el checkout.
+
+Entre que el paciente elige un slot de /agenda/disponible y envía POST /turnos/,
+el horario queda retenido a su nombre por unos minutos: otros usuarios ya no lo
+ven en la disponibilidad y no lo pueden reservar (TurnoService lo verifica y
+consume la retención al crear el turno).
+
+- La tabla Reservas_Temporales es la fuente de verdad entre procesos: se consulta
+  al crear retenciones y al reservar.
+- Este mapa en memoria es la vía rápida para ocultar slots retenidos en cada
+  consulta de disponibilidad sin tocar la DB. Cada proceso ve las retenciones
+  que creó él (y las que cargó de la DB al reservar); las vencidas se descartan solas.
+"""
+
+import time
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.backend.services.disponibilidad_engine import hora_a_minutos
+
+TTL_RESERVA_SEGUNDOS = 300  # 5 minutos para completar la reserva
+
+Retencion = Tuple[int, int, float]  # (minuto inicio, minuto fin, vence epoch)
+
+
+class ReservasTemporales:
+    """Mapa (matricula, fecha) -> {token: (inicio, fin, vence)} de retenciones vigentes."""
+
+    def __init__(self):
+        self._por_dia: Dict[tuple, Dict[str, Retencion]] = {}
+        self._dia_de: Dict[str, tuple] = {}
+        self._fechas_por_medico: Dict[str, Set[str]] = {}
+        self._lock = Lock()
+
+    # ----------------------------------------------------
+    # Escritura
+    # ----------------------------------------------------
+    def registrar(
+        self, token: str, matricula: str, fecha: str, inicio: int, fin: int, vence: float
+    ) -> None:
+        with self._lock:
+            self._por_dia.setdefault((matricula, fecha), {})[token] = (inicio, fin, vence)
+            self._dia_de[token] = (matricula, fecha)
+            self._fechas_por_medico.setdefault(matricula, set()).add(fecha)
+
+    def quitar(self, tokens: Iterable[str]) -> None:
+        with self._lock:
+            for token in tokens:
+                dia = self._dia_de.pop(token, None)
+                if dia is not None:
+                    self._quitar_de_dia(dia, token)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._por_dia.clear()
+            self._dia_de.clear()
+            self._fechas_por_medico.clear()
+
+    # ----------------------------------------------------
+    # Lectura
+    # ----------------------------------------------------
+    def activas(self, matricula: str, fecha: str, ahora: Optional[float] = None) -> List[tuple]:
+        """Retenciones vigentes del médico-día: [(inicio, fin, token)]. Purga las vencidas."""
+        ahora = time.time() if ahora is None else ahora
+        with self._lock:
+            del_dia = self._por_dia.get((matricula, fecha))
+            if not del_dia:
+                return []
+            vencidas = [token for token, (_, _, vence) in del_dia.items() if vence <= ahora]
+            for token in vencidas:
+                self._dia_de.pop(token, None)
+                self._quitar_de_dia((matricula, fecha), token)
+            return [(inicio, fin, token) for token, (inicio, fin, _) in del_dia.items()]
+
+    def contar(self, matricula: str) -> int:
+        """Cantidad de retenciones registradas del médico (puede incluir vencidas sin purgar)."""
+        with self._lock:
+            return sum(
+                len(self._por_dia.get((matricula, fecha), ()))
+                for fecha in self._fechas_por_medico.get(matricula, ())
+            )
+
+    def filtrar(self, matricula: str, slots: List[dict]) -> List[dict]:
+        """
+        Quita de `slots` (filas de disponibilidad de un médico) los que se solapan
+        con una retención vigente. Sin retenciones para el médico, devuelve la misma lista.
+        """
+        if matricula not in self._fechas_por_medico:
+            return slots
+        ahora = time.time()
+        retenidas: Dict[str, List[tuple]] = {}
+        resultado = []
+        for slot in slots:
+            fecha = slot["fecha"]
+            if fecha not in retenidas:
+                retenidas[fecha] = self.activas(matricula, fecha, ahora)
+            if retenidas[fecha]:
+                inicio = hora_a_minutos(slot["hora"])
+                fin = inicio + (slot["duracion"] or 0)
+                if any(inicio < r_fin and fin > r_inicio for r_inicio, r_fin, _ in retenidas[fecha]):
+                    continue
+            resultado.append(slot)
+        return resultado
+
+    # ----------------------------------------------------
+    # Helpers (se llaman con el lock tomado)
+    # ----------------------------------------------------
+    def _quitar_de_dia(self, dia: tuple, token: str) -> None:
+        del_dia = self._por_dia.get(dia)
+        if del_dia is None:
+            return
+        del_dia.pop(token, None)
+        if not del_dia:
+            del self._por_dia[dia]
+            fechas = self._fechas_por_medico.get(dia[0])
+            if fechas is not None:
+                fechas.discard(dia[1])
+                if not fechas:
+                    del self._fechas_por_medico[dia[0]]
+
+
+# Instancia única del proceso
+reservas_temporales = ReservasTemporales()
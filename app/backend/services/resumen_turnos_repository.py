@@ -0,0 +1,163 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, delete, func, insert, or_, select, union_all
+from app.backend.models.models import (
+    Especialidad,
+    ResumenTurnoDiario,
+    Turno,
+    TurnoArchivo,
+)
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+COLUMNAS_RESUMEN = [
+    "Medico_Matricula", "Fecha", "Especialidad_Id", "Sucursal_Id", "Estado_Id",
+    "Cantidad", "Minutos",
+]
+
+
+def select_resumen(filtro: Optional[Callable] = None):
+    """
+    SELECT agregado de Turnos ∪ Turnos_Archivo con las columnas de
+    COLUMNAS_RESUMEN. `filtro(tabla)` devuelve la condición que se aplica a
+    cada una de las dos tablas (así cada rama usa sus índices).
+    """
+    ramas = []
+    for tabla in (Turno.__table__, TurnoArchivo.__table__):
+        rama = select(
+            tabla.c.Medico_Matricula,
+            tabla.c.Fecha,
+            tabla.c.Especialidad_Id,
+            func.coalesce(tabla.c.Sucursal_Id, 0).label("Sucursal_Id"),
+            func.coalesce(tabla.c.Estado_Id, 0).label("Estado_Id"),
+            func.coalesce(tabla.c.Duracion, 0).label("Duracion"),
+        )
+        if filtro is not None:
+            rama = rama.where(filtro(tabla))
+        ramas.append(rama)
+    t = union_all(*ramas).subquery("turnos_resumen")
+    clave = (t.c.Medico_Matricula, t.c.Fecha, t.c.Especialidad_Id, t.c.Sucursal_Id, t.c.Estado_Id)
+    return select(
+        *clave,
+        func.count().label("Cantidad"),
+        func.sum(t.c.Duracion).label("Minutos"),
+    ).group_by(*clave)
+
+
+def filtro_dias(columna_medico, columna_fecha, dias: Iterable[tuple]):
+    """
+    Condición "médico-día en `dias`" como OR de (Medico = m AND Fecha IN (...)):
+    a diferencia de (Medico, Fecha) IN (VALUES ...), SQLite la resuelve con una
+    búsqueda por índice (médico, fecha) por cada médico.
+    """
+    por_medico: Dict[str, Set[str]] = {}
+    for matricula, fecha in dias:
+        por_medico.setdefault(matricula, set()).add(str(fecha))
+    return or_(*(
+        and_(columna_medico == matricula, columna_fecha.in_(sorted(fechas)))
+        for matricula, fechas in por_medico.items()
+    ))
+
+
+class ResumenTurnosRepository:
+    """Clase responsable del resumen diario de turnos (Resumen_Turnos_Diario)."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ----------------------------------------------------
+    # Mantenimiento (sin commit: van en la transacción de quien llama)
+    # ----------------------------------------------------
+    def refrescar_dias(self, dias: Iterable[tuple]) -> None:
+        """Recalcula el resumen de los médico-días (matricula, "YYYY-MM-DD") dados."""
+        dias = list(dias)
+        if not dias:
+            return
+        self.db.execute(
+            delete(ResumenTurnoDiario).where(
+                filtro_dias(ResumenTurnoDiario.Medico_Matricula, ResumenTurnoDiario.Fecha, dias)
+            )
+        )
+        self.db.execute(
+            insert(ResumenTurnoDiario).from_select(
+                COLUMNAS_RESUMEN,
+                select_resumen(
+                    lambda tabla: filtro_dias(tabla.c.Medico_Matricula, tabla.c.Fecha, dias)
+                ),
+            )
+        )
+
+    def reconstruir(self, desde: str, hasta: str) -> int:
+        """Rehace el resumen de las fechas [desde, hasta] y confirma. Devuelve las filas generadas."""
+        self.db.execute(
+            delete(ResumenTurnoDiario).where(
+                ResumenTurnoDiario.Fecha >= desde, ResumenTurnoDiario.Fecha <= hasta
+            )
+        )
+        resultado = self.db.execute(
+            insert(ResumenTurnoDiario).from_select(
+                COLUMNAS_RESUMEN,
+                select_resumen(lambda tabla: tabla.c.Fecha.between(desde, hasta)),
+            )
+        )
+        self.db.commit()
+        return resultado.rowcount
+
+    def get_rango_fechas(self) -> tuple:
+        """(fecha mínima, fecha máxima) de los turnos, contando el archivo."""
+        minimos, maximos = [], []
+        for tabla in (Turno, TurnoArchivo):
+            minimo, maximo = self.db.query(func.min(tabla.Fecha), func.max(tabla.Fecha)).one()
+            if minimo is not None:
+                minimos.append(minimo)
+                maximos.append(maximo)
+        return (min(minimos), max(maximos)) if minimos else (None, None)
+
+    # ----------------------------------------------------
+    # Verificación contra los datos crudos
+    # ----------------------------------------------------
+    def get_dias_inconsistentes(self, desde: str, hasta: str) -> List[tuple]:
+        """
+        Médico-días de [desde, hasta] en los que el resumen no coincide con
+        Turnos ∪ Turnos_Archivo (filas de más, de menos o con otros totales).
+        """
+        crudo = select_resumen(lambda tabla: tabla.c.Fecha.between(desde, hasta))
+        resumen = select(
+            *(ResumenTurnoDiario.__table__.c[nombre] for nombre in COLUMNAS_RESUMEN)
+        ).where(ResumenTurnoDiario.Fecha.between(desde, hasta))
+        dias = set()
+        for izquierda, derecha in ((crudo, resumen), (resumen, crudo)):
+            diferencia = izquierda.except_(derecha).subquery()
+            dias.update(
+                self.db.execute(
+                    select(diferencia.c.Medico_Matricula, diferencia.c.Fecha).distinct()
+                ).all()
+            )
+        return sorted((m, f) for m, f in dias)
+
+    # ----------------------------------------------------
+    # Consultas de reportes (por ix_resumen_turnos_fecha_estado)
+    # ----------------------------------------------------
+    def contar_por_especialidad(self, start_date: str, end_date: str) -> List[dict]:
+        query = (
+            self.db.query(
+                Especialidad.descripcion.label("Especialidad_Nombre"),
+                func.sum(ResumenTurnoDiario.Cantidad).label("Total_Turnos"),
+            )
+            .join(Especialidad, Especialidad.Id_especialidad == ResumenTurnoDiario.Especialidad_Id)
+            .filter(ResumenTurnoDiario.Fecha.between(start_date, end_date))
+            .group_by(Especialidad.descripcion)
+        )
+        return [row._asdict() for row in query.all()]
+
+    def contar_por_estado(
+        self, start_date: str, end_date: str, estado_ids: List[int]
+    ) -> List[tuple]:
+        """[(Estado_Id, total)] de los estados dados en el período."""
+        query = (
+            self.db.query(ResumenTurnoDiario.Estado_Id, func.sum(ResumenTurnoDiario.Cantidad))
+            .filter(
+                ResumenTurnoDiario.Fecha.between(start_date, end_date),
+                ResumenTurnoDiario.Estado_Id.in_(estado_ids),
+            )
+            .group_by(ResumenTurnoDiario.Estado_Id)
+        )
+        return [tuple(fila) for fila in query.all()]
@@ -0,0 +1,129 @@
+"""
+Resumen diario de turnos (Resumen_Turnos_Diario): carga masiva y verificación.
+
+TurnoRepository mantiene el resumen en cada cambio (recalcula los médico-días
+afectados en la misma transacción), y los reportes por especialidad y de
+asistencia leen de él: un reporte anual cuesta lo mismo que uno diario. Este
+service agrega:
+- backfill: reconstruye el resumen de un período por tramos de días;
+- verificar: compara el resumen con Turnos ∪ Turnos_Archivo y, si se pide,
+  recalcula los médico-días que no coinciden (cambios que no pasaron por
+  TurnoRepository, como ediciones manuales de la base).
+
+Uso (desde la raíz del proyecto):
+    python -m app.backend.services.resumen_turnos_service              # verifica
+    python -m app.backend.services.resumen_turnos_service --reparar    # verifica y corrige
+    python -m app.backend.services.resumen_turnos_service --backfill   # reconstruye todo
+"""
+
+import sys
+import time
+from datetime import date, timedelta
+from typing import Optional
+
+from app.backend.services.resumen_turnos_repository import ResumenTurnosRepository
+from app.backend.services.exceptions import ValueError
+
+DIAS_POR_TRAMO_BACKFILL = 31
+
+
+class ResumenTurnosService:
+    def __init__(
+        self,
+        resumen_repo: ResumenTurnosRepository,
+        dias_por_tramo: int = DIAS_POR_TRAMO_BACKFILL,
+    ):
+        self.resumen_repo = resumen_repo
+        self.dias_por_tramo = dias_por_tramo
+
+    def backfill(self, desde: Optional[str] = None, hasta: Optional[str] = None) -> dict:
+        """
+        Reconstruye el resumen de [desde, hasta] ("YYYY-MM-DD"; por defecto, todo
+        el rango con turnos). Cada tramo se confirma por separado.
+
+        Devuelve el informe: {"desde", "hasta", "filas", "tramos", "segundos"}.
+        """
+        desde, hasta = self._rango(desde, hasta)
+        inicio = time.perf_counter()
+        filas, tramos = 0, 0
+        if desde is not None:
+            tramo = date.fromisoformat(desde)
+            fin = date.fromisoformat(hasta)
+            while tramo <= fin:
+                fin_tramo = min(tramo + timedelta(days=self.dias_por_tramo - 1), fin)
+                filas += self.resumen_repo.reconstruir(tramo.isoformat(), fin_tramo.isoformat())
+                tramos += 1
+                tramo = fin_tramo + timedelta(days=1)
+        return {
+            "desde": desde,
+            "hasta": hasta,
+            "filas": filas,
+            "tramos": tramos,
+            "segundos": round(time.perf_counter() - inicio, 3),
+        }
+
+    def verificar(
+        self, desde: Optional[str] = None, hasta: Optional[str] = None, reparar: bool = False
+    ) -> dict:
+        """
+        Compara el resumen con los datos crudos en [desde, hasta].
+
+        Devuelve el informe: {"desde", "hasta", "inconsistentes": [(matricula, fecha)],
+        "reparados", "segundos"}.
+        """
+        desde, hasta = self._rango(desde, hasta)
+        inicio = time.perf_counter()
+        dias = []
+        if desde is not None:
+            dias = self.resumen_repo.get_dias_inconsistentes(desde, hasta)
+        if reparar and dias:
+            self.resumen_repo.refrescar_dias(dias)
+            self.resumen_repo.db.commit()
+        return {
+            "desde": desde,
+            "hasta": hasta,
+            "inconsistentes": dias,
+            "reparados": len(dias) if reparar else 0,
+            "segundos": round(time.perf_counter() - inicio, 3),
+        }
+
+    # ----------------------------------------------------
+    # Helpers
+    # ----------------------------------------------------
+    def _rango(self, desde: Optional[str], hasta: Optional[str]) -> tuple:
+        """Completa el rango con las fechas extremas de los turnos (o (None, None) si no hay)."""
+        if desde is None or hasta is None:
+            minimo, maximo = self.resumen_repo.get_rango_fechas()
+            desde = desde or minimo
+            hasta = hasta or maximo
+        if desde is not None and hasta is not None and desde > hasta:
+            raise ValueError("La fecha desde no puede ser posterior a la fecha hasta.")
+        return desde, hasta
+
+
+if __name__ == "__main__":
+    from app.backend.db.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        service = ResumenTurnosService(ResumenTurnosRepository(db))
+        if "--backfill" in sys.argv:
+            informe = service.backfill()
+            print(
+                f"✔ Resumen diario reconstruido ({informe['desde']} a {informe['hasta']}): "
+                f"{informe['filas']} filas en {informe['tramos']} tramos, {informe['segundos']}s."
+            )
+            sys.exit(0)
+
+        informe = service.verificar(reparar="--reparar" in sys.argv)
+        for matricula, fecha in informe["inconsistentes"]:
+            print(f"❌ Resumen inconsistente → {matricula} {fecha}")
+        if informe["inconsistentes"] and not informe["reparados"]:
+            sys.exit(1)
+        print(
+            f"✔ Resumen diario verificado ({informe['desde']} a {informe['hasta']}): "
+            f"{len(informe['inconsistentes'])} médico-días inconsistentes, "
+            f"{informe['reparados']} reparados, {informe['segundos']}s."
+        )
+    finally:
+        db.close()
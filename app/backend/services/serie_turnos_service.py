@@ -0,0 +1,156 @@
+from app.backend.services.agenda_service import AgendaService
+from app.backend.services.turno_service import TurnoService
+from app.backend.services.exceptions import RecursoNoEncontradoError, ValueError
+from app.backend.schemas.turno import TurnoCreate, TurnoSerieCreate
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+import heapq
+
+VENTANA_ALTERNATIVAS_DIAS = 7  # Se buscan alternativas hasta una semana antes/después
+
+
+class SerieTurnosService:
+    """
+    Turnos recurrentes ("todos los martes a las 10:00 durante 12 semanas") como una
+    sola operación: expande la serie, la verifica contra UNA consulta de
+    disponibilidad de todo el rango y la persiste de forma atómica.
+    """
+
+    def __init__(self, agenda_service: AgendaService, turno_service: TurnoService):
+        self.agenda_service = agenda_service
+        self.turno_service = turno_service
+
+    # ----------------------------------------------------
+    # Expansión
+    # ----------------------------------------------------
+    @staticmethod
+    def expandir(data: TurnoSerieCreate) -> List[date]:
+        """
+        Fechas de la serie, ascendentes. Las semanas se cuentan desde la de la
+        primera ocurrencia (>= Fecha_inicio).
+        """
+        dias = set(data.dias_semana)
+        primera = next(
+            data.fecha_inicio + timedelta(days=d)
+            for d in range(7)
+            if (data.fecha_inicio + timedelta(days=d)).isoweekday() in dias
+        )
+        lunes = primera - timedelta(days=primera.isoweekday() - 1)
+        fechas = []
+        for semana in range(0, data.semanas, data.intervalo_semanas):
+            for dia in sorted(dias):
+                fecha = lunes + timedelta(weeks=semana, days=dia - 1)
+                if fecha >= data.fecha_inicio:
+                    fechas.append(fecha)
+        return fechas
+
+    # ----------------------------------------------------
+    # Registro
+    # ----------------------------------------------------
+    def registrar_serie(self, data: TurnoSerieCreate) -> dict:
+        """
+        Devuelve {"creada", "ocurrencias"}: por cada fecha, si está disponible, el
+        turno creado o el motivo del rechazo y las alternativas más cercanas.
+        La serie se crea completa o no se crea.
+        """
+        fechas = self.expandir(data)
+        if not fechas:
+            raise ValueError("La serie no genera ninguna fecha.")
+        if not self.turno_service.medico_repo.get_by_matricula(data.medico_matricula):
+            raise RecursoNoEncontradoError(f"Médico {data.medico_matricula} no existe.")
+
+        # 1. Disponibilidad de todo el rango (más la ventana de alternativas) de una vez
+        ventana = timedelta(days=VENTANA_ALTERNATIVAS_DIAS)
+        libres = [
+            slot
+            for slot in self.agenda_service.obtener_turnos_disponibles(
+                data.medico_matricula, fechas[0] - ventana, fechas[-1] + ventana
+            )
+            if self._es_compatible(slot, data)
+        ]
+        por_clave: Dict[tuple, dict] = {(s["fecha"], s["hora"]): s for s in libres}
+
+        ocurrencias = []
+        tomados = set()
+        for fecha in fechas:
+            slot = por_clave.get((fecha.strftime("%Y-%m-%d"), data.hora))
+            ocurrencias.append({
+                "fecha": fecha.strftime("%Y-%m-%d"),
+                "hora": data.hora,
+                "disponible": slot is not None,
+                "turno": None,
+                "motivo": None if slot else "El médico no tiene un turno libre en esa fecha y hora.",
+                "alternativas": [],
+                "_slot": slot,
+            })
+            if slot:
+                tomados.add((slot["fecha"], slot["hora"]))
+
+        # 2. Conflictos: se ofrecen los slots libres más cercanos (sin repetir los de la serie)
+        conflictos = [o for o in ocurrencias if not o["disponible"]]
+        for ocurrencia in conflictos:
+            ocurrencia["alternativas"] = self._alternativas(
+                ocurrencia, libres, tomados, data.alternativas
+            )
+
+        # 3. Persistencia atómica (revalida bajo los locks de reserva, en una transacción)
+        if not conflictos:
+            items = [
+                TurnoCreate(
+                    Fecha=o["fecha"],
+                    Hora=o["hora"],
+                    Paciente_nroPaciente=data.paciente_nroPaciente,
+                    Medico_Matricula=data.medico_matricula,
+                    Especialidad_Id=data.especialidad_id,
+                    Sucursal_Id=data.sucursal_id,
+                    Duracion=data.duracion or o["_slot"]["duracion"],
+                    Motivo=data.motivo,
+                )
+                for o in ocurrencias
+            ]
+            resultados = self.turno_service.registrar_turnos_lote(items, atomico=True)
+            for ocurrencia, resultado in zip(ocurrencias, resultados):
+                ocurrencia["turno"] = resultado["turno"]
+                if not resultado["creado"]:
+                    ocurrencia["disponible"] = False
+                    ocurrencia["motivo"] = resultado["error"]
+
+        for ocurrencia in ocurrencias:
+            del ocurrencia["_slot"]
+        return {
+            "creada": all(o["turno"] is not None for o in ocurrencias),
+            "ocurrencias": ocurrencias,
+        }
+
+    # ----------------------------------------------------
+    # Helpers
+    # ----------------------------------------------------
+    @staticmethod
+    def _es_compatible(slot: dict, data: TurnoSerieCreate) -> bool:
+        if slot["especialidad_id"] != data.especialidad_id:
+            return False
+        if data.sucursal_id is not None and slot["sucursal_id"] not in (None, data.sucursal_id):
+            return False
+        return True
+
+    @staticmethod
+    def _alternativas(
+        ocurrencia: dict, libres: List[dict], tomados: set, cantidad: int
+    ) -> List[dict]:
+        """Los `cantidad` slots libres más cercanos en el tiempo a la ocurrencia."""
+        if cantidad <= 0:
+            return []
+        objetivo = datetime.strptime(
+            f"{ocurrencia['fecha']} {ocurrencia['hora']}", "%Y-%m-%d %H:%M"
+        )
+
+        def distancia(slot: dict) -> tuple:
+            momento = datetime.strptime(f"{slot['fecha']} {slot['hora']}", "%Y-%m-%d %H:%M")
+            # Ante igual distancia se prefiere el posterior
+            return (abs(momento - objetivo), momento < objetivo)
+
+        hoy = date.today().strftime("%Y-%m-%d")
+        candidatos = (
+            s for s in libres if s["fecha"] >= hoy and (s["fecha"], s["hora"]) not in tomados
+        )
+        return heapq.nsmallest(cantidad, candidatos, key=distancia)
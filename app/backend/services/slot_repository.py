@@ -0,0 +1,253 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from app.backend.models.models import Slot, SlotHorizonte, Medico
+from app.backend.services.disponibilidad_engine import MotorDisponibilidad
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional
+
+HORIZONTE_DIAS = 90  # Días hacia adelante que se mantienen materializados
+
+
+class SlotRepository:
+    """
+    Clase responsable del calendario materializado de slots (tabla Slots).
+    Los métodos de sincronización NO hacen commit: se ejecutan dentro de la
+    misma transacción que la operación que modificó agendas o turnos.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ==================================================================
+    # Lectura
+    # ==================================================================
+    def get_horizonte(self, medico_matricula: str) -> SlotHorizonte | None:
+        return (
+            self.db.query(SlotHorizonte)
+            .filter(SlotHorizonte.Medico_Matricula == medico_matricula)
+            .first()
+        )
+
+    def cubre(self, medico_matricula: str, fecha_inicio: date, fecha_fin: date) -> bool:
+        """Indica si el rango pedido está completamente materializado."""
+        horizonte = self.get_horizonte(medico_matricula)
+        return bool(
+            horizonte
+            and horizonte.Fecha_desde <= fecha_inicio.strftime("%Y-%m-%d")
+            and horizonte.Fecha_hasta >= fecha_fin.strftime("%Y-%m-%d")
+        )
+
+    def get_libres(
+        self,
+        medico_matricula: str,
+        fecha_inicio: date,
+        fecha_fin: date,
+        especialidad_id: Optional[int] = None,
+        sucursal_id: Optional[int] = None,
+        limite: Optional[int] = None,
+        por_hora: bool = False,
+    ) -> List[dict]:
+        """
+        Slots libres del rango: un único range scan sobre el índice (médico, fecha, hora).
+
+        Por defecto salen en el mismo orden que MotorDisponibilidad.calcular: por
+        fecha y, dentro del día, por Id. _materializar inserta cada día en el orden
+        del motor (regulares antes que excepcionales), así /agenda/disponible no
+        cambia según el rango caiga o no dentro del horizonte. Con por_hora=True
+        el orden es (fecha, hora), el que necesita el merge de buscar_primeros_disponibles.
+        """
+        query = (
+            self.db.query(
+                Slot.Fecha,
+                Slot.Hora,
+                Slot.Medico_Matricula,
+                Slot.Especialidad_Id,
+                Slot.Duracion,
+                Slot.Sucursal_Id,
+            )
+            .filter(
+                Slot.Medico_Matricula == medico_matricula,
+                Slot.Fecha >= fecha_inicio.strftime("%Y-%m-%d"),
+                Slot.Fecha <= fecha_fin.strftime("%Y-%m-%d"),
+                Slot.Ocupado == 0,
+            )
+        )
+        query = (
+            query.order_by(Slot.Fecha, Slot.Hora, Slot.Id)
+            if por_hora
+            else query.order_by(Slot.Fecha, Slot.Id)
+        )
+        if especialidad_id is not None:
+            query = query.filter(Slot.Especialidad_Id == especialidad_id)
+        if sucursal_id is not None:
+            query = query.filter(Slot.Sucursal_Id == sucursal_id)
+        if limite is not None:
+            query = query.limit(limite)
+
+        filas = query.all()
+        return [
+            {
+                "fecha": f.Fecha,
+                "hora": f.Hora,
+                "medico_matricula": f.Medico_Matricula,
+                "especialidad_id": f.Especialidad_Id,
+                "duracion": f.Duracion,
+                "sucursal_id": f.Sucursal_Id,
+            }
+            for f in filas
+        ]
+
+    # ==================================================================
+    # Mantenimiento incremental
+    # ==================================================================
+    def _materializar(
+        self,
+        medico_matricula: str,
+        fecha_inicio: date,
+        fecha_fin: date,
+        dia_de_semana: Optional[int] = None,
+    ) -> int:
+        """Recalcula los slots del rango (opcionalmente solo un día de la semana)."""
+        # Import acá adentro → evita circular import (AgendaRepository usa este repo)
+        from app.backend.services.agenda_repository import AgendaRepository
+
+        if fecha_inicio > fecha_fin:
+            return 0
+
+        agenda_repo = AgendaRepository(self.db)
+        motor = MotorDisponibilidad(
+            medico_matricula,
+            agenda_repo.get_agendas_regulares_by_medico(medico_matricula),
+            agenda_repo.get_agendas_excepcionales_by_rango(
+                medico_matricula, fecha_inicio, fecha_fin
+            ),
+            agenda_repo.get_turnos_by_rango(medico_matricula, fecha_inicio, fecha_fin),
+        )
+
+        filas = []
+        fechas = []
+        dia = fecha_inicio
+        for slots in motor.iterar_calendario(fecha_inicio, fecha_fin):
+            if dia_de_semana is None or dia.isoweekday() == dia_de_semana:
+                fechas.append(dia.strftime("%Y-%m-%d"))
+                filas.extend(
+                    {
+                        "Medico_Matricula": medico_matricula,
+                        "Fecha": s["fecha"],
+                        "Hora": s["hora"],
+                        "Especialidad_Id": s["especialidad_id"],
+                        "Sucursal_Id": s["sucursal_id"],
+                        "Duracion": s["duracion"],
+                        "Ocupado": 1 if s["ocupado"] else 0,
+                    }
+                    for s in slots
+                )
+            dia += timedelta(days=1)
+
+        query = self.db.query(Slot).filter(Slot.Medico_Matricula == medico_matricula)
+        if dia_de_semana is None:
+            query = query.filter(
+                Slot.Fecha >= fecha_inicio.strftime("%Y-%m-%d"),
+                Slot.Fecha <= fecha_fin.strftime("%Y-%m-%d"),
+            )
+        else:
+            query = query.filter(Slot.Fecha.in_(fechas))
+        query.delete(synchronize_session=False)
+
+        if filas:
+            self.db.execute(insert(Slot), filas)
+        return len(filas)
+
+    def refrescar(
+        self,
+        medico_matricula: str,
+        fecha_inicio: date,
+        fecha_fin: date,
+        dia_de_semana: Optional[int] = None,
+    ) -> None:
+        """Recalcula la parte del rango que cae dentro del horizonte del médico."""
+        horizonte = self.get_horizonte(medico_matricula)
+        if not horizonte:
+            return
+
+        desde = max(fecha_inicio, _a_fecha(horizonte.Fecha_desde))
+        hasta = min(fecha_fin, _a_fecha(horizonte.Fecha_hasta))
+        self._materializar(medico_matricula, desde, hasta, dia_de_semana)
+
+    def refrescar_dias(self, claves: Iterable[tuple]) -> None:
+        """Recalcula los días afectados por cambios de turnos: [(matricula, "YYYY-MM-DD")]."""
+        for medico_matricula, fecha in claves:
+            if not medico_matricula or not fecha:
+                continue
+            dia = _a_fecha(fecha)
+            self.refrescar(medico_matricula, dia, dia)
+
+    def asegurar_horizonte(
+        self, medico_matricula: str, hoy: Optional[date] = None
+    ) -> SlotHorizonte:
+        """
+        Extiende (o crea) el horizonte rodante del médico hasta hoy + HORIZONTE_DIAS,
+        materializando solo los días nuevos y descartando los ya vencidos.
+        """
+        hoy = hoy or date.today()
+        hasta = hoy + timedelta(days=HORIZONTE_DIAS)
+        horizonte = self.get_horizonte(medico_matricula)
+
+        if not horizonte:
+            self._materializar(medico_matricula, hoy, hasta)
+            horizonte = SlotHorizonte(
+                Medico_Matricula=medico_matricula,
+                Fecha_desde=hoy.strftime("%Y-%m-%d"),
+                Fecha_hasta=hasta.strftime("%Y-%m-%d"),
+            )
+            self.db.add(horizonte)
+            self.db.flush()
+            return horizonte
+
+        hasta_actual = _a_fecha(horizonte.Fecha_hasta)
+        if hasta_actual < hasta:
+            desde_nuevo = max(hasta_actual + timedelta(days=1), hoy)
+            self._materializar(medico_matricula, desde_nuevo, hasta)
+            horizonte.Fecha_hasta = hasta.strftime("%Y-%m-%d")
+
+        if horizonte.Fecha_desde < hoy.strftime("%Y-%m-%d"):
+            self.db.query(Slot).filter(
+                Slot.Medico_Matricula == medico_matricula,
+                Slot.Fecha < hoy.strftime("%Y-%m-%d"),
+            ).delete(synchronize_session=False)
+            horizonte.Fecha_desde = hoy.strftime("%Y-%m-%d")
+            if horizonte.Fecha_hasta < horizonte.Fecha_desde:
+                horizonte.Fecha_hasta = horizonte.Fecha_desde
+
+        return horizonte
+
+    def extender_todos(self, hoy: Optional[date] = None) -> int:
+        """Corre el horizonte de todos los médicos un día más (job diario)."""
+        hoy = hoy or date.today()
+        matriculas = [m for (m,) in self.db.query(Medico.Matricula).all()]
+        for matricula in matriculas:
+            self.asegurar_horizonte(matricula, hoy)
+
+        self.db.commit()
+        return len(matriculas)
+
+    def reconstruir_todos(self, hoy: Optional[date] = None) -> int:
+        """
+        Rematerializa el horizonte completo de todos los médicos (mantenimiento:
+        python -m app.backend.db.init_slots --reconstruir). Repara cualquier cambio
+        hecho por fuera de los repositorios (ej. seed_data.py).
+        """
+        hoy = hoy or date.today()
+        self.db.query(SlotHorizonte).delete(synchronize_session=False)
+        self.db.query(Slot).delete(synchronize_session=False)
+
+        matriculas = [m for (m,) in self.db.query(Medico.Matricula).all()]
+        for matricula in matriculas:
+            self.asegurar_horizonte(matricula, hoy)
+
+        self.db.commit()
+        return len(matriculas)
+
+
+def _a_fecha(valor: str) -> date:
+    return datetime.strptime(valor, "%Y-%m-%d").date()
@@ -0,0 +1,133 @@
+"""
+Caché en memoria del tablero de recepción por (sucursal_id, "YYYY-MM-DD").
+
+Guarda el JSON ya serializado de GET /sucursales/{id}/tablero: un acierto no
+toca la base ni vuelve a validar/serializar filas. Se invalida a partir de los
+eventos de eventos.py:
+- cambios de turnos → los tableros de los días afectados (de todas las
+  sucursales, porque el evento trae médico-día y un turno puede cambiar de sucursal);
+- cambios de agenda → todo (el consultorio sale de la agenda excepcional).
+
+Los cambios hechos por otros procesos (scheduler, otros workers) y las
+ediciones de nombres de pacientes/médicos no publican eventos aquí: el TTL
+corto acota cuánto puede quedar desactualizado un tablero.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, Optional, Set
+
+from app.backend.services.eventos import (
+    suscribir_cambios_agenda,
+    suscribir_cambios_turnos,
+)
+
+
+class TableroCache:
+    """Caché LRU con TTL del tablero serializado por (sucursal_id, "YYYY-MM-DD")."""
+
+    def __init__(self, max_entradas: int = 500, ttl_segundos: float = 60):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._entradas: "OrderedDict[tuple, tuple]" = OrderedDict()  # clave -> (vence, json)
+        self._por_fecha: Dict[str, Set[int]] = {}
+        self._lock = Lock()
+        # Igual que DisponibilidadCache: un tablero armado antes de una
+        # invalidación concurrente no se guarda.
+        self.generacion = 0
+
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+        self.vencidas = 0
+        self.invalidaciones = 0
+
+    # ----------------------------------------------------
+    # Lectura / escritura
+    # ----------------------------------------------------
+    def obtener(self, clave: tuple) -> Optional[bytes]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return None
+            vence, contenido = entrada
+            if vence < time.monotonic():
+                self._quitar(clave)
+                self.vencidas += 1
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            return contenido
+
+    def guardar(self, clave: tuple, contenido: bytes, generacion: int) -> None:
+        with self._lock:
+            if generacion != self.generacion:
+                return
+            self._entradas[clave] = (time.monotonic() + self.ttl_segundos, contenido)
+            self._entradas.move_to_end(clave)
+            self._por_fecha.setdefault(clave[1], set()).add(clave[0])
+            while len(self._entradas) > self.max_entradas:
+                vieja, _ = self._entradas.popitem(last=False)
+                self._desindexar(vieja)
+
+    # ----------------------------------------------------
+    # Invalidación
+    # ----------------------------------------------------
+    def invalidar_fechas(self, fechas: Iterable[str]) -> None:
+        with self._lock:
+            self.generacion += 1
+            for fecha in set(fechas):
+                for sucursal_id in list(self._por_fecha.get(fecha, ())):
+                    self._quitar((sucursal_id, fecha))
+                    self.invalidaciones += 1
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self.generacion += 1
+            self._entradas.clear()
+            self._por_fecha.clear()
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl_segundos,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / consultas, 4) if consultas else 0.0,
+                "vencidas": self.vencidas,
+                "invalidaciones": self.invalidaciones,
+            }
+
+    # ----------------------------------------------------
+    # Helpers (se llaman con el lock tomado)
+    # ----------------------------------------------------
+    def _quitar(self, clave: tuple) -> None:
+        self._entradas.pop(clave, None)
+        self._desindexar(clave)
+
+    def _desindexar(self, clave: tuple) -> None:
+        sucursales = self._por_fecha.get(clave[1])
+        if sucursales is not None:
+            sucursales.discard(clave[0])
+            if not sucursales:
+                del self._por_fecha[clave[1]]
+
+
+# Instancia única del proceso
+tablero_cache = TableroCache()
+
+
+@suscribir_cambios_turnos
+def _invalidar_fechas(dias):
+    tablero_cache.invalidar_fechas(fecha for _, fecha in dias)
+
+
+@suscribir_cambios_agenda
+def _invalidar_todo(medico_matricula):
+    tablero_cache.limpiar()
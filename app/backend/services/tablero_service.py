@@ -0,0 +1,40 @@
+"""
+Tablero de recepción: los turnos del día de una sucursal, con paciente, médico,
+especialidad, consultorio y estado, para la pantalla que la recepción refresca
+todo el día.
+
+El tablero se arma con una sola consulta (TurnoRepository.get_tablero_sucursal)
+y se guarda serializado en tablero_cache: los refrescos siguientes lo sirven
+desde memoria hasta que un cambio de turnos de ese día lo invalida.
+"""
+
+import time
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.backend.schemas.tablero import TableroOut
+from app.backend.services import sucursal_service
+from app.backend.services.tablero_cache import tablero_cache
+from app.backend.services.turno_repository import TurnoRepository
+
+
+def obtener_tablero_json(db: Session, sucursal_id: int, fecha: date) -> bytes:
+    """JSON (TableroOut) del tablero; 404 si la sucursal no existe."""
+    clave = (sucursal_id, fecha.isoformat())
+    contenido = tablero_cache.obtener(clave)
+    if contenido is not None:
+        return contenido
+
+    # La existencia de la sucursal solo se verifica al armar (un acierto ya la implica)
+    sucursal_service.get_sucursal_by_id(db, sucursal_id)
+    generacion = tablero_cache.generacion
+    turnos = TurnoRepository(db).get_tablero_sucursal(sucursal_id, clave[1])
+    contenido = TableroOut(
+        sucursal_id=sucursal_id,
+        fecha=clave[1],
+        turnos=turnos,
+        generado=time.time(),
+    ).model_dump_json(by_alias=True).encode()
+    tablero_cache.guardar(clave, contenido, generacion)
+    return contenido
@@ -1,11 +1,43 @@
 from __future__ import annotations
+import heapq
+from itertools import islice
+from time import time as epoch_actual
 from datetime import date, time
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_
+from sqlalchemy import (
+    func,
+    inspect,
+    tuple_,
+    update,
+    delete,
+    select,
+    insert,
+    literal,
+    literal_column,
+    union_all,
+)
 from sqlalchemy.exc import IntegrityError
-from app.backend.models.models import Turno, Medico, Paciente, Estado, Especialidad
-from typing import List, Optional, Dict, Any
-from app.backend.services.exceptions import HorarioNoDisponibleError
+from app.backend.models.models import (
+    Turno,
+    Medico,
+    Paciente,
+    Estado,
+    Especialidad,
+    EventoTurno,
+    AgendaExcepcional,
+    TurnoArchivo,
+    COLUMNAS_TURNO_ARCHIVO,
+)
+from typing import List, Optional, Dict, Any, Tuple
+from app.backend.services.exceptions import HorarioNoDisponibleError, TransicionInvalidaError
+from app.backend.services.slot_repository import SlotRepository
+from app.backend.services.resumen_turnos_repository import ResumenTurnosRepository
+from app.backend.services.eventos import publicar_cambios_turnos
+from app.backend.services.catalogos import (
+    estado_descripcion,
+    estado_id,
+    estado_ids as estado_ids_de,
+)
 
 
 class TurnoRepository:
@@ -14,18 +46,66 @@ class TurnoRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def _query_out(self):
+        """
+        Query de Turno con lo que lee TurnoOut cargado en la misma consulta
+        (médico y especialidad por JOIN; el estado sale del catálogo en memoria),
+        para que serializar una lista no dispare un SELECT por fila.
+        """
+        return self.db.query(Turno).options(
+            joinedload(Turno.medico), joinedload(Turno.especialidad)
+        )
+
+    def _query_archivo_out(self):
+        """Igual que _query_out, sobre Turnos_Archivo (turnos cerrados ya archivados)."""
+        return self.db.query(TurnoArchivo).options(
+            joinedload(TurnoArchivo.medico), joinedload(TurnoArchivo.especialidad)
+        )
+
     def get_by_medico_matricula(self, matricula: str) -> List[Turno]:
-        """Obtiene todos los turnos asociados a un médico específico por su matrícula."""
-        return self.db.query(Turno).filter(Turno.Medico_Matricula == matricula).all()
+        """
+        Obtiene todos los turnos asociados a un médico específico por su matrícula,
+        incluidos los archivados (primero el archivo, que guarda los más viejos).
+        """
+        return (
+            self._query_archivo_out().filter(TurnoArchivo.Medico_Matricula == matricula).all()
+            + self._query_out().filter(Turno.Medico_Matricula == matricula).all()
+        )
 
     def get_by_paciente_nro(self, nro_paciente: int) -> List[Turno]:
-        """Obtiene todos los turnos asociados a un paciente específico por su número de paciente."""
+        """
+        Obtiene todos los turnos asociados a un paciente específico por su número
+        de paciente, incluidos los archivados.
+        """
         return (
-            self.db.query(Turno)
+            self._query_archivo_out()
+            .filter(TurnoArchivo.Paciente_nroPaciente == nro_paciente)
+            .all()
+            + self._query_out()
             .filter(Turno.Paciente_nroPaciente == nro_paciente)
             .all()
         )
 
+    def get_by_pk_con_archivo(
+        self, fecha: str, hora: str, paciente_nro: int
+    ) -> Optional[Turno]:
+        """
+        Como get_by_pk, pero si el turno ya no está en Turnos lo busca en el
+        archivo. Solo para lecturas: los turnos archivados no se modifican.
+        """
+        turno = self.get_by_pk(fecha, hora, paciente_nro)
+        if turno is None:
+            turno = (
+                self.db.query(TurnoArchivo)
+                .filter(
+                    TurnoArchivo.Fecha == fecha,
+                    TurnoArchivo.Hora == hora,
+                    TurnoArchivo.Paciente_nroPaciente == paciente_nro,
+                )
+                .first()
+            )
+        return turno
+
     def get_by_pk(
         self, fecha: str, hora: str, paciente_nro: int
     ) -> Optional[Turno]:  # Corregido: Turno | None
@@ -41,43 +121,311 @@ class TurnoRepository:
             .first()
         )
 
-    def create(self, turno_data: Turno) -> Turno:
-        """Persiste un nuevo objeto Turno en la DB."""
-        self.db.add(turno_data)
+    def get_by_pks(self, pks: List[tuple]) -> List[Turno]:
+        """
+        Turnos de varias PK (Fecha, Hora, Paciente_nroPaciente) en una consulta,
+        devueltos en el mismo orden que las PK (las inexistentes se omiten).
+        """
+        if not pks:
+            return []
+        claves = [(str(f), h, p) for f, h, p in pks]
+        turnos = (
+            self._query_out()
+            .filter(tuple_(Turno.Fecha, Turno.Hora, Turno.Paciente_nroPaciente).in_(claves))
+            .all()
+        )
+        por_pk = {(t.Fecha, t.Hora, t.Paciente_nroPaciente): t for t in turnos}
+        return [por_pk[clave] for clave in claves if clave in por_pk]
+
+    # =========================================================================
+    # SINCRONIZACIÓN DE DATOS DERIVADOS (misma transacción que el cambio)
+    # =========================================================================
 
+    def _dias_afectados(self, turno: Turno) -> set:
+        """
+        Devuelve los pares (matricula, fecha) afectados por un cambio pendiente
+        del turno, incluyendo los valores anteriores si se modificó médico o fecha.
+        """
+        estado = inspect(turno)
+        matriculas = {turno.Medico_Matricula}
+        fechas = {turno.Fecha}
+        matriculas.update(estado.attrs.Medico_Matricula.history.deleted or ())
+        fechas.update(estado.attrs.Fecha.history.deleted or ())
+        return {(m, str(f)) for m in matriculas for f in fechas if m and f}
+
+    def _sincronizar(self, dias: set) -> None:
+        """Actualiza el calendario materializado (Slots) y el resumen diario de los días afectados."""
+        SlotRepository(self.db).refrescar_dias(dias)
+        ResumenTurnosRepository(self.db).refrescar_dias(dias)
+
+    # =========================================================================
+    # OUTBOX DE EVENTOS (misma transacción que el cambio, ver EventoTurno)
+    # =========================================================================
+
+    def _evento(self, tipo: str, turno: Turno, anterior: Optional[tuple] = None) -> None:
+        """Agrega al outbox el evento de un turno; se confirma junto con el cambio."""
+        self.db.add(
+            EventoTurno(
+                Tipo=tipo,
+                Fecha=str(turno.Fecha),
+                Hora=turno.Hora,
+                Paciente_nroPaciente=turno.Paciente_nroPaciente,
+                Medico_Matricula=turno.Medico_Matricula,
+                Sucursal_Id=turno.Sucursal_Id,
+                Estado_Id=turno.Estado_Id,
+                Fecha_Anterior=str(anterior[0]) if anterior else None,
+                Hora_Anterior=anterior[1] if anterior else None,
+                Creado=epoch_actual(),
+            )
+        )
+
+    def _eventos_estado(self, *condiciones) -> None:
+        """Eventos 'estado' de los turnos que cumplen `condiciones`, con un INSERT ... SELECT."""
+        self.db.execute(
+            insert(EventoTurno).from_select(
+                [
+                    "Tipo", "Fecha", "Hora", "Paciente_nroPaciente", "Medico_Matricula",
+                    "Sucursal_Id", "Estado_Id", "Creado",
+                ],
+                select(
+                    literal("estado"),
+                    Turno.Fecha,
+                    Turno.Hora,
+                    Turno.Paciente_nroPaciente,
+                    Turno.Medico_Matricula,
+                    Turno.Sucursal_Id,
+                    Turno.Estado_Id,
+                    literal(epoch_actual()),
+                ).where(*condiciones),
+            )
+        )
+
+    def _confirmar(self, dias: set) -> None:
+        """
+        Flush + sincronización de derivados + commit, y recién después notifica
+        a las cachés en memoria (ocupación, etc.) qué médico-días cambiaron.
+        """
+        self.db.flush()
+        self._sincronizar(dias)
+        self.db.commit()
+        publicar_cambios_turnos(dias)
+
+    # Mensajes de SQLite para las restricciones únicas de Turnos
+    _CONFLICTOS_UNICOS = {
+        "UNIQUE constraint failed: Turnos.Fecha, Turnos.Hora, Turnos.Paciente_nroPaciente":
+            "El paciente ya tiene un turno asignado para esa fecha y hora.",
+        # Índice único parcial ux_turnos_medico_fecha_hora_activos (migración 3)
+        "UNIQUE constraint failed: Turnos.Medico_Matricula, Turnos.Fecha, Turnos.Hora":
+            "El médico ya tiene un turno asignado en ese horario.",
+    }
+
+    def _confirmar_o_conflicto(self, dias: set) -> None:
+        """_confirmar traduciendo las violaciones de unicidad a HorarioNoDisponibleError."""
         try:
-            self.db.commit()
+            self._confirmar(dias)
         except IntegrityError as e:
             self.db.rollback()
-
-            if (
-                "UNIQUE constraint failed: Turnos.Fecha, Turnos.Hora, Turnos.Paciente_nroPaciente"
-                in str(e)
-            ):
-                raise HorarioNoDisponibleError(
-                    "El paciente ya tiene un turno asignado para esa fecha y hora."
-                )
-
+            for restriccion, mensaje in self._CONFLICTOS_UNICOS.items():
+                if restriccion in str(e):
+                    raise HorarioNoDisponibleError(mensaje)
             raise e
 
+    def create(self, turno_data: Turno) -> Turno:
+        """Persiste un nuevo objeto Turno en la DB."""
+        self.db.add(turno_data)
+        self._evento("creado", turno_data)
+        self._confirmar_o_conflicto(self._dias_afectados(turno_data))
         self.db.refresh(turno_data)
         return turno_data
 
+    def create_many(self, turnos: List[Turno]) -> List[Turno]:
+        """
+        Persiste varios turnos en UNA transacción (todos o ninguno). Los días
+        afectados se sincronizan y notifican una sola vez para todo el lote.
+        """
+        if not turnos:
+            return []
+        dias = set()
+        for turno in turnos:
+            dias |= self._dias_afectados(turno)
+        self.db.add_all(turnos)
+        for turno in turnos:
+            self._evento("creado", turno)
+        self._confirmar_o_conflicto(dias)
+        return self.get_by_pks([(t.Fecha, t.Hora, t.Paciente_nroPaciente) for t in turnos])
+
     def update(self, turno: Turno) -> Turno:
         """Persiste los cambios en un objeto Turno existente (usado para cambios de estado)."""
+        attrs = inspect(turno).attrs
+        if attrs.Estado_Id.history.has_changes():
+            self._evento("estado", turno)
+        else:
+            anterior = None
+            if attrs.Fecha.history.deleted or attrs.Hora.history.deleted:
+                anterior = (
+                    (attrs.Fecha.history.deleted or [turno.Fecha])[0],
+                    (attrs.Hora.history.deleted or [turno.Hora])[0],
+                )
+            self._evento("modificado", turno, anterior)
 
-        self.db.commit()
+        self._confirmar_o_conflicto(self._dias_afectados(turno))
         self.db.refresh(turno)
         return turno
 
+    def update_estados(
+        self, cambios: Dict[int, Tuple[set, List[tuple]]], dias: set, exigir_todos: bool = False
+    ) -> Dict[int, int]:
+        """
+        Cambios de estado en lote, en UNA transacción y con UN UPDATE por estado
+        destino: cambios = {destino: (estados de origen válidos, [PK])}.
+
+        La condición sobre el estado de origen deja sin tocar las filas que otro
+        proceso cambió desde que se leyeron; se resuelve primero por rowid, así
+        el outbox recibe eventos solo de las filas que este UPDATE cambió. Con exigir_todos=True, si alguna
+        quedó sin actualizar se revierte todo. Devuelve las filas actualizadas por destino.
+        """
+        rowid = literal_column("rowid")
+        actualizadas = {}
+        for destino, (origenes, pks) in cambios.items():
+            # Solo las filas que pasan la condición de origen: los eventos se emiten
+            # para ellas y no para las que ya estaban en `destino`
+            ids = self.db.execute(
+                select(rowid).where(
+                    tuple_(Turno.Fecha, Turno.Hora, Turno.Paciente_nroPaciente).in_(
+                        [(str(f), h, p) for f, h, p in pks]
+                    ),
+                    Turno.Estado_Id.in_(origenes),
+                )
+            ).scalars().all()
+            rowcount = 0
+            if ids:
+                resultado = self.db.execute(
+                    update(Turno)
+                    .where(rowid.in_(ids), Turno.Estado_Id.in_(origenes))
+                    .values(Estado_Id=destino)
+                    .execution_options(synchronize_session=False)
+                )
+                rowcount = resultado.rowcount
+            actualizadas[destino] = rowcount
+            if exigir_todos and rowcount != len(pks):
+                self.db.rollback()
+                raise TransicionInvalidaError(
+                    "Algunos turnos cambiaron de estado durante la operación; no se aplicó ningún cambio."
+                )
+            if rowcount:
+                self._eventos_estado(rowid.in_(ids), Turno.Estado_Id == destino)
+        self._confirmar_o_conflicto(dias)
+        return actualizadas
+
     def get_all(self) -> List[Turno]:
-        """Obtiene todos los turnos."""
-        return self.db.query(Turno).all()
+        """Obtiene todos los turnos, incluidos los archivados."""
+        return self._query_archivo_out().all() + self._query_out().all()
+
+    def buscar(
+        self,
+        limite: int,
+        despues_de: Optional[tuple] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        estado_ids: Optional[List[int]] = None,
+        medico_matricula: Optional[str] = None,
+        especialidad_id: Optional[int] = None,
+        sucursal_id: Optional[int] = None,
+        paciente_nro: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Búsqueda filtrada con paginación keyset: hasta `limite` turnos posteriores
+        a la PK `despues_de` (Fecha, Hora, Paciente_nroPaciente), en ese orden.
+
+        Una consulta sobre Turnos y otra sobre Turnos_Archivo, cada una con la
+        proyección que necesita TurnoOut (médico y especialidad por JOIN, estado
+        desde el catálogo) y su propio LIMIT; se intercalan por PK. El costo
+        depende del tamaño de la página y no del de las tablas.
+        """
+        filtros = dict(
+            despues_de=despues_de,
+            fecha_desde=fecha_desde,
+            fecha_hasta=fecha_hasta,
+            estado_ids=estado_ids,
+            medico_matricula=medico_matricula,
+            especialidad_id=especialidad_id,
+            sucursal_id=sucursal_id,
+            paciente_nro=paciente_nro,
+        )
+        filas = heapq.merge(
+            self._buscar_en(TurnoArchivo, limite, **filtros),
+            self._buscar_en(Turno, limite, **filtros),
+            key=lambda fila: (fila.Fecha, fila.Hora, fila.Paciente_nroPaciente),
+        )
+        resultado = []
+        for fila in islice(filas, limite):
+            turno = fila._asdict()
+            turno["estado"] = estado_descripcion(turno.pop("Estado_Id"))
+            resultado.append(turno)
+        return resultado
+
+    def _buscar_en(
+        self,
+        tabla,
+        limite: int,
+        despues_de: Optional[tuple],
+        fecha_desde: Optional[str],
+        fecha_hasta: Optional[str],
+        estado_ids: Optional[List[int]],
+        medico_matricula: Optional[str],
+        especialidad_id: Optional[int],
+        sucursal_id: Optional[int],
+        paciente_nro: Optional[int],
+    ) -> list:
+        """Una página de `buscar` sobre `tabla` (Turno o TurnoArchivo), ordenada por PK."""
+        query = (
+            self.db.query(
+                tabla.Fecha,
+                tabla.Hora,
+                tabla.Paciente_nroPaciente,
+                tabla.Medico_Matricula,
+                tabla.Especialidad_Id,
+                tabla.Estado_Id,
+                tabla.Motivo,
+                tabla.Diagnostico,
+                Medico.Nombre.label("medico_nombre"),
+                Medico.Apellido.label("medico_apellido"),
+                Especialidad.descripcion.label("especialidad_descripcion"),
+            )
+            .outerjoin(Medico, Medico.Matricula == tabla.Medico_Matricula)
+            .outerjoin(Especialidad, Especialidad.Id_especialidad == tabla.Especialidad_Id)
+        )
+        if despues_de is not None:
+            query = query.filter(
+                tuple_(tabla.Fecha, tabla.Hora, tabla.Paciente_nroPaciente) > tuple_(*despues_de)
+            )
+        if fecha_desde is not None:
+            query = query.filter(tabla.Fecha >= fecha_desde)
+        if fecha_hasta is not None:
+            query = query.filter(tabla.Fecha <= fecha_hasta)
+        if estado_ids:
+            query = query.filter(tabla.Estado_Id.in_(estado_ids))
+        if medico_matricula is not None:
+            query = query.filter(tabla.Medico_Matricula == medico_matricula)
+        if especialidad_id is not None:
+            query = query.filter(tabla.Especialidad_Id == especialidad_id)
+        if sucursal_id is not None:
+            query = query.filter(tabla.Sucursal_Id == sucursal_id)
+        if paciente_nro is not None:
+            query = query.filter(tabla.Paciente_nroPaciente == paciente_nro)
+
+        return (
+            query.order_by(tabla.Fecha, tabla.Hora, tabla.Paciente_nroPaciente)
+            .limit(limite)
+            .all()
+        )
 
     def delete(self, turno: Turno) -> None:
         """Elimina un turno de la base de datos."""
+        dias = self._dias_afectados(turno)
+        self._evento("eliminado", turno)
         self.db.delete(turno)
-        self.db.commit()
+        self._confirmar(dias)
 
     def modificar_turno(self, pk_data: dict, nuevos_datos: dict) -> Turno:
         """Modifica los datos de un turno existente."""
@@ -90,9 +438,174 @@ class TurnoRepository:
         for key, value in nuevos_datos.items():
             setattr(turno, key, value)
 
+        return self.update(turno)
+
+    # =========================================================================
+    # TABLERO DE RECEPCIÓN
+    # =========================================================================
+
+    def get_tablero_sucursal(self, sucursal_id: int, fecha: str) -> List[dict]:
+        """
+        Todos los turnos del día de una sucursal con paciente, médico,
+        especialidad y consultorio, en UNA consulta (por ix_turnos_sucursal_fecha_hora).
+        `fecha` es "YYYY-MM-DD".
+
+        El consultorio sale de la agenda excepcional disponible del médico que
+        cubre ese día en la sucursal (las agendas regulares no lo registran).
+        """
+        dia = (date.fromisoformat(fecha) - date(1970, 1, 1)).days  # igual que sql_dia
+        consultorio = (
+            select(AgendaExcepcional.Consultorio_Numero)
+            .where(
+                AgendaExcepcional.Medico_Matricula == Turno.Medico_Matricula,
+                AgendaExcepcional.Consultorio_Sucursal_Id == sucursal_id,
+                AgendaExcepcional.Consultorio_Numero.isnot(None),
+                AgendaExcepcional.Es_Disponible == 1,
+                AgendaExcepcional.Fecha_inicio_Dia <= dia,
+                AgendaExcepcional.Fecha_Fin_Dia >= dia,
+            )
+            .order_by(AgendaExcepcional.Fecha_inicio_Dia.desc())
+            .limit(1)
+            .correlate(Turno)
+            .scalar_subquery()
+        )
+        filas = (
+            self.db.query(
+                Turno.Hora,
+                Turno.Duracion,
+                Turno.Estado_Id,
+                Turno.Motivo,
+                Turno.Paciente_nroPaciente,
+                Paciente.Nombre.label("paciente_nombre"),
+                Paciente.Apellido.label("paciente_apellido"),
+                Paciente.Telefono.label("paciente_telefono"),
+                Turno.Medico_Matricula,
+                Medico.Nombre.label("medico_nombre"),
+                Medico.Apellido.label("medico_apellido"),
+                Turno.Especialidad_Id,
+                Especialidad.descripcion.label("especialidad_descripcion"),
+                consultorio.label("Consultorio_Numero"),
+            )
+            .outerjoin(Paciente, Paciente.nroPaciente == Turno.Paciente_nroPaciente)
+            .outerjoin(Medico, Medico.Matricula == Turno.Medico_Matricula)
+            .outerjoin(Especialidad, Especialidad.Id_especialidad == Turno.Especialidad_Id)
+            .filter(Turno.Sucursal_Id == sucursal_id, Turno.Fecha == fecha)
+            .order_by(Turno.Hora, Medico.Apellido, Turno.Paciente_nroPaciente)
+            .all()
+        )
+        resultado = []
+        for fila in filas:
+            turno = fila._asdict()
+            turno["estado"] = estado_descripcion(turno.pop("Estado_Id"))
+            resultado.append(turno)
+        return resultado
+
+    # =========================================================================
+    # CIERRE AUTOMÁTICO (JOB DE FIN DE DÍA)
+    # =========================================================================
+
+    def cerrar_vencidos_lote(
+        self, origenes: List[int], destino: int, fecha_limite: str, limite: int
+    ) -> Tuple[int, set]:
+        """
+        Un lote del cierre automático: pasa a `destino` hasta `limite` turnos con
+        Fecha < fecha_limite en alguno de los estados `origenes`. Un SELECT (por
+        ix_turnos_fecha_estado_hora) y un UPDATE por rowid, más el INSERT de sus
+        eventos en el outbox, en una transacción.
+
+        Devuelve (filas actualizadas, médico-días afectados). Son días pasados:
+        quedan fuera del horizonte de Slots, así que solo se recalcula el resumen
+        diario y se notifica a las cachés.
+        """
+        rowid = literal_column("rowid")
+        filas = self.db.execute(
+            select(rowid, Turno.Medico_Matricula, Turno.Fecha)
+            .where(Turno.Fecha < fecha_limite, Turno.Estado_Id.in_(origenes))
+            .limit(limite)
+        ).all()
+        if not filas:
+            return 0, set()
+
+        ids = [fila[0] for fila in filas]
+        resultado = self.db.execute(
+            update(Turno)
+            # El estado se vuelve a exigir por si otro proceso lo cambió desde el SELECT
+            .where(rowid.in_(ids), Turno.Estado_Id.in_(origenes))
+            .values(Estado_Id=destino)
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount:
+            self._eventos_estado(rowid.in_(ids), Turno.Estado_Id == destino)
+        dias = {(matricula, str(fecha)) for _, matricula, fecha in filas}
+        ResumenTurnosRepository(self.db).refrescar_dias(dias)
         self.db.commit()
-        self.db.refresh(turno)
-        return turno
+        publicar_cambios_turnos(dias)
+        return resultado.rowcount, dias
+
+    # =========================================================================
+    # ARCHIVO DE TURNOS CERRADOS (PARTICIÓN FRÍA)
+    # =========================================================================
+
+    def archivar_lote(
+        self, estados: List[int], fecha_limite: str, limite: int
+    ) -> int:
+        """
+        Un lote del archivo: mueve a Turnos_Archivo hasta `limite` turnos con
+        Fecha < fecha_limite en alguno de los `estados` (cerrados). Un SELECT (por
+        ix_turnos_fecha_estado_hora), un INSERT ... SELECT y un DELETE por rowid,
+        en una transacción. Devuelve la cantidad de turnos archivados.
+
+        No publica cambios ni escribe eventos: son días pasados en estados que no
+        ocupan agenda, y los reportes (y el resumen diario) siguen viéndolos a
+        través del archivo.
+        """
+        rowid = literal_column("rowid")
+        ids = self.db.execute(
+            select(rowid)
+            .where(Turno.Fecha < fecha_limite, Turno.Estado_Id.in_(estados))
+            .limit(limite)
+        ).scalars().all()
+        if not ids:
+            return 0
+
+        columnas = [Turno.__table__.c[nombre] for nombre in COLUMNAS_TURNO_ARCHIVO]
+        self.db.execute(
+            insert(TurnoArchivo)
+            # Si la misma clave ya estaba archivada, gana la versión más reciente
+            .prefix_with("OR REPLACE")
+            .from_select(
+                COLUMNAS_TURNO_ARCHIVO + ["Archivado"],
+                select(*columnas, literal(epoch_actual())).where(rowid.in_(ids)),
+            )
+        )
+        resultado = self.db.execute(
+            delete(Turno)
+            .where(rowid.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return resultado.rowcount
+
+    def get_fecha_max_archivada(self) -> Optional[str]:
+        """Fecha del turno archivado más reciente (None si el archivo está vacío)."""
+        return self.db.query(func.max(TurnoArchivo.Fecha)).scalar()
+
+    def _turnos_periodo(self, start_date: str, end_date: str):
+        """
+        FROM de los reportes: los turnos con Fecha en [start_date, end_date].
+        Solo si el rango llega a fechas archivadas se agrega Turnos_Archivo
+        (UNION ALL); si no, es un subquery simple de Turnos que SQLite aplana.
+        """
+        def del_rango(tabla):
+            return select(*(tabla.c[nombre] for nombre in COLUMNAS_TURNO_ARCHIVO)).where(
+                tabla.c.Fecha >= start_date, tabla.c.Fecha <= end_date
+            )
+
+        consulta = del_rango(Turno.__table__)
+        fecha_max_archivada = self.get_fecha_max_archivada()
+        if fecha_max_archivada is not None and start_date <= fecha_max_archivada:
+            consulta = union_all(consulta, del_rango(TurnoArchivo.__table__))
+        return consulta.subquery("turnos_periodo")
 
     # =========================================================================
     # ROL DE SOPORTE PARA REPORTES (CONSULTAS COMPLEJAS)
@@ -104,21 +617,21 @@ class TurnoRepository:
         """
         Obtiene el listado de turnos de un médico en un período.
         """
+        t = self._turnos_periodo(start_date, end_date)
         query = self.db.query(
-            Turno.Fecha,
-            Turno.Hora,
+            t.c.Fecha,
+            t.c.Hora,
             Paciente.Nombre.label("Paciente_Nombre"),
             Paciente.Apellido.label("Paciente_Apellido"),
             Estado.Descripcion.label("Estado_Turno"),
-            Turno.Duracion,
-        ).join(Medico, Medico.Matricula == Turno.Medico_Matricula)
+            t.c.Duracion,
+        ).select_from(t).join(Medico, Medico.Matricula == t.c.Medico_Matricula)
 
-        query = query.join(Paciente, Paciente.nroPaciente == Turno.Paciente_nroPaciente)
-        query = query.join(Estado, Estado.Id == Turno.Estado_Id)
-        query = query.filter(
-            Turno.Medico_Matricula == medico_matricula,
-            and_(Turno.Fecha >= start_date, Turno.Fecha <= end_date),
-        ).order_by(Turno.Fecha, Turno.Hora)
+        query = query.join(Paciente, Paciente.nroPaciente == t.c.Paciente_nroPaciente)
+        query = query.join(Estado, Estado.Id == t.c.Estado_Id)
+        query = query.filter(t.c.Medico_Matricula == medico_matricula).order_by(
+            t.c.Fecha, t.c.Hora
+        )
 
         result = query.all()
         return [row._asdict() for row in result]
@@ -127,51 +640,30 @@ class TurnoRepository:
         self, start_date: str, end_date: str
     ) -> List[dict]:
         """
-        Cuenta la cantidad de turnos por especialidad dentro de un rango de fechas.
+        Cuenta la cantidad de turnos por especialidad dentro de un rango de fechas
+        (desde el resumen diario: el costo no depende del largo del período).
         """
-        query = self.db.query(
-            Especialidad.descripcion.label("Especialidad_Nombre"),
-            func.count(Turno.Especialidad_Id).label("Total_Turnos"),
-        )
-        query = query.join(
-            Especialidad, Especialidad.Id_especialidad == Turno.Especialidad_Id
-        )  # CLAVE CORREGIDA
-        query = query.filter(
-            and_(Turno.Fecha >= start_date, Turno.Fecha <= end_date)
-        ).group_by(Especialidad.descripcion)
-
-        result = query.all()
-        return [row._asdict() for row in result]
+        return ResumenTurnosRepository(self.db).contar_por_especialidad(start_date, end_date)
 
     def get_pacientes_atendidos(self, start_date: str, end_date: str) -> List[dict]:
         """
         [MÉTODO FALTANTE] Obtiene el listado de pacientes atendidos (Turnos en estado 'Finalizado' o 'Atendido').
         """
-        # Obtenemos los IDs de los estados de interés
-        estados_finales = (
-            self.db.query(Estado)
-            .filter(Estado.Descripcion.in_(["Finalizado", "Atendido"]))
-            .all()
-        )
-        estado_ids = [e.Id for e in estados_finales]
-
-        if not estado_ids:
-            return []
+        # IDs de los estados de interés (catálogo en memoria)
+        estado_ids = estado_ids_de("Finalizado", "Atendido")
 
+        t = self._turnos_periodo(start_date, end_date)
         query = self.db.query(
-            Turno.Fecha,
-            Turno.Hora,
+            t.c.Fecha,
+            t.c.Hora,
             Paciente.nroPaciente.label("Nro_Paciente"),
             Paciente.Nombre.label("Paciente_Nombre"),
             Paciente.Apellido.label("Paciente_Apellido"),
             Estado.Descripcion.label("Estado_Final"),
-        ).join(Paciente, Paciente.nroPaciente == Turno.Paciente_nroPaciente)
+        ).select_from(t).join(Paciente, Paciente.nroPaciente == t.c.Paciente_nroPaciente)
 
-        query = query.join(Estado, Estado.Id == Turno.Estado_Id)
-        query = query.filter(
-            Turno.Estado_Id.in_(estado_ids),
-            and_(Turno.Fecha >= start_date, Turno.Fecha <= end_date),
-        ).order_by(Turno.Fecha)
+        query = query.join(Estado, Estado.Id == t.c.Estado_Id)
+        query = query.filter(t.c.Estado_Id.in_(estado_ids)).order_by(t.c.Fecha)
 
         result = query.all()
         return [row._asdict() for row in result]
@@ -180,41 +672,32 @@ class TurnoRepository:
         self, start_date: str, end_date: str
     ) -> List[dict]:
         """
-        Cuenta el total de turnos en estado 'Finalizado' (Asistencia) y 'Ausente' (Inasistencia).
+        Cuenta el total de turnos en estado 'Finalizado' (Asistencia) y 'Ausente' (Inasistencia),
+        desde el resumen diario.
         """
 
-        estados_interes = (
-            self.db.query(Estado)
-            .filter(Estado.Descripcion.in_(["Finalizado", "Ausente"]))
-            .all()
-        )
-        estado_ids = [e.Id for e in estados_interes]
+        estado_ids = estado_ids_de("Finalizado", "Ausente")
 
-        if not estado_ids:
-            return []
-
-        query = self.db.query(
-            Estado.Descripcion.label("Tipo_Registro"),
-            func.count(Turno.Estado_Id).label("Total_Turnos"),
-        )
-        query = query.join(Estado, Estado.Id == Turno.Estado_Id)
-        query = query.filter(
-            Turno.Estado_Id.in_(estado_ids),
-            and_(Turno.Fecha >= start_date, Turno.Fecha <= end_date),
-        ).group_by(Estado.Descripcion)
-
-        result = query.all()
-        return [row._asdict() for row in result]
+        # La descripción sale del catálogo
+        return [
+            {"Tipo_Registro": estado_descripcion(estado_id), "Total_Turnos": total}
+            for estado_id, total in ResumenTurnosRepository(self.db).contar_por_estado(
+                start_date, end_date, estado_ids
+            )
+        ]
 
     def get_turnos_by_date(self, target_date: date) -> List[Turno]:
         """Obtiene todos los turnos confirmados/pendientes para una fecha específica."""
-        # Se asume que el estado 'Confirmado' (Id=2) y 'Pendiente' (Id=1) son los estados a recordar
+        # Los estados a recordar son 'Pendiente' y 'Confirmado'
 
         target_date_str = target_date.strftime("%Y-%m-%d")
 
         return (
             self.db.query(Turno)
-            .filter(Turno.Fecha == target_date_str, Turno.Estado_Id.in_([1, 2]))
+            .filter(
+                Turno.Fecha == target_date_str,
+                Turno.Estado_Id.in_(estado_ids_de("Pendiente", "Confirmado")),
+            )
             .options(
                 joinedload(Turno.paciente),
                 joinedload(Turno.medico),  # Cargar datos del médico
@@ -236,7 +719,7 @@ class TurnoRepository:
             self.db.query(Turno)
             .filter(
                 Turno.Fecha == target_date_str,
-                Turno.Estado_Id.in_([2]),  # Confirmado
+                Turno.Estado_Id == estado_id("Confirmado"),
                 Turno.Hora >= start_time_str,
                 Turno.Hora <= end_time_str,
             )
@@ -250,23 +733,22 @@ class TurnoRepository:
         """
         Obtiene el listado de turnos de TODOS los médicos en un período.
         """
+        t = self._turnos_periodo(start_date, end_date)
         query = self.db.query(
-            Turno.Fecha,
-            Turno.Hora,
+            t.c.Fecha,
+            t.c.Hora,
             Medico.Nombre.label("Medico_Nombre"),
             Medico.Apellido.label("Medico_Apellido"),
             Medico.Matricula.label("Medico_Matricula"),
             Paciente.Nombre.label("Paciente_Nombre"),
             Paciente.Apellido.label("Paciente_Apellido"),
             Estado.Descripcion.label("Estado_Turno"),
-            Turno.Duracion,
-        ).join(Medico, Medico.Matricula == Turno.Medico_Matricula)
-
-        query = query.join(Paciente, Paciente.nroPaciente == Turno.Paciente_nroPaciente)
-        query = query.join(Estado, Estado.Id == Turno.Estado_Id)
-        query = query.filter(
-            and_(Turno.Fecha >= start_date, Turno.Fecha <= end_date)
-        ).order_by(Medico.Apellido, Medico.Nombre, Turno.Fecha, Turno.Hora)
+            t.c.Duracion,
+        ).select_from(t).join(Medico, Medico.Matricula == t.c.Medico_Matricula)
+
+        query = query.join(Paciente, Paciente.nroPaciente == t.c.Paciente_nroPaciente)
+        query = query.join(Estado, Estado.Id == t.c.Estado_Id)
+        query = query.order_by(Medico.Apellido, Medico.Nombre, t.c.Fecha, t.c.Hora)
 
         result = query.all()
         return [row._asdict() for row in result]
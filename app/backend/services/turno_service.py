@@ -3,28 +3,48 @@ from app.backend.services.medico_repository import MedicoRepository
 from app.backend.services.turno_repository import TurnoRepository
 from app.backend.services.paciente_repository import PacienteRepository 
 from app.backend.services.exceptions import RecursoNoEncontradoError, HorarioNoDisponibleError, TransicionInvalidaError
-from app.backend.schemas.turno import TurnoCreate
-from app.backend.models.models import Turno, Estado 
-from app.backend.state.turno_state import EstadoTurno 
-from datetime import datetime
+from app.backend.services.exceptions import ValueError as AppValueError
+from app.backend.schemas.turno import TurnoCreate, TurnoEstadoLoteItem
+from app.backend.models.models import Turno
+from app.backend.services.catalogos import catalogos, estado_id
+from app.backend.state.estados_turno import matriz_transiciones
+from app.backend.services.reserva_locks import reserva_locks
+from app.backend.services.reserva_temporal_repository import ReservaTemporalRepository
+from app.backend.services.reservas_temporales import reservas_temporales, TTL_RESERVA_SEGUNDOS
+from app.backend.services.disponibilidad_engine import hora_a_minutos
+from app.backend.schemas.reserva_temporal import ReservaTemporalCreate
+from app.backend.models.models import ReservaTemporal
+import base64
+import time
+import uuid
+from datetime import date, datetime
 from sqlalchemy.orm import Session
-from typing import Literal, List
+from typing import Literal, List, Optional
+
+# ----------------------------------------------------
+# Cursor de la búsqueda paginada: PK (Fecha, Hora, Paciente_nroPaciente) opaca
+# ----------------------------------------------------
+def codificar_cursor(fecha: str, hora: str, paciente_nro: int) -> str:
+    return base64.urlsafe_b64encode(f"{fecha}|{hora}|{paciente_nro}".encode()).decode()
+
+
+def decodificar_cursor(cursor: str) -> tuple:
+    try:
+        fecha, hora, paciente_nro = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return fecha, hora, int(paciente_nro)
+    except Exception:
+        raise AppValueError("Cursor de paginación inválido.")
 
-# Asume que esta función helper existe y es correcta
-def get_estado_id(db: Session, descripcion: str) -> int:
-    estado = db.query(Estado).filter(Estado.Descripcion == descripcion).first()
-    if not estado:
-        raise Exception(f"El estado '{descripcion}' no existe en la base de datos. Ejecute init_estados.")
-    return estado.Id
 
 class TurnoService:
-    def __init__(self, turno_repo: TurnoRepository, agenda_repo: AgendaRepository, medico_repo: MedicoRepository, paciente_repo: PacienteRepository, db_session: Session):
+    def __init__(self, turno_repo: TurnoRepository, agenda_repo: AgendaRepository, medico_repo: MedicoRepository, paciente_repo: PacienteRepository, db_session: Session, reserva_repo: Optional[ReservaTemporalRepository] = None):
         self.turno_repo = turno_repo
         self.agenda_repo = agenda_repo
         self.medico_repo = medico_repo
         self.paciente_repo = paciente_repo
         self.db = db_session
-        self.ESTADO_PENDIENTE_ID = get_estado_id(self.db, "Pendiente")
+        self.reserva_repo = reserva_repo or ReservaTemporalRepository(db_session)
+        self.ESTADO_PENDIENTE_ID = estado_id("Pendiente")
 
 
     def registrar_turno(self, data: TurnoCreate) -> Turno:
@@ -36,6 +56,13 @@ class TurnoService:
         if not self.paciente_repo.get_by_id(data.paciente_nroPaciente):
             raise RecursoNoEncontradoError(f"Paciente {data.paciente_nroPaciente} no existe.")
 
+        # Desde acá hasta el commit, las reservas del MISMO médico-día se ejecutan de a una
+        # (las de otros médicos siguen en paralelo). El índice único parcial de la DB
+        # sigue siendo la barrera final entre procesos.
+        with reserva_locks.bloquear([(data.medico_matricula, str(data.fecha))]):
+            return self._registrar_turno_bloqueado(data)
+
+    def _registrar_turno_bloqueado(self, data: TurnoCreate) -> Turno:
         # LÓGICA DE VALIDACIÓN CRÍTICA: Chequeo de PK Compuesta (Paciente no puede tener 2 turnos a la misma hora)
         pk_data = {"fecha": str(data.fecha), "hora": data.hora, "paciente_nro": data.paciente_nroPaciente}
         if self.turno_repo.get_by_pk(**pk_data):
@@ -55,14 +82,209 @@ class TurnoService:
             # Si el repository devuelve un string de error, lo lanzamos. ¡Esto debería funcionar ahora!
             raise HorarioNoDisponibleError(motivo_indisponible)
 
-        # 3. Preparación y Creación
+        # 3. Retenciones temporales de otros usuarios sobre ese horario
+        inicio = hora_turno.hour * 60 + hora_turno.minute
+        retenciones = self.reserva_repo.get_activas_by_dias(
+            {(data.medico_matricula, str(data.fecha))}, time.time()
+        )
+        consumida = self._retencion_a_consumir(
+            retenciones, inicio, inicio + duracion_turno, data.reserva_token
+        )
+
+        # 4. Preparación y Creación
         nuevo_turno = Turno(
-            **data.model_dump(by_alias=True, exclude_none=True), 
+            **data.model_dump(by_alias=True, exclude_none=True, exclude={"reserva_token"}),
             Estado_Id=self.ESTADO_PENDIENTE_ID, 
         )
         
-        # 4. Persistencia
-        return self.turno_repo.create(nuevo_turno)
+        # 5. Persistencia (la retención consumida se borra en la misma transacción)
+        tokens = []
+        if consumida is not None:
+            tokens.append(consumida.Token)
+            self.db.delete(consumida)
+        turno = self.turno_repo.create(nuevo_turno)
+        reservas_temporales.quitar(tokens)
+        return turno
+
+    # ----------------------------------------------------
+    # Retenciones temporales (checkout)
+    # ----------------------------------------------------
+    def retener_horario(self, data: ReservaTemporalCreate) -> ReservaTemporal:
+        """
+        Retiene el horario por TTL_RESERVA_SEGUNDOS: desaparece de la disponibilidad
+        y solo puede reservarlo quien presente el token (o cualquiera, una vez vencido).
+        """
+        if not self.medico_repo.get_by_matricula(data.medico_matricula):
+            raise RecursoNoEncontradoError(f"Médico {data.medico_matricula} no existe.")
+
+        fecha = str(data.fecha)
+        duracion = data.duracion if data.duracion else 30
+        hora_turno = datetime.strptime(data.hora, "%H:%M").time()
+        inicio = hora_turno.hour * 60 + hora_turno.minute
+
+        with reserva_locks.bloquear([(data.medico_matricula, fecha)]):
+            motivo_indisponible = self.agenda_repo.verificar_disponibilidad(
+                data.medico_matricula, data.fecha, hora_turno, duracion
+            )
+            if motivo_indisponible:
+                raise HorarioNoDisponibleError(motivo_indisponible)
+
+            ahora = time.time()
+            self.reserva_repo.delete_vencidas(ahora, data.medico_matricula, fecha)
+            retenciones = self.reserva_repo.get_activas_by_dias(
+                {(data.medico_matricula, fecha)}, ahora
+            )
+            self._retencion_a_consumir(retenciones, inicio, inicio + duracion, token=None)
+
+            reserva = self.reserva_repo.create(
+                ReservaTemporal(
+                    Token=uuid.uuid4().hex,
+                    Medico_Matricula=data.medico_matricula,
+                    Fecha=fecha,
+                    Hora=data.hora,
+                    Duracion=duracion,
+                    Paciente_nroPaciente=data.paciente_nroPaciente,
+                    Vence=ahora + TTL_RESERVA_SEGUNDOS,
+                )
+            )
+        reservas_temporales.registrar(
+            reserva.Token, reserva.Medico_Matricula, fecha, inicio, inicio + duracion, reserva.Vence
+        )
+        return reserva
+
+    def liberar_retencion(self, token: str) -> None:
+        reserva = self.reserva_repo.get_by_token(token)
+        if not reserva:
+            raise RecursoNoEncontradoError("Retención no encontrada o ya utilizada.")
+        self.reserva_repo.delete(reserva)
+        reservas_temporales.quitar([token])
+
+    def _retencion_a_consumir(
+        self, retenciones: List[ReservaTemporal], inicio: int, fin: int, token: Optional[str]
+    ) -> Optional[ReservaTemporal]:
+        """
+        Entre las retenciones vigentes del día: si alguna ajena se solapa con
+        [inicio, fin) lanza HorarioNoDisponibleError; si la del token se solapa, la devuelve.
+        """
+        propia = None
+        for reserva in retenciones:
+            # Las cargadas de la DB (p. ej. de otro proceso) también se ocultan en este proceso
+            r_inicio = hora_a_minutos(reserva.Hora)
+            r_fin = r_inicio + reserva.Duracion
+            reservas_temporales.registrar(
+                reserva.Token, reserva.Medico_Matricula, reserva.Fecha, r_inicio, r_fin, reserva.Vence
+            )
+            if not (inicio < r_fin and fin > r_inicio):
+                continue
+            if token is not None and reserva.Token == token:
+                propia = reserva
+            else:
+                raise HorarioNoDisponibleError(
+                    "El horario está retenido temporalmente por otra reserva en curso."
+                )
+        return propia
+
+    # ----------------------------------------------------
+    # Alta en lote
+    # ----------------------------------------------------
+    def registrar_turnos_lote(self, items: List[TurnoCreate], atomico: bool = False) -> List[dict]:
+        """
+        Valida N turnos en una pasada y los inserta en UNA transacción.
+        Médicos, pacientes, PKs existentes y hechos de disponibilidad de todos los
+        médico-días involucrados se cargan una sola vez; los conflictos entre
+        turnos del mismo lote se detectan sumando cada aceptado a la ocupación del día.
+
+        Devuelve un resultado por ítem (en el orden recibido):
+        {"indice", "creado", "turno", "error"}. Con atomico=True, si algún ítem es
+        rechazado no se crea ninguno.
+        """
+        # 1. Integridad (FKs) y PKs ya ocupadas, una consulta por tipo
+        medicos = self.medico_repo.get_matriculas_existentes(d.medico_matricula for d in items)
+        pacientes = self.paciente_repo.get_ids_existentes(d.paciente_nroPaciente for d in items)
+        pks_existentes = {
+            (t.Fecha, t.Hora, t.Paciente_nroPaciente)
+            for t in self.turno_repo.get_by_pks(
+                [(d.fecha, d.hora, d.paciente_nroPaciente) for d in items]
+            )
+        }
+
+        dias = {(d.medico_matricula, d.fecha) for d in items if d.medico_matricula in medicos}
+        with reserva_locks.bloquear((m, str(f)) for m, f in dias):
+            # 2. Hechos de disponibilidad de todos los médico-días (tres consultas)
+            hechos = self.agenda_repo.cargar_hechos_disponibilidad_lote(dias)
+            retenciones = {}
+            for reserva in self.reserva_repo.get_activas_by_dias(
+                {(m, str(f)) for m, f in dias}, time.time()
+            ):
+                retenciones.setdefault((reserva.Medico_Matricula, reserva.Fecha), []).append(reserva)
+
+            errores: List[str | None] = []
+            aceptados: List[tuple] = []  # (indice, Turno)
+            consumidas: dict = {}  # indice -> ReservaTemporal
+            pks_lote = set()
+            for indice, data in enumerate(items):
+                pk = (str(data.fecha), data.hora, data.paciente_nroPaciente)
+                duracion_turno = data.duracion if data.duracion else 30
+                hora_turno = datetime.strptime(data.hora, "%H:%M").time()
+
+                if data.medico_matricula not in medicos:
+                    error = f"Médico {data.medico_matricula} no existe."
+                elif data.paciente_nroPaciente not in pacientes:
+                    error = f"Paciente {data.paciente_nroPaciente} no existe."
+                elif pk in pks_existentes:
+                    error = "El paciente ya tiene un turno agendado para esa misma fecha y hora."
+                elif pk in pks_lote:
+                    error = "El paciente ya tiene otro turno en este lote para esa misma fecha y hora."
+                else:
+                    clave = (data.medico_matricula, str(data.fecha))
+                    inicio = hora_turno.hour * 60 + hora_turno.minute
+                    error = self.agenda_repo.decidir_disponibilidad(
+                        hechos[clave], data.fecha, hora_turno, duracion_turno
+                    )
+                    if error is None:
+                        try:
+                            consumida = self._retencion_a_consumir(
+                                retenciones.get(clave, []), inicio, inicio + duracion_turno,
+                                data.reserva_token,
+                            )
+                            if consumida is not None:
+                                consumidas[indice] = consumida
+                        except HorarioNoDisponibleError as e:
+                            error = str(e)
+                    if error is None:
+                        # Ocupa lugar para los siguientes ítems del lote
+                        hechos[clave]["ocupacion"].agregar(inicio, inicio + duracion_turno, data.hora)
+
+                errores.append(error)
+                if error is None:
+                    pks_lote.add(pk)
+                    campos = data.model_dump(by_alias=True, exclude_none=True, exclude={"reserva_token"})
+                    # Fecha como texto: el insert en lote compara las PK devueltas con las enviadas
+                    campos["Fecha"] = pk[0]
+                    aceptados.append((indice, Turno(**campos, Estado_Id=self.ESTADO_PENDIENTE_ID)))
+
+            if atomico and any(errores):
+                aceptados = []
+                errores = [e or "No se creó: otro turno del lote fue rechazado." for e in errores]
+
+            # 3. Persistencia: una sola transacción para todos los aceptados (y sus retenciones)
+            usadas = [consumidas[indice] for indice, _ in aceptados if indice in consumidas]
+            tokens = [reserva.Token for reserva in usadas]
+            for reserva in usadas:
+                self.db.delete(reserva)
+            creados = self.turno_repo.create_many([turno for _, turno in aceptados])
+            reservas_temporales.quitar(tokens)
+
+        por_indice = {indice: turno for (indice, _), turno in zip(aceptados, creados)}
+        return [
+            {
+                "indice": indice,
+                "creado": indice in por_indice,
+                "turno": por_indice.get(indice),
+                "error": errores[indice],
+            }
+            for indice in range(len(items))
+        ]
 
     # ... (El resto de la clase se mantiene igual)
     def _obtener_turno_o_404(self, pk_data: dict) -> Turno:
@@ -78,18 +300,127 @@ class TurnoService:
         
     def cambiar_estado(self, pk_data: dict, accion: str) -> Turno:
         turno = self._obtener_turno_o_404(pk_data)
-        try:
-            state_instance: EstadoTurno = turno.get_state(self.db) 
-            transicion_func = getattr(state_instance, accion)
-            transicion_func() 
-        except AttributeError:
+        destino = matriz_transiciones().destino(turno.Estado_Id, accion)
+        if destino is None:
             raise TransicionInvalidaError(f"Transición '{accion}' no permitida para el estado actual: {turno.estado}.")
-        except Exception as e:
-            raise TransicionInvalidaError(str(e))
+        turno.Estado_Id = destino
         return self.turno_repo.update(turno)
 
+    def cambiar_estados_lote(
+        self, items: List[TurnoEstadoLoteItem], accion: Optional[str] = None, atomico: bool = False
+    ) -> List[dict]:
+        """
+        Aplica una acción de la máquina de estados a muchos turnos: una consulta
+        para leerlos, la validación contra la matriz compilada en memoria y un
+        UPDATE por estado destino, todo en una transacción.
+
+        Devuelve un resultado por ítem (en el orden recibido):
+        {"indice", "aplicado", "turno", "error"}. Con atomico=True, si alguna
+        transición es rechazada no se aplica ninguna.
+        """
+        matriz = matriz_transiciones()
+        pks = [(str(i.fecha), i.hora, i.paciente_nroPaciente) for i in items]
+        turnos = {
+            (t.Fecha, t.Hora, t.Paciente_nroPaciente): t for t in self.turno_repo.get_by_pks(pks)
+        }
+
+        errores: List[str | None] = []
+        destinos: dict = {}  # indice -> Estado_Id destino
+        cambios: dict = {}  # destino -> (origenes, [pk])
+        pks_lote = set()
+        dias = set()
+        for indice, (item, pk) in enumerate(zip(items, pks)):
+            accion_item = item.accion or accion
+            turno = turnos.get(pk)
+            destino = None
+            if turno is None:
+                error = f"Turno del paciente {pk[2]} el {pk[0]} a las {pk[1]} no existe."
+            elif pk in pks_lote:
+                error = "El turno ya figura en este lote."
+            else:
+                destino = matriz.destino(turno.Estado_Id, accion_item)
+                error = None if destino is not None else (
+                    f"Transición '{accion_item}' no permitida para el estado actual: {turno.estado}."
+                )
+            errores.append(error)
+            if error is None:
+                destinos[indice] = destino
+                pks_lote.add(pk)
+                origenes, pks_destino = cambios.setdefault(destino, (set(), []))
+                origenes.add(turno.Estado_Id)
+                pks_destino.append(pk)
+                dias.add((turno.Medico_Matricula, str(turno.Fecha)))
+
+        if atomico and any(errores):
+            cambios, destinos = {}, {}
+            errores = [e or "No se aplicó: otra transición del lote fue rechazada." for e in errores]
+
+        if cambios:
+            self.turno_repo.update_estados(cambios, dias, exigir_todos=atomico)
+        actualizados = {
+            (t.Fecha, t.Hora, t.Paciente_nroPaciente): t
+            for t in self.turno_repo.get_by_pks([pks[i] for i in destinos])
+        }
+
+        resultados = []
+        for indice, pk in enumerate(pks):
+            turno = actualizados.get(pk)
+            aplicado = indice in destinos and turno is not None and turno.Estado_Id == destinos[indice]
+            error = errores[indice]
+            if indice in destinos and not aplicado:
+                # Otro proceso lo cambió entre la lectura y el UPDATE
+                error = "El turno cambió de estado durante la operación."
+            resultados.append({
+                "indice": indice,
+                "aplicado": aplicado,
+                "turno": turno if aplicado else None,
+                "error": error,
+            })
+        return resultados
+
     def obtener_turnos(self) -> List[Turno]:
         return self.turno_repo.get_all()
+
+    def buscar_turnos(
+        self,
+        limite: int,
+        cursor: Optional[str] = None,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        estados: Optional[List[str]] = None,
+        medico_matricula: Optional[str] = None,
+        especialidad_id: Optional[int] = None,
+        sucursal_id: Optional[int] = None,
+        paciente_nro: Optional[int] = None,
+    ) -> dict:
+        """
+        Una página de la búsqueda filtrada, ordenada por (Fecha, Hora, Paciente).
+        Devuelve {"items", "siguiente"}: `siguiente` es el cursor para pedir la
+        página posterior, o None si no hay más resultados.
+        """
+        catalogo = catalogos().estados
+        desconocidos = [e for e in estados or () if e not in catalogo]
+        if desconocidos:
+            raise AppValueError(f"Estados desconocidos: {', '.join(desconocidos)}.")
+
+        # Se pide una fila de más para saber si hay página siguiente
+        filas = self.turno_repo.buscar(
+            limite + 1,
+            despues_de=decodificar_cursor(cursor) if cursor else None,
+            fecha_desde=fecha_desde.strftime("%Y-%m-%d") if fecha_desde else None,
+            fecha_hasta=fecha_hasta.strftime("%Y-%m-%d") if fecha_hasta else None,
+            estado_ids=catalogo.ids(*estados) if estados else None,
+            medico_matricula=medico_matricula,
+            especialidad_id=especialidad_id,
+            sucursal_id=sucursal_id,
+            paciente_nro=paciente_nro,
+        )
+        items = filas[:limite]
+        siguiente = None
+        if len(filas) > limite:
+            ultimo = items[-1]
+            siguiente = codificar_cursor(ultimo["Fecha"], ultimo["Hora"], ultimo["Paciente_nroPaciente"])
+        return {"items": items, "siguiente": siguiente}
     
     def eliminar_turno(self, pk_data: dict) -> None:
         turno = self._obtener_turno_o_404(pk_data)
@@ -97,6 +428,39 @@ class TurnoService:
 
     def modificar_turno(self, pk_data: dict, nuevos_datos: dict) -> Turno:
         turno = self._obtener_turno_o_404(pk_data)
-        for key, value in nuevos_datos.items():
-            setattr(turno, key, value)
-        return self.turno_repo.update(turno)
+        fecha = str(nuevos_datos.get("Fecha", turno.Fecha))
+        hora = nuevos_datos.get("Hora", turno.Hora)
+        # Se bloquean el médico-día original y el nuevo (si cambia la fecha)
+        claves = {
+            (turno.Medico_Matricula, str(turno.Fecha)),
+            (turno.Medico_Matricula, fecha),
+        }
+        with reserva_locks.bloquear(claves):
+            if (fecha, hora) != (str(turno.Fecha), turno.Hora):
+                # Reprogramación: mismas verificaciones que un alta (agenda, bloqueos,
+                # otros turnos y retenciones ajenas), sin contar el propio turno
+                self._verificar_reprogramacion(turno, fecha, hora)
+            for key, value in nuevos_datos.items():
+                setattr(turno, key, value)
+            return self.turno_repo.update(turno)
+
+    def _verificar_reprogramacion(self, turno: Turno, fecha: str, hora: str) -> None:
+        fecha_turno = datetime.strptime(fecha, "%Y-%m-%d").date()
+        hora_turno = datetime.strptime(hora, "%H:%M").time()
+        duracion_turno = turno.Duracion if turno.Duracion else 30
+
+        motivo_indisponible = self.agenda_repo.verificar_disponibilidad(
+            turno.Medico_Matricula,
+            fecha_turno,
+            hora_turno,
+            duracion_turno,
+            excluir=(str(turno.Fecha), turno.Hora, turno.Paciente_nroPaciente),
+        )
+        if motivo_indisponible:
+            raise HorarioNoDisponibleError(motivo_indisponible)
+
+        inicio = hora_turno.hour * 60 + hora_turno.minute
+        retenciones = self.reserva_repo.get_activas_by_dias(
+            {(turno.Medico_Matricula, fecha)}, time.time()
+        )
+        self._retencion_a_consumir(retenciones, inicio, inicio + duracion_turno, token=None)
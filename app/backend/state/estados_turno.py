@@ -1,25 +1,83 @@
-from .turno_state import EstadoTurno
-
-class PendienteState(EstadoTurno):
-    def confirmar(self): self.set_estado("Confirmado")
-    def cancelar(self): self.set_estado("Cancelado")
-    def reprogramar(self): self.set_estado("Pendiente")
-    def anunciar(self): self.set_estado("Anunciado")
-    def atender(self): self.set_estado("Atendido")
-
-class ConfirmadoState(EstadoTurno):
-    def cancelar(self): self.set_estado("Cancelado")
-    def atender(self): self.set_estado("Atendido")
-    def anunciar(self): self.set_estado("Anunciado")
-
-class AnunciadoState(EstadoTurno):
-    def atender(self): self.set_estado("Atendido")
-
-class AtendidoState(EstadoTurno):
-    def finalizar(self): self.set_estado("Finalizado")
-    def marcarAusente(self): self.set_estado("Ausente")
-
-class FinalizadoState(EstadoTurno): pass
-class CanceladoState(EstadoTurno): pass
-class AusenteState(EstadoTurno): pass
-# Los estados Finalizado, Cancelado y Ausente no permiten transiciones adicionales.
\ No newline at end of file
+"""
+Máquina de estados de un Turno, dirigida por tabla.
+
+TRANSICIONES declara, por descripción de estado, qué acciones admite y a qué
+estado llevan. Contra el catálogo de Estados (services/catalogos) se compila
+una vez en una matriz (Estado_Id, acción) -> Estado_Id: validar una transición
+es una búsqueda en un dict, sin instanciar nada por turno ni consultar la DB.
+"""
+
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+# Acciones que se pueden aplicar a un turno (PATCH /turnos/...)
+ACCIONES = (
+    "confirmar",
+    "cancelar",
+    "reprogramar",
+    "atender",
+    "finalizar",
+    "anunciar",
+    "marcarAusente",
+)
+
+# estado actual -> {acción: estado destino}
+TRANSICIONES: Dict[str, Dict[str, str]] = {
+    "Pendiente": {
+        "confirmar": "Confirmado",
+        "cancelar": "Cancelado",
+        "reprogramar": "Pendiente",
+        "anunciar": "Anunciado",
+        "atender": "Atendido",
+    },
+    "Confirmado": {
+        "cancelar": "Cancelado",
+        "atender": "Atendido",
+        "anunciar": "Anunciado",
+    },
+    "Anunciado": {
+        "atender": "Atendido",
+    },
+    "Atendido": {
+        "finalizar": "Finalizado",
+        "marcarAusente": "Ausente",
+    },
+    # Los estados Finalizado, Cancelado y Ausente no permiten transiciones adicionales.
+    "Finalizado": {},
+    "Cancelado": {},
+    "Ausente": {},
+}
+
+
+class MatrizTransiciones:
+    """TRANSICIONES compilada a ids del catálogo de Estados."""
+
+    __slots__ = ("_destinos",)
+
+    def __init__(self, estados):
+        self._destinos: Dict[Tuple[int, str], int] = {
+            (estados.id(origen), accion): estados.id(destino)
+            for origen, acciones in TRANSICIONES.items()
+            for accion, destino in acciones.items()
+        }
+
+    def destino(self, estado_id: Optional[int], accion: str) -> Optional[int]:
+        """Estado_Id al que lleva `accion` desde `estado_id`, o None si no está permitida."""
+        return self._destinos.get((estado_id, accion))
+
+
+_compilada: Optional[Tuple[object, MatrizTransiciones]] = None  # (catálogo, matriz)
+_lock = Lock()
+
+
+def matriz_transiciones() -> MatrizTransiciones:
+    """Matriz compilada para el catálogo vigente (se recompila si el catálogo se recarga)."""
+    global _compilada
+    from app.backend.services.catalogos import catalogos
+
+    estados = catalogos().estados
+    compilada = _compilada
+    if compilada is None or compilada[0] is not estados:
+        with _lock:
+            compilada = _compilada = (estados, MatrizTransiciones(estados))
+    return compilada[1]
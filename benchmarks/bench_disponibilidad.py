@@ -0,0 +1,202 @@
+"""
+Benchmark del motor de disponibilidad (AgendaService.obtener_turnos_disponibles).
+
+Compara el algoritmo anterior (slots x (excepciones + turnos)) contra el motor
+de intervalos en minutos, verifica que ambos devuelvan las mismas filas y
+muestra que el costo por día se mantiene constante al crecer el rango.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_disponibilidad
+"""
+
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from app.backend.services.agenda_service import AgendaService
+from app.backend.services.disponibilidad_engine import AgendaCompilada, OcupacionDia
+
+MATRICULA = "MED-BENCH"
+INICIO = date(2030, 1, 1)
+
+
+# ----------------------------------------------------
+# Datos sintéticos (un médico con mucha carga)
+# ----------------------------------------------------
+def generar_datos(dias: int):
+    regulares = []
+    for dia in range(1, 6):  # Lunes a Viernes, mañana y tarde
+        regulares.append(
+            SimpleNamespace(
+                Dia_de_semana=dia, Hora_inicio="08:00", Hora_fin="12:00",
+                Duracion=15, Especialidad_Id=1, Sucursal_Id=1,
+            )
+        )
+        regulares.append(
+            SimpleNamespace(
+                Dia_de_semana=dia, Hora_inicio="14:00", Hora_fin="19:00",
+                Duracion=20, Especialidad_Id=2, Sucursal_Id=2,
+            )
+        )
+
+    excepcionales = []
+    turnos = []
+    for offset in range(dias):
+        dia = INICIO + timedelta(days=offset)
+        fecha = dia.strftime("%Y-%m-%d")
+        if offset % 7 == 5:  # Sábados con atención excepcional
+            excepcionales.append(
+                SimpleNamespace(
+                    Fecha_inicio=fecha, Fecha_Fin=fecha, Hora_inicio="09:00",
+                    Hora_Fin="13:00", Es_Disponible=1, Especialidad_Id=1,
+                    Consultorio_Sucursal_Id=1,
+                )
+            )
+        if offset % 3 == 0:  # Bloqueos frecuentes
+            excepcionales.append(
+                SimpleNamespace(
+                    Fecha_inicio=fecha, Fecha_Fin=fecha, Hora_inicio="10:00",
+                    Hora_Fin="10:45", Es_Disponible=0, Especialidad_Id=1,
+                    Consultorio_Sucursal_Id=None,
+                )
+            )
+        for minuto in range(8 * 60, 19 * 60, 45):  # ~15 turnos por día
+            turnos.append(
+                SimpleNamespace(
+                    Fecha=fecha, Hora=f"{minuto // 60:02d}:{minuto % 60:02d}",
+                    Duracion=15,
+                )
+            )
+    return regulares, excepcionales, turnos
+
+
+class RepositorioEnMemoria:
+    """Reemplaza a AgendaRepository para aislar el cálculo del acceso a la DB."""
+
+    def __init__(self, regulares, excepcionales, turnos):
+        self.regulares = regulares
+        self.excepcionales = excepcionales
+        self.turnos = turnos
+
+    def get_agendas_regulares_by_medico(self, medico_matricula):
+        return self.regulares
+
+    def get_agendas_excepcionales_by_rango(self, medico_matricula, fecha_inicio, fecha_fin):
+        return self.excepcionales
+
+    def get_turnos_by_rango(self, medico_matricula, fecha_inicio, fecha_fin):
+        return self.turnos
+
+    def get_agenda_compilada(self, medico_matricula):
+        # Sin caché: se mide el peor caso (compilar la agenda en cada llamada)
+        return AgendaCompilada(self.regulares, self.excepcionales)
+
+    def get_ocupacion_by_rango(self, medico_matricula, fecha_inicio, fecha_fin):
+        pares = {}
+        for t in self.turnos:
+            pares.setdefault(t.Fecha, []).append((t.Hora, t.Duracion))
+        return {fecha: OcupacionDia.desde_turnos(p) for fecha, p in pares.items()}
+
+
+# ----------------------------------------------------
+# Algoritmo anterior (referencia)
+# ----------------------------------------------------
+def algoritmo_anterior(medico_matricula, regulares, excepcionales, turnos, fecha_inicio, fecha_fin):
+    available_slots = []
+    duraciones_por_especialidad = {ag.Especialidad_Id: ag.Duracion for ag in regulares}
+
+    current_date = fecha_inicio
+    while current_date <= fecha_fin:
+        daily_slots = []
+        for ag in regulares:
+            if ag.Dia_de_semana == current_date.isoweekday():
+                start_dt = datetime.combine(current_date, datetime.strptime(ag.Hora_inicio, "%H:%M").time())
+                end_dt = datetime.combine(current_date, datetime.strptime(ag.Hora_fin, "%H:%M").time())
+                curr_dt = start_dt
+                while curr_dt + timedelta(minutes=ag.Duracion) <= end_dt:
+                    daily_slots.append({
+                        "fecha": current_date.strftime("%Y-%m-%d"), "hora": curr_dt.strftime("%H:%M"),
+                        "medico_matricula": medico_matricula, "especialidad_id": ag.Especialidad_Id,
+                        "duracion": ag.Duracion, "sucursal_id": ag.Sucursal_Id,
+                    })
+                    curr_dt += timedelta(minutes=ag.Duracion)
+
+        for ag in excepcionales:
+            ag_inicio = datetime.strptime(ag.Fecha_inicio, "%Y-%m-%d").date()
+            ag_fin = datetime.strptime(ag.Fecha_Fin, "%Y-%m-%d").date()
+            if ag_inicio <= current_date <= ag_fin and ag.Es_Disponible == 1:
+                duracion = duraciones_por_especialidad.get(ag.Especialidad_Id, 20)
+                start_dt = datetime.combine(current_date, datetime.strptime(ag.Hora_inicio, "%H:%M").time())
+                end_dt = datetime.combine(current_date, datetime.strptime(ag.Hora_Fin, "%H:%M").time())
+                curr_dt = start_dt
+                while curr_dt + timedelta(minutes=duracion) <= end_dt:
+                    slot = {
+                        "fecha": current_date.strftime("%Y-%m-%d"), "hora": curr_dt.strftime("%H:%M"),
+                        "medico_matricula": medico_matricula, "especialidad_id": ag.Especialidad_Id,
+                        "duracion": duracion, "sucursal_id": ag.Consultorio_Sucursal_Id,
+                    }
+                    if slot not in daily_slots:
+                        daily_slots.append(slot)
+                    curr_dt += timedelta(minutes=duracion)
+
+        for slot in daily_slots:
+            slot_start = datetime.combine(current_date, datetime.strptime(slot["hora"], "%H:%M").time())
+            slot_end = slot_start + timedelta(minutes=slot["duracion"])
+            is_blocked = False
+            for ag in excepcionales:
+                ag_inicio = datetime.strptime(ag.Fecha_inicio, "%Y-%m-%d").date()
+                ag_fin = datetime.strptime(ag.Fecha_Fin, "%Y-%m-%d").date()
+                if ag_inicio <= current_date <= ag_fin and ag.Es_Disponible == 0:
+                    block_start = datetime.combine(current_date, datetime.strptime(ag.Hora_inicio, "%H:%M").time())
+                    block_end = datetime.combine(current_date, datetime.strptime(ag.Hora_Fin, "%H:%M").time())
+                    if slot_start < block_end and block_start < slot_end:
+                        is_blocked = True
+                        break
+            if is_blocked:
+                continue
+            for turno in turnos:
+                if turno.Fecha == slot["fecha"]:
+                    turno_start = datetime.combine(current_date, datetime.strptime(turno.Hora, "%H:%M").time())
+                    turno_end = turno_start + timedelta(minutes=turno.Duracion)
+                    if slot_start < turno_end and turno_start < slot_end:
+                        is_blocked = True
+                        break
+            if not is_blocked:
+                available_slots.append(slot)
+        current_date += timedelta(days=1)
+    return available_slots
+
+
+def medir(funcion, repeticiones: int = 3) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    print(f"{'días':>6} {'anterior (ms)':>14} {'motor (ms)':>11} {'motor µs/día':>13} {'speedup':>8}")
+    for dias in (15, 30, 60, 120, 240):
+        regulares, excepcionales, turnos = generar_datos(dias)
+        fecha_fin = INICIO + timedelta(days=dias - 1)
+        service = AgendaService(RepositorioEnMemoria(regulares, excepcionales, turnos), None)
+
+        nuevo = service._calcular_turnos_disponibles(MATRICULA, INICIO, fecha_fin)
+        anterior = algoritmo_anterior(MATRICULA, regulares, excepcionales, turnos, INICIO, fecha_fin)
+        assert nuevo == anterior, "El motor no devuelve las mismas filas que el algoritmo anterior"
+
+        t_anterior = medir(
+            lambda: algoritmo_anterior(MATRICULA, regulares, excepcionales, turnos, INICIO, fecha_fin),
+            repeticiones=1,
+        )
+        t_motor = medir(lambda: service._calcular_turnos_disponibles(MATRICULA, INICIO, fecha_fin))
+        print(
+            f"{dias:>6} {t_anterior * 1000:>14.1f} {t_motor * 1000:>11.2f} "
+            f"{t_motor / dias * 1e6:>13.1f} {t_anterior / t_motor:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark del cálculo de disponibilidad en lote (NumPy) contra el motor por slot.
+
+Simula el snapshot nocturno del call center: todos los médicos, 30 días.
+Verifica que calcular_disponibilidad_lote devuelva, médico por médico, las
+mismas filas (y en el mismo orden) que MotorDisponibilidad.calcular.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_disponibilidad_lote
+"""
+
+import random
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.backend.services.disponibilidad_engine import AgendaCompilada, MotorDisponibilidad
+from app.backend.services.disponibilidad_lote import calcular_disponibilidad_lote
+
+INICIO = date(2030, 1, 1)
+DIAS = 30
+
+
+def _hora(minutos: int) -> str:
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+# ----------------------------------------------------
+# Datos sintéticos (muchos médicos con agendas variadas)
+# ----------------------------------------------------
+def generar_medico(rng: random.Random, dias: int):
+    regulares = []
+    for dia in rng.sample(range(1, 8), rng.randint(2, 6)):
+        inicio = rng.choice([7 * 60, 8 * 60, 9 * 60 + 30])
+        for _ in range(rng.randint(1, 2)):
+            fin = inicio + rng.choice([180, 240, 300])
+            regulares.append(
+                SimpleNamespace(
+                    Dia_de_semana=dia, Hora_inicio=_hora(inicio), Hora_fin=_hora(min(fin, 23 * 60)),
+                    Duracion=rng.choice([15, 20, 30]), Especialidad_Id=rng.randint(1, 3),
+                    Sucursal_Id=rng.choice([1, 2, None]),
+                )
+            )
+            inicio = fin + 60
+
+    excepcionales = []
+    for _ in range(rng.randint(0, dias // 3)):
+        desde = INICIO + timedelta(days=rng.randint(-3, dias))
+        hasta = desde + timedelta(days=rng.randint(0, 4))
+        inicio = rng.randrange(7 * 60, 18 * 60, 15)
+        excepcionales.append(
+            SimpleNamespace(
+                Fecha_inicio=desde.strftime("%Y-%m-%d"), Fecha_Fin=hasta.strftime("%Y-%m-%d"),
+                Hora_inicio=_hora(inicio), Hora_Fin=_hora(inicio + rng.choice([30, 60, 120, 240])),
+                Es_Disponible=rng.choice([0, 0, 1]), Especialidad_Id=rng.randint(1, 4),
+                Consultorio_Sucursal_Id=rng.choice([1, 2, None]),
+            )
+        )
+
+    turnos = []
+    for offset in range(dias):
+        fecha = (INICIO + timedelta(days=offset)).strftime("%Y-%m-%d")
+        for _ in range(rng.randint(0, 12)):
+            inicio = rng.randrange(7 * 60, 24 * 60 - 5, 5)
+            turnos.append((fecha, _hora(inicio), rng.choice([None, 0, 15, 20, 30, 45])))
+    return regulares, excepcionales, turnos
+
+
+def generar_datos(medicos: int, dias: int, semilla: int = 7):
+    rng = random.Random(semilla)
+    agendas, turnos = {}, {}
+    for i in range(medicos):
+        regulares, excepcionales, del_medico = generar_medico(rng, dias)
+        matricula = f"MED-{i:05d}"
+        agendas[matricula] = AgendaCompilada(regulares, excepcionales)
+        turnos[matricula] = del_medico
+    return agendas, turnos
+
+
+# ----------------------------------------------------
+# Implementación actual (referencia): un motor por médico
+# ----------------------------------------------------
+def como_filas(turnos):
+    """Turnos como los devuelve AgendaRepository.get_turnos_by_rango (objetos con atributos)."""
+    return {
+        matricula: [SimpleNamespace(Fecha=f, Hora=h, Duracion=d) for f, h, d in del_medico]
+        for matricula, del_medico in turnos.items()
+    }
+
+
+def por_medico(agendas, filas, fecha_inicio, fecha_fin):
+    return {
+        matricula: MotorDisponibilidad(
+            matricula, agenda=agenda, turnos=filas.get(matricula, [])
+        ).calcular(fecha_inicio, fecha_fin)
+        for matricula, agenda in agendas.items()
+    }
+
+
+def medir(funcion, repeticiones: int = 3) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    fecha_fin = INICIO + timedelta(days=DIAS - 1)
+
+    # Equivalencia sobre muchos casos chicos (bloqueos, duplicados, turnos cruzando medianoche)
+    for semilla in range(200):
+        agendas, turnos = generar_datos(5, 10, semilla)
+        fin = INICIO + timedelta(days=9)
+        assert calcular_disponibilidad_lote(agendas, turnos, INICIO, fin) == por_medico(
+            agendas, como_filas(turnos), INICIO, fin
+        ), f"Diferencia con el motor por slot (semilla {semilla})"
+
+    print(f"{'médicos':>8} {'slots':>9} {'por slot (ms)':>14} {'lote (ms)':>10} {'speedup':>8}")
+    for medicos in (50, 200, 1000):
+        agendas, turnos = generar_datos(medicos, DIAS)
+        filas = como_filas(turnos)
+
+        lote = calcular_disponibilidad_lote(agendas, turnos, INICIO, fecha_fin)
+        referencia = por_medico(agendas, filas, INICIO, fecha_fin)
+        assert lote == referencia, "El lote no devuelve las mismas filas que el motor"
+
+        t_referencia = medir(lambda: por_medico(agendas, filas, INICIO, fecha_fin))
+        t_lote = medir(lambda: calcular_disponibilidad_lote(agendas, turnos, INICIO, fecha_fin))
+        slots = sum(len(del_medico) for del_medico in lote.values())
+        print(
+            f"{medicos:>8} {slots:>9} {t_referencia * 1000:>14.1f} "
+            f"{t_lote * 1000:>10.1f} {t_referencia / t_lote:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
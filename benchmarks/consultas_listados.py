@@ -0,0 +1,134 @@
+"""
+Verificación de consultas N+1 en los listados de turnos.
+
+Sobre una base SQLite temporal, cada endpoint de listado se llama para un caso
+con 1 turno y otro con muchos: con ContadorConsultas se comprueba que la
+cantidad de sentencias SQL por petición sea la misma (no crece con las filas).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.consultas_listados
+"""
+
+import os
+import tempfile
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.backend.db.contador_consultas import ContadorConsultas
+from app.backend.db.db import Base, get_db
+from app.backend.db.migraciones import aplicar_migraciones
+from app.backend.main import app
+from app.backend.models.models import (
+    Especialidad,
+    Estado,
+    Medico,
+    Paciente,
+    Turno,
+)
+from app.backend.services.catalogos import cargar_catalogos, estado_id
+
+MUCHOS = 40
+ESTADOS = ["Pendiente", "Confirmado", "Cancelado", "Atendido", "Finalizado", "Ausente", "Anunciado"]
+
+
+def poblar(Session) -> list:
+    db = Session()
+    db.add_all(Estado(Descripcion=d) for d in ESTADOS)
+    db.add_all(Especialidad(descripcion=f"Especialidad {i}") for i in range(MUCHOS))
+    db.add_all([
+        Medico(Matricula="UNO", Nombre="Uno", Apellido="Solo"),
+        Medico(Matricula="MUCHOS", Nombre="Muchos", Apellido="Turnos"),
+    ])
+    db.add_all(Paciente(Nombre="P", Apellido=str(i)) for i in range(MUCHOS + 1))
+    db.flush()
+    cargar_catalogos(db)
+
+    pacientes = [p.nroPaciente for p in db.query(Paciente).order_by(Paciente.nroPaciente)]
+    especialidades = [e.Id_especialidad for e in db.query(Especialidad)]
+    db.add(Turno(
+        Fecha="2031-01-01", Hora="08:00", Paciente_nroPaciente=pacientes[0],
+        Medico_Matricula="UNO", Especialidad_Id=especialidades[0],
+        Estado_Id=estado_id("Pendiente"), Duracion=30,
+    ))
+    # Un paciente y una especialidad distintos por turno: cualquier carga perezosa se nota
+    for i in range(MUCHOS):
+        db.add(Turno(
+            Fecha=f"2031-01-{i % 28 + 1:02d}", Hora=f"{8 + i // 28:02d}:00",
+            Paciente_nroPaciente=pacientes[i + 1], Medico_Matricula="MUCHOS",
+            Especialidad_Id=especialidades[i], Estado_Id=estado_id("Confirmado"), Duracion=30,
+        ))
+    # El paciente del caso "muchos" para /paciente/{nro}
+    for i in range(MUCHOS):
+        db.add(Turno(
+            Fecha=f"2032-01-{i % 28 + 1:02d}", Hora=f"{8 + i // 28:02d}:00",
+            Paciente_nroPaciente=pacientes[1], Medico_Matricula="MUCHOS",
+            Especialidad_Id=especialidades[i], Estado_Id=estado_id("Pendiente"), Duracion=30,
+        ))
+    db.commit()
+    db.close()
+    return pacientes
+
+
+def main():
+    with tempfile.TemporaryDirectory() as carpeta:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(carpeta, 'listados.db')}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        aplicar_migraciones(engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        pacientes = poblar(Session)
+
+        def get_db_temporal():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = get_db_temporal
+        client = TestClient(app)  # sin lifespan: no toca la base configurada
+        casos = {
+            "GET /turnos/medico/{matricula}": (
+                "/api/turnos/turnos/medico/UNO", "/api/turnos/turnos/medico/MUCHOS"
+            ),
+            "GET /turnos/paciente/{nro}": (
+                f"/api/turnos/turnos/paciente/{pacientes[0]}",
+                f"/api/turnos/turnos/paciente/{pacientes[1]}",
+            ),
+            "GET /turnos/buscar": (
+                "/api/turnos/turnos/buscar?medico_matricula=UNO",
+                "/api/turnos/turnos/buscar?medico_matricula=MUCHOS",
+            ),
+            "GET /pacientes/medico/{matricula}": (
+                "/api/pacientes/pacientes/medico/UNO", "/api/pacientes/pacientes/medico/MUCHOS"
+            ),
+        }
+        fallas = 0
+        try:
+            for nombre, (uno, muchos) in casos.items():
+                cantidades = []
+                for url in (uno, muchos):
+                    with ContadorConsultas(engine) as contador:
+                        respuesta = client.get(url)
+                    assert respuesta.status_code == 200, (url, respuesta.text)
+                    cuerpo = respuesta.json()
+                    filas = cuerpo if isinstance(cuerpo, list) else cuerpo["items"]
+                    cantidades.append((len(filas), contador.cantidad))
+                (filas_1, sql_1), (filas_n, sql_n) = cantidades
+                ok = sql_1 == sql_n
+                fallas += not ok
+                print(f"  {'✔' if ok else '✘'} {nombre}: {filas_1} filas → {sql_1} SQL, "
+                      f"{filas_n} filas → {sql_n} SQL")
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+        if fallas:
+            raise SystemExit(f"{fallas} listados con cantidad de consultas variable")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Verificación del orden de /agenda/disponible con y sin calendario materializado.
+
+Sobre una base SQLite temporal con médicos de agendas variadas (varias reglas
+por día, excepciones disponibles y bloqueos, turnos), compara fila por fila
+—secuencia, no conjunto— la disponibilidad calculada desde la tabla Slots con
+la del motor (rango fuera del horizonte). Lo repite después de refrescar días
+sueltos, que reinsertan sus slots con Ids nuevos. También comprueba que
+get_libres(por_hora=True) devuelva el orden (fecha, hora) que espera el merge
+de buscar_primeros_disponibles.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.orden_disponibilidad
+"""
+
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.backend.db.db import Base
+from app.backend.db.migraciones import aplicar_migraciones
+from app.backend.models.models import (
+    AgendaExcepcional,
+    AgendaRegular,
+    Especialidad,
+    Estado,
+    Medico,
+    Paciente,
+    Sucursal,
+    Turno,
+)
+from app.backend.services.agenda_repository import AgendaRepository
+from app.backend.services.agenda_service import AgendaService
+from app.backend.services.catalogos import cargar_catalogos, estado_id
+from app.backend.services.medico_repository import MedicoRepository
+from app.backend.services.slot_repository import SlotRepository
+
+HOY = date(2031, 3, 3)
+DIAS = 28
+MEDICOS = 12
+ESTADOS = ["Pendiente", "Confirmado", "Cancelado", "Atendido", "Finalizado", "Ausente", "Anunciado"]
+
+
+def _hora(minutos: int) -> str:
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def poblar(db, rng: random.Random) -> list:
+    db.add_all(Estado(Descripcion=d) for d in ESTADOS)
+    db.add_all(Especialidad(descripcion=f"Especialidad {i}") for i in range(1, 4))
+    db.add_all(Sucursal(Nombre=f"Sucursal {i}") for i in range(1, 3))
+    db.add_all(Paciente(Nombre="P", Apellido=str(i)) for i in range(MEDICOS))
+    db.flush()
+    cargar_catalogos(db)
+    pacientes = [p.nroPaciente for p in db.query(Paciente).order_by(Paciente.nroPaciente)]
+
+    matriculas = []
+    for i in range(MEDICOS):
+        matricula = f"ORD-{i:03d}"
+        matriculas.append(matricula)
+        db.add(Medico(Matricula=matricula, Nombre="Médico", Apellido=str(i)))
+
+        # Dos reglas por día; la de la tarde suele tener otra especialidad
+        for dia in rng.sample(range(1, 8), rng.randint(2, 5)):
+            for inicio, especialidad in ((8 * 60, 1), (14 * 60, rng.randint(1, 3))):
+                db.add(AgendaRegular(
+                    Medico_Matricula=matricula, Especialidad_Id=especialidad,
+                    Dia_de_semana=dia, Hora_inicio=_hora(inicio),
+                    Hora_fin=_hora(inicio + rng.choice([180, 240])),
+                    Duracion=rng.choice([15, 20, 30]), Sucursal_Id=rng.choice([1, 2]),
+                ))
+
+        # Excepciones: disponibles temprano (antes que la agenda regular) y bloqueos
+        claves = set()
+        for _ in range(rng.randint(2, 6)):
+            desde = HOY + timedelta(days=rng.randint(0, DIAS - 1))
+            inicio = rng.randrange(6 * 60, 18 * 60, 30)
+            if (desde, inicio) in claves:
+                continue
+            claves.add((desde, inicio))
+            db.add(AgendaExcepcional(
+                Medico_Matricula=matricula, Especialidad_Id=rng.randint(1, 3),
+                Fecha_inicio=desde.strftime("%Y-%m-%d"), Hora_inicio=_hora(inicio),
+                Fecha_Fin=(desde + timedelta(days=rng.randint(0, 3))).strftime("%Y-%m-%d"),
+                Hora_Fin=_hora(inicio + rng.choice([60, 120, 180])),
+                Es_Disponible=rng.choice([0, 1, 1]), Consultorio_Sucursal_Id=rng.choice([1, 2]),
+            ))
+
+        horas = set()
+        for _ in range(rng.randint(5, 20)):
+            fecha = (HOY + timedelta(days=rng.randint(0, DIAS - 1))).strftime("%Y-%m-%d")
+            hora = _hora(rng.randrange(8 * 60, 18 * 60, 10))
+            if (fecha, hora) in horas:
+                continue
+            horas.add((fecha, hora))
+            db.add(Turno(
+                Fecha=fecha, Hora=hora, Paciente_nroPaciente=pacientes[i],
+                Medico_Matricula=matricula, Especialidad_Id=1,
+                Estado_Id=estado_id(rng.choice(["Pendiente", "Confirmado", "Cancelado"])),
+                Duracion=rng.choice([None, 15, 30, 45]),
+            ))
+    db.commit()
+    return matriculas
+
+
+def comparar(db, matriculas: list, etapa: str) -> int:
+    con_slots = AgendaService(AgendaRepository(db), MedicoRepository(db), SlotRepository(db))
+    con_motor = AgendaService(AgendaRepository(db), MedicoRepository(db))
+    slot_repo = SlotRepository(db)
+    fin = HOY + timedelta(days=DIAS - 1)
+
+    fallas = 0
+    filas = 0
+    for matricula in matriculas:
+        assert slot_repo.cubre(matricula, HOY, fin), matricula
+        esperado = con_motor._calcular_turnos_disponibles(matricula, HOY, fin)
+        obtenido = con_slots._calcular_turnos_disponibles(matricula, HOY, fin)
+        por_hora = slot_repo.get_libres(matricula, HOY, fin, por_hora=True)
+        filas += len(esperado)
+        if obtenido != esperado:
+            fallas += 1
+            print(f"  ✘ {etapa} {matricula}: el orden de Slots difiere del motor")
+        if por_hora != sorted(esperado, key=lambda s: (s["fecha"], s["hora"])):
+            fallas += 1
+            print(f"  ✘ {etapa} {matricula}: get_libres(por_hora=True) no está en orden (fecha, hora)")
+    print(f"  {'✔' if not fallas else '✘'} {etapa}: {len(matriculas)} médicos, {filas} slots comparados en secuencia")
+    return fallas
+
+
+def main():
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as carpeta:
+        engine = create_engine(f"sqlite:///{os.path.join(carpeta, 'orden.db')}")
+        Base.metadata.create_all(bind=engine)
+        aplicar_migraciones(engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = Session()
+        try:
+            matriculas = poblar(db, rng)
+            slot_repo = SlotRepository(db)
+            for matricula in matriculas:
+                slot_repo.asegurar_horizonte(matricula, HOY)
+            db.commit()
+
+            fallas = comparar(db, matriculas, "materialización inicial")
+
+            # Días sueltos recalculados (como tras reservar o cancelar un turno)
+            slot_repo.refrescar_dias(
+                (rng.choice(matriculas), (HOY + timedelta(days=rng.randint(0, DIAS - 1))).strftime("%Y-%m-%d"))
+                for _ in range(30)
+            )
+            db.commit()
+            fallas += comparar(db, matriculas, "tras refrescar días")
+        finally:
+            db.close()
+            engine.dispose()
+
+    if fallas:
+        raise SystemExit(f"{fallas} diferencias de orden entre Slots y el motor")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Reportes por período sobre el resumen diario (Resumen_Turnos_Diario).
+
+Sobre una base SQLite temporal con ~2 años de turnos insertados en bloque (sin
+pasar por TurnoRepository):
+1. Backfill del resumen por tramos y verificación contra los datos crudos.
+2. Reportes por especialidad y de asistencia para un día, un mes y un año:
+   tiempo con el resumen frente al GROUP BY sobre Turnos, y mismo resultado.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.reportes_resumen
+"""
+
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app.backend.db.db import Base
+from app.backend.db.migraciones import aplicar_migraciones
+from app.backend.models.models import Especialidad, Estado, Medico, Paciente, Turno
+from app.backend.services.catalogos import cargar_catalogos, estado_ids
+from app.backend.services.resumen_turnos_repository import ResumenTurnosRepository
+from app.backend.services.resumen_turnos_service import ResumenTurnosService
+from app.backend.services.turno_repository import TurnoRepository
+
+DESDE = date(2029, 1, 1)
+DIAS = 730
+MEDICOS = 20
+ESPECIALIDADES = 10
+PACIENTES = 2000
+TURNOS_POR_MEDICO_DIA = 12
+REPETICIONES = 5
+
+ESTADOS = ["Pendiente", "Confirmado", "Cancelado", "Atendido", "Finalizado", "Ausente", "Anunciado"]
+
+
+def poblar(engine, Session) -> int:
+    db = Session()
+    db.add_all(Estado(Descripcion=d) for d in ESTADOS)
+    db.add_all(Especialidad(descripcion=f"Especialidad {i}") for i in range(ESPECIALIDADES))
+    db.add_all(Medico(Matricula=f"M-{i}", Nombre="M", Apellido=str(i)) for i in range(MEDICOS))
+    db.add_all(Paciente(Nombre="P", Apellido=str(i)) for i in range(PACIENTES))
+    db.commit()
+    cargar_catalogos(db)
+    db.close()
+
+    azar = random.Random(7)
+    filas = []
+    for d in range(DIAS):
+        fecha = (DESDE + timedelta(days=d)).isoformat()
+        for m in range(MEDICOS):
+            for k in range(TURNOS_POR_MEDICO_DIA):
+                filas.append({
+                    "Fecha": fecha,
+                    "Hora": f"{8 + k // 2:02d}:{30 * (k % 2):02d}",
+                    "Paciente_nroPaciente": azar.randint(1, PACIENTES),
+                    "Medico_Matricula": f"M-{m}",
+                    "Especialidad_Id": m % ESPECIALIDADES + 1,
+                    "Estado_Id": azar.choice((3, 5, 5, 5, 6)),
+                    "Sucursal_Id": m % 3 + 1,
+                    "Duracion": 30,
+                })
+    with engine.begin() as conn:
+        conn.execute(Turno.__table__.insert().prefix_with("OR IGNORE"), filas)
+    return len(filas)
+
+
+def crudo(db, inicio: str, fin: str) -> tuple:
+    """Los dos reportes con GROUP BY directo sobre Turnos (la versión sin resumen)."""
+    en_rango = (Turno.Fecha >= inicio, Turno.Fecha <= fin)
+    por_especialidad = (
+        db.query(Especialidad.descripcion, func.count(Turno.Especialidad_Id))
+        .join(Especialidad, Especialidad.Id_especialidad == Turno.Especialidad_Id)
+        .filter(*en_rango)
+        .group_by(Especialidad.descripcion)
+        .all()
+    )
+    asistencia = (
+        db.query(Turno.Estado_Id, func.count(Turno.Estado_Id))
+        .filter(*en_rango, Turno.Estado_Id.in_(estado_ids("Finalizado", "Ausente")))
+        .group_by(Turno.Estado_Id)
+        .all()
+    )
+    return sorted(por_especialidad), sorted(asistencia)
+
+
+def con_resumen(repo: TurnoRepository, inicio: str, fin: str) -> tuple:
+    por_especialidad = repo.count_turnos_by_especialidad(inicio, fin)
+    asistencia = repo.count_asistencia_vs_inasistencia(inicio, fin)
+    return (
+        sorted((f["Especialidad_Nombre"], f["Total_Turnos"]) for f in por_especialidad),
+        sorted((ESTADOS.index(f["Tipo_Registro"]) + 1, f["Total_Turnos"]) for f in asistencia),
+    )
+
+
+def medir(funcion, *args) -> tuple:
+    tiempos = []
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        tiempos.append(time.perf_counter() - inicio)
+    return resultado, sorted(tiempos)[REPETICIONES // 2] * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as carpeta:
+        engine = create_engine(f"sqlite:///{os.path.join(carpeta, 'reportes.db')}")
+        Base.metadata.create_all(bind=engine)
+        aplicar_migraciones(engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        total = poblar(engine, Session)
+
+        db = Session()
+        service = ResumenTurnosService(ResumenTurnosRepository(db))
+        informe = service.backfill()
+        print(
+            f"Backfill: {total} turnos → {informe['filas']} filas de resumen "
+            f"en {informe['tramos']} tramos, {informe['segundos']}s"
+        )
+        verificacion = service.verificar()
+        print(
+            f"Verificación: {len(verificacion['inconsistentes'])} médico-días inconsistentes "
+            f"({verificacion['segundos']}s)"
+        )
+
+        repo = TurnoRepository(db)
+        fallas = len(verificacion["inconsistentes"])
+        periodos = {
+            "día": (DESDE, DESDE),
+            "mes": (DESDE, DESDE + timedelta(days=30)),
+            "año": (DESDE, DESDE + timedelta(days=364)),
+        }
+        for nombre, (inicio, fin) in periodos.items():
+            inicio, fin = inicio.isoformat(), fin.isoformat()
+            esperado, ms_crudo = medir(crudo, db, inicio, fin)
+            obtenido, ms_resumen = medir(con_resumen, repo, inicio, fin)
+            ok = esperado == obtenido
+            fallas += not ok
+            print(
+                f"  {'✔' if ok else '✘'} {nombre:>3}: GROUP BY Turnos {ms_crudo:8.2f} ms | "
+                f"resumen {ms_resumen:6.2f} ms"
+            )
+        db.close()
+        engine.dispose()
+        if fallas:
+            raise SystemExit("El resumen diario no coincide con los datos crudos")
+
+
+if __name__ == "__main__":
+    main()
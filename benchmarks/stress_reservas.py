@@ -0,0 +1,290 @@
+"""
+Prueba de estrés de reservas concurrentes (lock striping + índice único parcial).
+
+Sobre una base SQLite temporal (create_all + migraciones):
+1. Contención: muchos hilos intentan reservar los MISMOS slots con pacientes
+   distintos → exactamente una reserva exitosa por slot.
+2. Barrera de la DB: lo mismo, pero insertando directo con TurnoRepository (sin
+   pasar por la verificación ni por los locks) → el índice único sigue dejando
+   una sola fila activa por médico/fecha/hora.
+3. Reprogramaciones concurrentes: muchos hilos mueven turnos distintos hacia
+   horarios que se SUPERPONEN con distinta hora de inicio (el índice único no
+   los ve) o fuera de la agenda → por médico entra una sola reprogramación y
+   ningún par de turnos activos queda superpuesto.
+4. Throughput: reservas de médicos distintos con 256 franjas contra un único
+   lock global (LockStriping(1)). Con SQLite las escrituras igual se serializan
+   en el archivo, así que se espera un resultado parejo: lo que se mide es que
+   las franjas no agreguen costo frente al lock global.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.stress_reservas
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app.backend.db.db import Base
+from app.backend.db.migraciones import aplicar_migraciones
+from app.backend.models.models import (
+    AgendaRegular,
+    Especialidad,
+    Estado,
+    Medico,
+    Paciente,
+    Turno,
+)
+from app.backend.schemas.turno import TurnoCreate
+from app.backend.services import turno_service as turno_service_module
+from app.backend.services.agenda_repository import AgendaRepository
+from app.backend.services.catalogos import cargar_catalogos, estado_id, estados_que_ocupan
+from app.backend.services.exceptions import HorarioNoDisponibleError
+from app.backend.services.medico_repository import MedicoRepository
+from app.backend.services.paciente_repository import PacienteRepository
+from app.backend.services.reserva_locks import LockStriping
+from app.backend.services.turno_repository import TurnoRepository
+from app.backend.services.turno_service import TurnoService
+
+FECHA = date(2031, 3, 3)
+HILOS = 16
+INTENTOS_POR_SLOT = 12
+MEDICOS_CONTENCION = 4
+SLOTS_POR_MEDICO = 6
+TURNOS_A_REPROGRAMAR = 12
+# Destinos que se superponen entre sí (turnos de 30 min) y uno fuera de agenda (08 a 20 h)
+DESTINOS_REPROGRAMACION = ["15:00", "15:10", "15:20", "21:00"]
+MEDICOS_THROUGHPUT = 32
+RESERVAS_POR_MEDICO = 8
+
+ESTADOS = ["Pendiente", "Confirmado", "Cancelado", "Atendido", "Finalizado", "Ausente", "Anunciado"]
+
+
+# ----------------------------------------------------
+# Base temporal
+# ----------------------------------------------------
+def crear_base(ruta: str):
+    engine = create_engine(
+        f"sqlite:///{ruta}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=HILOS,  # una conexión por hilo: nadie espera al pool
+    )
+    Base.metadata.create_all(bind=engine)
+    aplicar_migraciones(engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def poblar(Session, prefijo: str, medicos: int, pacientes: int) -> list:
+    db = Session()
+    if not db.query(Estado).count():
+        db.add_all(Estado(Descripcion=d) for d in ESTADOS)
+    especialidad = db.query(Especialidad).first()
+    if especialidad is None:
+        especialidad = Especialidad(descripcion="Clínica")
+        db.add(especialidad)
+        db.flush()
+
+    matriculas = [f"{prefijo}-{i:03d}" for i in range(medicos)]
+    for matricula in matriculas:
+        db.add(Medico(Matricula=matricula, Nombre="Stress", Apellido=matricula))
+        db.add_all(
+            AgendaRegular(
+                Medico_Matricula=matricula, Especialidad_Id=especialidad.Id_especialidad,
+                Dia_de_semana=dia, Hora_inicio="08:00", Hora_fin="20:00", Duracion=30,
+            )
+            for dia in range(1, 8)
+        )
+    db.add_all(Paciente(Nombre="P", Apellido=f"{prefijo}-{i}") for i in range(pacientes))
+    db.commit()
+    # Los servicios resuelven los estados contra el catálogo: se carga desde esta base
+    cargar_catalogos(db)
+    especialidad_id = especialidad.Id_especialidad
+    ids = [
+        p.nroPaciente
+        for p in db.query(Paciente).filter(Paciente.Apellido.like(f"{prefijo}-%")).order_by(Paciente.nroPaciente)
+    ]
+    db.close()
+    return matriculas, especialidad_id, ids
+
+
+def servicio(db) -> TurnoService:
+    return TurnoService(
+        turno_repo=TurnoRepository(db),
+        agenda_repo=AgendaRepository(db),
+        medico_repo=MedicoRepository(db),
+        paciente_repo=PacienteRepository(db),
+        db_session=db,
+    )
+
+
+def hora(indice: int) -> str:
+    minutos = 8 * 60 + 30 * indice
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+# ----------------------------------------------------
+# Escenarios
+# ----------------------------------------------------
+def reservar(Session, matricula, especialidad, paciente, hora_turno) -> bool:
+    db = Session()
+    try:
+        servicio(db).registrar_turno(
+            TurnoCreate(
+                Fecha=FECHA, Hora=hora_turno, Paciente_nroPaciente=paciente,
+                Medico_Matricula=matricula, Especialidad_Id=especialidad, Duracion=30,
+            )
+        )
+        return True
+    except HorarioNoDisponibleError:
+        return False
+    finally:
+        db.close()
+
+
+def insertar_directo(Session, matricula, especialidad, paciente, hora_turno) -> bool:
+    db = Session()
+    try:
+        TurnoRepository(db).create(
+            Turno(
+                Fecha=str(FECHA), Hora=hora_turno, Paciente_nroPaciente=paciente,
+                Medico_Matricula=matricula, Especialidad_Id=especialidad, Estado_Id=estado_id("Pendiente"), Duracion=30,
+            )
+        )
+        return True
+    except HorarioNoDisponibleError:
+        return False
+    finally:
+        db.close()
+
+
+def contencion(Session, funcion, prefijo: str) -> None:
+    slots = MEDICOS_CONTENCION * SLOTS_POR_MEDICO
+    matriculas, especialidad, pacientes = poblar(
+        Session, prefijo, MEDICOS_CONTENCION, slots * INTENTOS_POR_SLOT
+    )
+    tareas = []
+    for m, matricula in enumerate(matriculas):
+        for s in range(SLOTS_POR_MEDICO):
+            for intento in range(INTENTOS_POR_SLOT):
+                paciente = pacientes[(m * SLOTS_POR_MEDICO + s) * INTENTOS_POR_SLOT + intento]
+                tareas.append((matricula, paciente, hora(s)))
+    # Intercalar los intentos sobre el mismo slot entre hilos
+    tareas.sort(key=lambda t: t[1] % INTENTOS_POR_SLOT)
+
+    with ThreadPoolExecutor(HILOS) as pool:
+        exitos = sum(pool.map(lambda t: funcion(Session, t[0], especialidad, t[1], t[2]), tareas))
+
+    db = Session()
+    por_slot = (
+        db.query(Turno.Medico_Matricula, Turno.Hora, func.count())
+        .filter(Turno.Medico_Matricula.in_(matriculas), Turno.Estado_Id.in_(estados_que_ocupan()))
+        .group_by(Turno.Medico_Matricula, Turno.Hora)
+        .all()
+    )
+    db.close()
+    assert exitos == slots, f"{exitos} reservas exitosas para {slots} slots"
+    assert len(por_slot) == slots and all(n == 1 for *_, n in por_slot), por_slot
+    print(f"  {len(tareas)} intentos sobre {slots} slots → {exitos} exitosas, 1 por slot ✔")
+
+
+def reprogramar(Session, matricula, paciente, hora_actual, hora_nueva) -> bool:
+    db = Session()
+    try:
+        servicio(db).modificar_turno(
+            {"fecha": str(FECHA), "hora": hora_actual, "paciente_nro": paciente},
+            {"Hora": hora_nueva},
+        )
+        return True
+    except HorarioNoDisponibleError:
+        return False
+    finally:
+        db.close()
+
+
+def reprogramaciones(Session, prefijo: str) -> None:
+    matriculas, especialidad, pacientes = poblar(
+        Session, prefijo, MEDICOS_CONTENCION, MEDICOS_CONTENCION * TURNOS_A_REPROGRAMAR
+    )
+    tareas = []
+    for m, matricula in enumerate(matriculas):
+        for t in range(TURNOS_A_REPROGRAMAR):
+            paciente = pacientes[m * TURNOS_A_REPROGRAMAR + t]
+            assert reservar(Session, matricula, especialidad, paciente, hora(t))
+            destino = DESTINOS_REPROGRAMACION[t % len(DESTINOS_REPROGRAMACION)]
+            tareas.append((matricula, paciente, hora(t), destino))
+    tareas.sort(key=lambda t: t[1] % TURNOS_A_REPROGRAMAR)
+
+    with ThreadPoolExecutor(HILOS) as pool:
+        exitos = sum(pool.map(lambda t: reprogramar(Session, *t), tareas))
+
+    db = Session()
+    activos = (
+        db.query(Turno.Medico_Matricula, Turno.Hora_Minutos, Turno.Duracion)
+        .filter(Turno.Medico_Matricula.in_(matriculas), Turno.Estado_Id.in_(estados_que_ocupan()))
+        .order_by(Turno.Medico_Matricula, Turno.Hora_Minutos)
+        .all()
+    )
+    db.close()
+    superpuestos = [
+        (a, b) for a, b in zip(activos, activos[1:])
+        if a[0] == b[0] and a[1] + a[2] > b[1]
+    ]
+    fuera_de_agenda = [t for t in activos if t[1] >= 20 * 60]
+    assert not superpuestos, superpuestos
+    assert not fuera_de_agenda, fuera_de_agenda
+    assert exitos == MEDICOS_CONTENCION, f"{exitos} reprogramaciones para {MEDICOS_CONTENCION} médicos"
+    print(
+        f"  {len(tareas)} reprogramaciones → {exitos} exitosas (1 por médico), "
+        f"sin superposiciones ni turnos fuera de agenda ✔"
+    )
+
+
+def throughput(Session, locks: LockStriping, prefijo: str) -> float:
+    matriculas, especialidad, pacientes = poblar(
+        Session, prefijo, MEDICOS_THROUGHPUT, MEDICOS_THROUGHPUT * RESERVAS_POR_MEDICO
+    )
+    tareas = [
+        (matricula, pacientes[m * RESERVAS_POR_MEDICO + r], hora(r))
+        for r in range(RESERVAS_POR_MEDICO)
+        for m, matricula in enumerate(matriculas)
+    ]
+    original = turno_service_module.reserva_locks
+    turno_service_module.reserva_locks = locks
+    try:
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(HILOS) as pool:
+            exitos = sum(pool.map(lambda t: reservar(Session, t[0], especialidad, t[1], t[2]), tareas))
+        segundos = time.perf_counter() - inicio
+    finally:
+        turno_service_module.reserva_locks = original
+    assert exitos == len(tareas), f"{exitos} de {len(tareas)} reservas sin conflicto"
+    return len(tareas) / segundos
+
+
+def main():
+    with tempfile.TemporaryDirectory() as carpeta:
+        engine, Session = crear_base(os.path.join(carpeta, "stress.db"))
+
+        print("1. Reservas concurrentes sobre los mismos slots (TurnoService):")
+        contencion(Session, reservar, "CONT")
+
+        print("2. Inserciones concurrentes sin verificación ni locks (índice único):")
+        contencion(Session, insertar_directo, "DB")
+
+        print("3. Reprogramaciones concurrentes hacia horarios superpuestos:")
+        reprogramaciones(Session, "REPROG")
+
+        print("4. Throughput con médicos distintos:")
+        global_ = throughput(Session, LockStriping(1), "GLOBAL")
+        franjas = throughput(Session, LockStriping(256), "FRANJAS")
+        print(f"  lock global: {global_:8.1f} reservas/s")
+        print(f"  256 franjas: {franjas:8.1f} reservas/s ({franjas / global_:.2f}x)")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
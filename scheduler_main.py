@@ -1,6 +1,12 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.backend.services.notification_service import NotificationService
 from app.backend.services.turno_repository import TurnoRepository
+from app.backend.services.slot_repository import SlotRepository
+from app.backend.services.cierre_turnos_service import CierreTurnosService
+from app.backend.services.archivo_turnos_service import ArchivoTurnosService
+from app.backend.services.resumen_turnos_service import ResumenTurnosService
+from app.backend.services.resumen_turnos_repository import ResumenTurnosRepository
+from app.backend.services.feed_turnos import purgar_eventos
 from app.backend.db.db import SessionLocal
 import time
 import atexit
@@ -16,10 +22,78 @@ def run_notification_job():
     db_session.close()
 
 
+def run_slots_horizon_job():
+    """Extiende el calendario materializado de slots al nuevo día."""
+    db_session = SessionLocal()
+    try:
+        total = SlotRepository(db_session).extender_todos()
+        print(f"✔ Horizonte de slots extendido para {total} médicos.")
+    finally:
+        db_session.close()
+
+
+def run_cierre_turnos_job():
+    """Cierra los turnos de días anteriores que quedaron abiertos (reglas en CierreTurnosService)."""
+    db_session = SessionLocal()
+    try:
+        informe = CierreTurnosService(TurnoRepository(db_session)).ejecutar()
+        for regla in informe["reglas"]:
+            print(
+                f"  {regla['nombre']} -> {regla['destino']} (antes de {regla['fecha_limite']}): "
+                f"{regla['filas']} turnos en {regla['lotes']} lotes, {regla['segundos']}s"
+            )
+        print(f"✔ Cierre de turnos vencidos: {informe['filas']} turnos en {informe['segundos']}s.")
+    finally:
+        db_session.close()
+
+
+def run_purga_eventos_job():
+    """Purga del outbox de eventos de turnos los que superan la retención del feed."""
+    db_session = SessionLocal()
+    try:
+        borrados = purgar_eventos(db_session)
+        print(f"✔ Outbox de turnos: {borrados} eventos purgados.")
+    finally:
+        db_session.close()
+
+
+def run_archivo_turnos_job():
+    """Mueve a Turnos_Archivo los turnos cerrados más viejos que la retención."""
+    db_session = SessionLocal()
+    try:
+        informe = ArchivoTurnosService(TurnoRepository(db_session)).ejecutar()
+        print(
+            f"✔ Archivo de turnos (antes de {informe['fecha_limite']}): "
+            f"{informe['filas']} turnos en {informe['lotes']} lotes, {informe['segundos']}s."
+        )
+    finally:
+        db_session.close()
+
+
+def run_verificacion_resumen_job():
+    """Compara el resumen diario de turnos con los datos crudos y corrige los médico-días que difieran."""
+    db_session = SessionLocal()
+    try:
+        informe = ResumenTurnosService(ResumenTurnosRepository(db_session)).verificar(reparar=True)
+        print(
+            f"✔ Resumen diario verificado: {len(informe['inconsistentes'])} médico-días "
+            f"reparados en {informe['segundos']}s."
+        )
+    finally:
+        db_session.close()
+
+
 if __name__ == "__main__":
     scheduler = BackgroundScheduler()
 
     scheduler.add_job(run_notification_job, "interval", minutes=2)
+    scheduler.add_job(run_slots_horizon_job, "cron", hour=0, minute=5)
+    # Fin del día: recién pasada la medianoche se cierran los turnos de ayer (y anteriores)
+    scheduler.add_job(run_cierre_turnos_job, "cron", hour=0, minute=15)
+    scheduler.add_job(run_purga_eventos_job, "cron", hour=0, minute=30)
+    # Después del cierre, así los turnos recién cerrados entran al archivo cuando vencen
+    scheduler.add_job(run_archivo_turnos_job, "cron", hour=1, minute=0)
+    scheduler.add_job(run_verificacion_resumen_job, "cron", hour=1, minute=30)
 
     # Iniciar el scheduler
     scheduler.start()